@@ -4,13 +4,267 @@ import sqlite3 as lite
 import argparse
 import os
 import time
-import glob
 import platform
+import re
+import sys
+import io
+import csv
+import json
+import hashlib
+import urllib.request
+import urllib.parse
+import heapq
+import operator
+import multiprocessing
+import asyncio
+import concurrent.futures
+import functools
+import threading
+import tracemalloc
+import mmap
+import struct
+import shutil
+import tempfile
+import zipfile
+import tarfile
+import zlib
+import html
 
 # Sets Global variables for verbosity and outFile
 verbosity = 3
 outFile = False
 
+# Column positions inside a full row of the metas table
+CTIME_COLUMN = 7
+NAME_COLUMN = 18
+SPECIFICS_COLUMN = 23
+
+# Pragmas set on every connection, the databases are only ever scanned from start to end
+# mmap_size lets SQLite read pages straight from the page cache, cache_size is in KiB when negative
+SCAN_PRAGMAS = [
+    "PRAGMA mmap_size = 268435456;",
+    "PRAGMA cache_size = -65536;",
+    "PRAGMA temp_store = MEMORY;",
+    "PRAGMA query_only = 1;",
+]
+
+# Output formats, text is the padded report, the others write one record per artifact
+FORMAT_TEXT = "text"
+FORMAT_JSONL = "jsonl"
+FORMAT_CSV = "csv"
+FORMAT_JSON = "json"
+FORMAT_HTML = "html"
+FORMATS = [FORMAT_TEXT, FORMAT_JSONL, FORMAT_CSV, FORMAT_JSON, FORMAT_HTML]
+# Fields of every structured output record
+RECORD_FIELDS = ["database", "artifact", "value", "time", "epoch"]
+# Number of records the structured writers hold before writing them out
+WRITE_BATCH_SIZE = 1000
+
+# Tables of the results case database, every artifact table points back to the databases table
+CASE_TABLES = [
+    ("databases", "id INTEGER PRIMARY KEY, path TEXT, encrypted INTEGER, error TEXT"),
+    ("users", "database_id INTEGER, email TEXT, time_added TEXT, epoch REAL"),
+    ("profiles", "database_id INTEGER, full_name TEXT, date_of_birth TEXT"),
+    ("computers", "database_id INTEGER, name TEXT, time_added TEXT, epoch INTEGER"),
+    ("recovery_emails", "database_id INTEGER, email TEXT"),
+    ("recovery_phones", "database_id INTEGER, phone TEXT"),
+    ("extensions", "database_id INTEGER, name TEXT"),
+    ("sites", "database_id INTEGER, url TEXT"),
+    ("recovered", "database_id INTEGER, source TEXT, artifact TEXT, value TEXT, time_added TEXT, epoch REAL"),
+]
+# Indexes of the case database, dropped while loading and created once every row is in
+CASE_INDEXES = [
+    ("databases_path", "databases", "path"),
+    ("users_email", "users", "email"),
+    ("computers_name", "computers", "name"),
+    ("recovery_emails_email", "recovery_emails", "email"),
+    ("recovery_phones_phone", "recovery_phones", "phone"),
+    ("extensions_name", "extensions", "name"),
+    ("sites_url", "sites", "url"),
+    ("recovered_value", "recovered", "value"),
+]
+# Number of rows the case database holds before inserting them in one transaction
+CASE_BATCH_SIZE = 50000
+
+# Default size limit of the extraction cache in MiB, least recently used entries are evicted above it
+CACHE_SIZE = 512
+# Version of the extracted artifacts stored in the extraction cache, raise it whenever the parsing or the stored
+# format changes so entries written by an older parser are not reused
+CACHE_VERSION = 3
+# Bytes read at a time when hashing a database for the extraction cache
+HASH_CHUNK_SIZE = 1048576
+
+# Where each system keeps the user folders under the starting path, and the Chrome and Chromium folders
+# inside a user folder that hold the profile folders
+SYSTEM_LAYOUTS = {
+    "Windows": (["Users"], [
+        ["AppData", "Local", "Google", "Chrome", "User Data"],
+        ["AppData", "Local", "Chromium", "User Data"],
+    ]),
+    "XP": (["Documents and Settings"], [
+        ["Application Support", "Google", "Chrome", "User Data"],
+        ["Local Settings", "Application Data", "Google", "Chrome", "User Data"],
+        ["Local Settings", "Application Data", "Chromium", "User Data"],
+    ]),
+    "Darwin": (["Users"], [
+        ["Library", "Application Support", "Google", "Chrome"],
+        ["Library", "Application Support", "Chromium"],
+    ]),
+    "Linux": (["home"], [
+        [".config", "google-chrome"],
+        [".config", "chromium"],
+    ]),
+}
+SYSTEMS = sorted(SYSTEM_LAYOUTS)
+# Profile folders that can hold a sync database, Default and Profile 1, Profile 2...
+PROFILE_PATTERN = re.compile(r"^(Default|Profile \d+)$")
+
+# Archive members holding a database, whatever user and Chrome folders come before the profile folder
+ARCHIVE_PATTERN = re.compile(r"(^|/)(Default|Profile \d+)/Sync Data/SyncData\.sqlite3$")
+# Largest archive member in bytes read into memory, larger ones are spooled to a temporary file
+ARCHIVE_MEMORY_LIMIT = 67108864
+
+# Ways SyncFile can read the metas table
+# full keeps every column of every row in self.metadata, stream only selects the needed columns in batches
+# pushdown streams like stream but has SQLite drop the rows no extractor wants
+READ_FULL = "full"
+READ_STREAM = "stream"
+READ_PUSHDOWN = "pushdown"
+READ_MODES = [READ_FULL, READ_STREAM, READ_PUSHDOWN]
+# Number of rows pulled from the cursor at a time when streaming
+BATCH_SIZE = 5000
+
+# Record types found by the leading bytes of the specifics column
+RECORD_COMPUTER = "computer"
+RECORD_RECOVERY_EMAIL = "recoveryEmail"
+RECORD_EXTENSION = "extension"
+
+# Artifacts SyncFile can extract, the record types above are artifacts as well
+ARTIFACT_USER = "user"
+ARTIFACT_ENCRYPTED = "encrypted"
+ARTIFACT_PROFILE = "profile"
+ARTIFACT_SITES = "sites"
+ARTIFACTS = [ARTIFACT_USER, ARTIFACT_ENCRYPTED, ARTIFACT_PROFILE, RECORD_COMPUTER, RECORD_RECOVERY_EMAIL,
+             RECORD_EXTENSION, ARTIFACT_SITES]
+
+# Report sections that can be picked with --only and the artifacts each one is extracted from
+SECTIONS = {
+    "account": [ARTIFACT_USER],
+    "profile": [ARTIFACT_PROFILE],
+    "computers": [RECORD_COMPUTER],
+    "recoveryEmail": [RECORD_RECOVERY_EMAIL],
+    "extensions": [RECORD_EXTENSION],
+    "sites": [ARTIFACT_SITES],
+}
+
+# Maps each SyncFile variable to the artifact that sets it, the variables are only extracted on first access
+ARTIFACT_ATTRIBUTES = {
+    "userAccount": ARTIFACT_USER,
+    "encrypted": ARTIFACT_ENCRYPTED,
+    "firstName": ARTIFACT_PROFILE,
+    "lastName": ARTIFACT_PROFILE,
+    "DOB": ARTIFACT_PROFILE,
+    "recoveryPhone": ARTIFACT_PROFILE,
+    "computerNames": RECORD_COMPUTER,
+    "recoveryEmail": RECORD_RECOVERY_EMAIL,
+    "extension": RECORD_EXTENSION,
+    "http": ARTIFACT_SITES,
+    "https": ARTIFACT_SITES,
+}
+
+# Maps the first two bytes of the specifics protobuf field tag to the record type and the full prefix to match
+# \xd2\xb9 starts the device_info tag, \x8a\xbf\x0f the autofill tag and \xba\xbf\x17 the extension tag
+# The byte after the autofill and extension tags is the length of the record
+SPECIFICS_SIGNATURES = {
+    0xd2b9: (RECORD_COMPUTER, b"\xd2\xb9"),
+    0x8abf: (RECORD_RECOVERY_EMAIL, b"\x8a\xbf\x0f5"),
+    0xbabf: (RECORD_EXTENSION, b"\xba\xbf\x17i"),
+}
+
+# Protobuf wire types found in the specifics, groups are not used by sync
+WIRE_VARINT = 0
+WIRE_LENGTH = 2
+# Size in bytes of the fixed width wire types
+WIRE_FIXED_SIZES = {1: 8, 5: 4}
+
+# Fields of a PreferenceSpecifics message, the value is JSON
+PREFERENCE_FIELDS = {1: ("name", str), 2: ("value", str)}
+# EntitySpecifics field numbers decoded by DecodeSpecifics, with the name and the typed fields read of each record
+SPECIFICS_FIELDS = {
+    31729: ("autofill", {1: ("name", str), 2: ("value", str)}),
+    37702: ("preference", PREFERENCE_FIELDS),
+    48119: ("extension", {1: ("id", str), 6: ("name", str)}),
+    154522: ("deviceInfo", {2: ("clientName", str)}),
+    163425: ("priorityPreference", {1: ("preference", PREFERENCE_FIELDS)}),
+}
+
+# Tables the metas rows are read from, deleted_metas keeps rows sync has deleted until they are purged
+METAS_TABLE = "metas"
+DELETED_TABLE = "deleted_metas"
+
+# First bytes of every SQLite database file
+SQLITE_MAGIC = b"SQLite format 3\x00"
+# Page type flag of a table b-tree leaf page, the only pages rows are stored on
+TABLE_LEAF_PAGE = 0x0D
+# Bytes of the database read by the carver before the mapped pages are released
+CARVE_WINDOW = 67108864
+# Specifics tags searched for in unallocated space, the email and extension tags include the record length
+#   the same way SPECIFICS_SIGNATURES does, computers and profile values use the full EntitySpecifics tag
+CARVE_SIGNATURES = [
+    (RECORD_COMPUTER, b"\xd2\xb9\x4b"),
+    (RECORD_RECOVERY_EMAIL, b"\x8a\xbf\x0f5"),
+    (RECORD_EXTENSION, b"\xba\xbf\x17i"),
+    (ARTIFACT_PROFILE, b"\x8a\xe6\x4f"),
+]
+CARVE_PATTERN = re.compile(b"|".join(b"(" + re.escape(tag) + b")" for _, tag in CARVE_SIGNATURES))
+# Priority preferences that hold profile values, with the artifact each carved value is reported as
+#   other priority preferences are settings and are not carved
+CARVE_PROFILE_PREFERENCES = {
+    "FirstName": "firstName",
+    "LastName": "lastName",
+    "BirthDay": "birthDay",
+    "BirthYear": "birthYear",
+    "RecoveryPhoneNumber": "recoveryPhone",
+}
+# Printable runs starting with a url scheme, the end is trimmed by CarveRegion
+SITE_PATTERN = re.compile(rb"https?://[!-~]+")
+
+# WAL header magic numbers, the last bit is set when the checksums use big endian words
+WAL_MAGIC = (0x377f0682, 0x377f0683)
+WAL_HEADER_SIZE = 32
+WAL_FRAME_HEADER_SIZE = 24
+
+# How times are shown, UTC by default so the output does not depend on the examiner's time zone
+TIME_UTC = "utc"
+TIME_LOCAL = "local"
+TIME_ISO = "iso"
+TIME_STYLES = [TIME_UTC, TIME_LOCAL, TIME_ISO]
+TIME_TEXT_FORMAT = "%Y-%m-%d %H:%M:%S"
+TIME_ISO_FORMAT = "%Y-%m-%dT%H:%M:%SZ"
+# Number of converted times kept by a TimeConverter before it starts over
+TIME_MEMO_SIZE = 65536
+
+# Ports left out of normalized urls
+DEFAULT_PORTS = {"http": 80, "https": 443}
+
+# Identifier kinds the correlation index looks for across databases
+CORRELATE_ACCOUNT = "account"
+CORRELATE_PHONE = "recoveryPhone"
+CORRELATION_KINDS = [CORRELATE_ACCOUNT, RECORD_COMPUTER, RECORD_RECOVERY_EMAIL, CORRELATE_PHONE]
+
+# Number of paths and results each pipeline queue holds before the stage feeding it waits
+PIPELINE_QUEUE_SIZE = 16
+
+# Databases read ahead of the results for each worker process
+PARSE_AHEAD = 2
+
+# ClassifyMetadata times its handlers on one row in this many when profiling
+PROFILE_SAMPLE = 16
+
+# A job checkpoint is written after this many finished databases or seconds, whichever comes first
+CHECKPOINT_INTERVAL = 100
+CHECKPOINT_SECONDS = 60
+
 
 def ParseCommandLine():
     """
@@ -36,7 +290,12 @@ def ParseCommandLine():
     # Allows the user to create a starting path for a system extraction.
     # If set the program will go to this path before going into each users folder
     parser.add_argument('-p', '--path', default=False,
-                        help="Starting Path to where the database should recursively look for databases")
+                        help="Starting Path to where the database should recursively look for databases, "
+                             "or a zip or tar archive of an export to search without extracting it")
+    parser.add_argument('--archive-memory', dest='archiveMemory', type=int,
+                        default=ARCHIVE_MEMORY_LIMIT // 1048576,
+                        help="Archived databases up to this size in MiB are read into memory, larger ones are "
+                             "spooled to a temporary file")
 
     # Verbose CLI argument, enables error printing etc.
     parser.add_argument('-v', '--verbose', type=int, default=3,
@@ -46,6 +305,80 @@ def ParseCommandLine():
     # If no file is set, the program will print data to the screen.
     parser.add_argument('-f', '--outFile', default=False, help="allows the output to be stored to a file")
 
+    # Allows the examination of an export from another system, defaults to the running system
+    parser.add_argument('-s', '--system', choices=SYSTEMS, default=None,
+                        help="Folder layout of the system being examined, defaults to the running system")
+
+    # Machine readable output, one record per artifact
+    parser.add_argument('-o', '--format', choices=FORMATS, default=FORMAT_TEXT,
+                        help="Output format: text report, JSON Lines or CSV with one record per artifact, "
+                             "or a JSON document or HTML page with one report per database")
+
+    # Collects every artifact of every database into one SQLite results database
+    parser.add_argument('-c', '--case', default=False,
+                        help="Path to a SQLite case database every artifact is also written to")
+
+    # Re-uses the results of databases that have not changed since the last run
+    parser.add_argument('--cache', default=False,
+                        help="Path to an extraction cache, unchanged databases are not opened again")
+    parser.add_argument('--cache-size', dest='cacheSize', type=int, default=CACHE_SIZE,
+                        help="Size limit of the extraction cache in MiB")
+    parser.add_argument('--cache-hash', dest='cacheHash', action='store_true',
+                        help="Also match cached databases on a SHA-256 of their contents")
+
+    # Number of worker processes used to parse databases, 1 parses them in this process
+    parser.add_argument('-j', '--jobs', type=int, default=1,
+                        help="Number of worker processes used to parse the databases")
+
+    # Sets how the metas table is read, streaming keeps memory flat on large databases
+    parser.add_argument('-m', '--mode', choices=READ_MODES, default=READ_STREAM,
+                        help="How the metas table is read: full keeps every row, stream reads the needed columns "
+                             "in batches, pushdown also has SQLite filter out rows no extractor wants")
+
+    # Only the artifacts behind the picked sections are read from each database
+    parser.add_argument('--only', type=ParseSections, default=ARTIFACTS,
+                        help="Comma separated sections to extract and show, out of: " + ",".join(SECTIONS))
+
+    # Also reads deleted_metas and carves the free pages of each database
+    parser.add_argument('-r', '--recover', action='store_true',
+                        help="Also recovers deleted artifacts from deleted_metas and the free pages of the database")
+
+    # Applies the committed frames of the -wal file in memory and reports what only the WAL holds
+    parser.add_argument('-w', '--wal', action='store_true',
+                        help="Also reports the artifacts only found in the SyncData.sqlite3-wal file")
+
+    # Times are UTC unless asked for otherwise, the raw epoch is also kept in jsonl, csv and the case database
+    parser.add_argument('-t', '--time', choices=TIME_STYLES, default=TIME_UTC,
+                        help="How times are shown: utc or local as 2014-02-24 21:49:54, or iso as 2014-02-24T21:49:54Z")
+
+    # Counts the sites of every database by domain
+    parser.add_argument('--top', type=int, default=0,
+                        help="Prints the N domains with the most sites for each database and across all of them")
+
+    # Finds the computers, emails and phone numbers shared by more than one database
+    parser.add_argument('--correlate', action='store_true',
+                        help="Prints the accounts, computers, recovery emails and phones found in several databases")
+
+    # Runs discovery, extraction and output as separate stages of an asyncio pipeline
+    parser.add_argument('--async', dest='asyncPipeline', action='store_true',
+                        help="Overlaps discovery, parsing and output, results are shown in the order they finish")
+
+    # Runs the databases of a manifest as a job that can be resumed after an interruption
+    parser.add_argument('--manifest', default=False,
+                        help="File listing the database paths to parse, one per line, written by discovery if it "
+                             "does not exist. Finished databases are checkpointed and skipped when run again")
+    parser.add_argument('--checkpoint', default=False,
+                        help="Checkpoint file of the job, defaults to the manifest path followed by .done")
+
+    # Records the time, rows and peak memory of each stage of each database
+    parser.add_argument('--profile', action='store_true',
+                        help="Prints the time and rows of each stage and database to stderr")
+    parser.add_argument('--profile-json', dest='profileJson', default=False,
+                        help="Also writes the profile to this JSON file, implies --profile")
+    parser.add_argument('--profile-memory', dest='profileMemory', action='store_true',
+                        help="Also records the peak memory of each stage with tracemalloc, which slows the run, "
+                             "implies --profile")
+
     return parser.parse_args()
     # End ParseCommandLine ================================
 
@@ -71,653 +404,4422 @@ def ValidateDatabase(filePath):
     # End ValidateDatabase ================================
 
 
-def GetDatabases(startingPath):
+def ParseSections(text):
     """
-    Name:           GetDatabases
+    Name:           ParseSections
+
+    Description:    Turns a comma separated list of section names into the artifacts to extract
+
+    Input:          Text such as computers,extensions
+
+    Actions:        Checks every name is a SECTIONS key
+                    Returns the artifacts of the sections in ARTIFACTS order, the encrypted check is always kept
+                        as it explains why a section may be empty
+    """
+    wanted = set([ARTIFACT_ENCRYPTED])
+    for name in text.split(","):
+        name = name.strip()
+        if name not in SECTIONS:
+            raise argparse.ArgumentTypeError("Error: Unknown section {0}, choose from {1}".format(
+                name, ", ".join(SECTIONS)))
+        wanted.update(SECTIONS[name])
+    return [artifact for artifact in ARTIFACTS if artifact in wanted]
+    # End ParseSections ===================================
+
+
+def DetectSystem():
+    """
+    Name:           DetectSystem
+
+    Description:    Finds the folder layout of the running system
+
+    Input:          None
+
+    Actions:        Checks the System type and release.
+                    Returns the SYSTEM_LAYOUTS key for the running system or False if it is not known
+    """
+    # Checks if the running system is Windows
+    if platform.system() == "Windows":
+        # Checks if the system is XP, every later release uses the Users folder
+        if platform.release() == "XP":
+            return "XP"
+        return "Windows"
+    elif platform.system() in SYSTEM_LAYOUTS:
+        return platform.system()
+    return False
+    # End DetectSystem ====================================
+
+
+def ScanDirectories(path):
+    """
+    Name:           ScanDirectories
+
+    Description:    Returns the sub directories of a path, sorted by name
+
+    Input:          Path to a directory
 
-    Description:    Runs through each users directory on a system to pull the SyncData.sqlite3 file
+    Actions:        Uses os.scandir so no extra stat call is needed per entry
+                    Returns an empty list if the path is missing or can not be read
+    """
+    try:
+        with os.scandir(path) as entries:
+            directories = [entry for entry in entries if entry.is_dir()]
+    except FileNotFoundError:
+        return []
+    except (PermissionError, NotADirectoryError) as err:
+        Report(str(err), 2)
+        return []
+    # Sorted so the databases are always found in the same order
+    directories.sort(key=lambda entry: entry.name)
+    return directories
+    # End ScanDirectories =================================
+
+
+def IterDatabasePaths(startingPath, system=None):
+    """
+    Name:           IterDatabasePaths
+
+    Description:    Runs through each users directory on a system to find the SyncData.sqlite3 files
                     Also has the capability to have this search start in a new location
                         This is useful for file exports when keeping folder structure
 
     Input:          Starting Path, either the starting path or False
+                    System layout to use, a SYSTEM_LAYOUTS key, defaults to the running system
+
+    Actions:        Walks only the user, Chrome and profile folders of the layout with os.scandir
+                    Checks the Default and every Profile N folder of Chrome and Chromium
+                    Yields each database path as soon as it is found
+    """
+    if not system:
+        system = DetectSystem()
+    if system not in SYSTEM_LAYOUTS:
+        Report("ERROR: no system detected", 3)
+        return
+    usersFolders, chromeFolders = SYSTEM_LAYOUTS[system]
+
+    # Starts from the root of the running drive if no starting path was provided
+    if not startingPath:
+        startingPath = "C:\\" if platform.system() == "Windows" else "/"
+
+    for usersFolder in usersFolders:
+        for user in ScanDirectories(os.path.join(startingPath, usersFolder)):
+            for chromeFolder in chromeFolders:
+                for profile in ScanDirectories(os.path.join(user.path, *chromeFolder)):
+                    if not PROFILE_PATTERN.match(profile.name):
+                        continue
+                    databasePath = os.path.join(profile.path, "Sync Data", "SyncData.sqlite3")
+                    if os.path.isfile(databasePath):
+                        yield databasePath
+    # End IterDatabasePaths ===============================
+
+
+def GetDatabases(startingPath, mode=READ_FULL, system=None, cache=None):
+    """
+    Name:           GetDatabases
+
+    Description:    Creates a SyncFile for every SyncData.sqlite3 file on a system
+
+    Input:          Starting Path, either the starting path or False
+                    Read mode passed to each SyncFile
+                    System layout to use, defaults to the running system
+                    Optional ExtractionCache passed to each SyncFile
+
+    Actions:        Uses IterDatabasePaths to find the databases
+                    Yields the SyncFile of each database as soon as it is found
+
+    """
+    for file in IterDatabasePaths(startingPath, system):
+        yield SyncFile(file, mode, cache)
+    # End GetDatabases ====================================
 
-    Actions:        Checks the System type and release.
-                    Uses Globing to pull each SyncData.sqlite3 file
-                    Adds the found database paths to a list and returns the list
 
+class ArchiveMember():
+    def __init__(self, name, data=None, path=None):
+        """
+        Name:           ArchiveMember
+
+        Description:    SyncData.sqlite3 file read out of a zip or tar archive, passed on instead of a path
+
+        Input:          Name the results are reported under, the archive path followed by the member name
+                        Bytes of the database if it was loaded into memory
+                        Path of the spooled copy if it was written to a temporary folder
+
+        Actions:        Holds the database until it is parsed, it is picklable so it can be sent to a worker
+        """
+        self.name = name
+        self.data = data
+        self.path = path
+        # End __init__ ====================================
+
+    def Discard(self):
+        """
+        Name:           Discard
+
+        Description:    Drops the database once it has been parsed
+
+        Input:          None
+
+        Actions:        Frees the bytes, or removes the temporary folder of a spooled copy and its -wal file
+        """
+        self.data = None
+        if self.path:
+            shutil.rmtree(os.path.dirname(self.path), ignore_errors=True)
+            self.path = None
+        # End Discard =====================================
+
+
+def IsArchive(path):
     """
+    Name:           IsArchive
+
+    Description:    Checks if a path is a zip or tar archive
 
-    # Creates a blank list
-    databaseList = []
+    Input:          Path to a file or folder
 
-    # TODO Allow the examination of a windows export on mac system and vice versa. Done by passing platform as var
+    Actions:        Returns True for a file zipfile or tarfile can open, compressed tar files included
+    """
+    if not os.path.isfile(path):
+        return False
     try:
-        # Checks if the running system is Windows
-        if platform.system() == "Windows":
-            # Checks if the system is 7 or XP
-            if platform.release() == "7":
-                # Checks if there was a starting path provided
-                if startingPath:
-                    # Sets the databasePath to the the OS specific path with the starting path defined.
-                    databasePath = startingPath + "\\Users\\*\\AppData\\Local\\Google\\Chrome\\User Data\\Default\\Sync Data\\SyncData.sqlite3"
-                else:
-                    # Sets the databasePath to the the OS specific path.
-                    databasePath = "C:\\Users\\*\\AppData\\Local\\Google\\Chrome\\User Data\\Default\\Sync Data\\SyncData.sqlite3"
-            elif platform.release() == "XP":
-                if startingPath:
-                    # Sets the databasePath to the the OS specific path with the starting path defined.
-                    databasePath = startingPath + "\\Documents and Settings\\*\\Application Support\\Google\\Chrome\\User Data\\Default\\Sync Data\\SyncData.sqlite3"
+        return zipfile.is_zipfile(path) or tarfile.is_tarfile(path)
+    except OSError:
+        return False
+    # End IsArchive =======================================
+
+
+def ArchiveEntries(archive):
+    """
+    Name:           ArchiveEntries
+
+    Description:    Lists the regular files of an open zip or tar archive
+
+    Input:          Open zipfile.ZipFile or tarfile.TarFile
+
+    Actions:        Reads only the member index, no member is decompressed
+                    Tar hard links are listed with the size of the member they link to,
+                        extractfile reads the linked member's data for them
+                    Returns a list of (member name with / separators, size, function opening the member)
+    """
+    if isinstance(archive, zipfile.ZipFile):
+        return [(info.filename.replace("\\", "/"), info.file_size, functools.partial(archive.open, info))
+                for info in archive.infolist() if not info.is_dir()]
+    entries = []
+    for info in archive.getmembers():
+        size = info.size
+        if info.islnk():
+            # Identical files are stored once in a tar, every later copy is a hard link to the first
+            try:
+                size = archive.getmember(info.linkname).size
+            except KeyError:
+                Report("ERROR: {0} links to {1}, which is not in the archive".format(info.name, info.linkname), 2)
+                continue
+        elif not info.isfile():
+            continue
+        entries.append((info.name, size, functools.partial(archive.extractfile, info)))
+    return entries
+    # End ArchiveEntries ==================================
+
+
+def SpoolMember(opener, folder, fileName):
+    """
+    Name:           SpoolMember
+
+    Description:    Copies one archive member into a temporary folder
+
+    Input:          Function opening the member, temporary folder, file name to write
+
+    Actions:        Streams the member in HASH_CHUNK_SIZE blocks so it is never held in memory whole
+                    Returns the path of the copy
+    """
+    path = os.path.join(folder, fileName)
+    with opener() as source, open(path, "wb") as target:
+        shutil.copyfileobj(source, target, HASH_CHUNK_SIZE)
+    return path
+    # End SpoolMember =====================================
+
+
+def IterArchiveDatabases(archivePath, memoryLimit=ARCHIVE_MEMORY_LIMIT, spool=False):
+    """
+    Name:           IterArchiveDatabases
+
+    Description:    Finds the SyncData.sqlite3 files inside a zip or tar archive without extracting it
+
+    Input:          Path to the archive
+                    Largest database in bytes that is loaded into memory, larger ones are spooled to disk
+                    True to spool every database with its -wal file, recovery and WAL parsing need a file
+
+    Actions:        Matches the members ending in <Default or Profile N>/Sync Data/SyncData.sqlite3,
+                        whatever folders come before them, so any user or system layout is found
+                    Reads each match into memory, or copies it into a temporary folder
+                    Spools every match when sqlite3 cannot open a database from memory, before Python 3.11
+                    Yields an ArchiveMember for each database as soon as it has been read
+    """
+    # OpenImage needs Connection.deserialize, without it every database is read from a spooled copy
+    inMemory = not spool and hasattr(lite.Connection, "deserialize")
+    if zipfile.is_zipfile(archivePath):
+        archive = zipfile.ZipFile(archivePath)
+    else:
+        archive = tarfile.open(archivePath, "r:*")
+    with archive:
+        entries = ArchiveEntries(archive)
+        openers = dict((name, opener) for name, size, opener in entries)
+        for name, size, opener in entries:
+            if not ARCHIVE_PATTERN.search(name):
+                continue
+            memberName = "{0}/{1}".format(archivePath, name)
+            folder = None
+            try:
+                if size <= memoryLimit and inMemory:
+                    with opener() as source:
+                        member = ArchiveMember(memberName, data=source.read())
                 else:
-                    # Sets the databasePath to the the OS specific path
-                    databasePath = "C:\\Documents and Settings\\*\\Application Support\\Google\\Chrome\\User Data\\Default\\Sync Data\\SyncData.sqlite3"
-        elif platform.system() == "Darwin":
-            if startingPath:
-                # Sets the databasePath to the the OS specific path with the starting path defined.
-                databasePath = startingPath +"/Users/*/Library/Application Support/Google/Chrome/Default/Sync Data/SyncData.sqlite3"
-            else:
-                # Sets the databasePath to the the OS specific path
-                databasePath = "/Users/*/Library/Application Support/Google/Chrome/Default/Sync Data/SyncData.sqlite3"
+                    folder = tempfile.mkdtemp(prefix="ChromeParser-")
+                    member = ArchiveMember(memberName, path=SpoolMember(opener, folder, "SyncData.sqlite3"))
+                    if spool and name + "-wal" in openers:
+                        SpoolMember(openers[name + "-wal"], folder, "SyncData.sqlite3-wal")
+            except (OSError, EOFError, zipfile.BadZipFile, tarfile.TarError, zlib.error) as err:
+                # A damaged member is reported and skipped, the rest of the archive is still read
+                Report("ERROR: Could not read {0}\n{1}".format(memberName, err), 3)
+                if folder:
+                    shutil.rmtree(folder, ignore_errors=True)
+                continue
+            yield member
+    # End IterArchiveDatabases ============================
+
+
+# SQL predicates for the metas rows each artifact can come from, used by pushdown reads
+# They may let through rows the extractors reject, but never drop a row an extractor would keep
+NAME_PREDICATES = {
+    ARTIFACT_ENCRYPTED: "`non_unique_name` = 'encrypted'",
+    ARTIFACT_PROFILE: "substr(`non_unique_name`, 16, 8) IN ('FirstNam', 'LastName', 'BirthDay', 'BirthYea', "
+                      "'Recovery')",
+    ARTIFACT_SITES: "(`non_unique_name` LIKE 'http://%' OR `non_unique_name` LIKE 'https://%')",
+}
+SPECIFICS_PREDICATES = dict(
+    (recordType, "substr(`specifics`, 1, {0}) = X'{1}'".format(len(prefix), prefix.hex()))
+    for recordType, prefix in SPECIFICS_SIGNATURES.values())
+
+
+def PushdownQuery(artifacts=ARTIFACTS, table=METAS_TABLE):
+    """
+    Name:           PushdownQuery
+
+    Description:    Builds the metas query used by pushdown reads
+
+    Input:          Artifacts the rows are needed for, defaults to all of them
+                    Table the rows are read from, metas or deleted_metas
+
+    Actions:        Joins the name and specifics predicates of the artifacts with OR
+                    Returns a query selecting only the ctime, non_unique_name and specifics columns
+    """
+    predicates = [NAME_PREDICATES[name] for name in NAME_PREDICATES if name in artifacts]
+    predicates += [SPECIFICS_PREDICATES[name] for name in SPECIFICS_PREDICATES if name in artifacts]
+    return "SELECT `ctime`, `non_unique_name`, `specifics` FROM `{0}` WHERE {1};".format(table,
+                                                                                         " OR ".join(predicates))
+    # End PushdownQuery ===================================
+
+
+def VerifyPushdown(database):
+    """
+    Name:           VerifyPushdown
+
+    Description:    Checks that pushdown reads return the same artifacts as filtering in Python
+
+    Input:          Path to the syncFile Database
+
+    Actions:        Builds the database once in stream mode and once in pushdown mode
+                    Returns a list of the artifact names whose values differ, empty if both agree
+    """
+    expected = SyncFile(database, READ_STREAM).GetArtifacts()
+    found = SyncFile(database, READ_PUSHDOWN).GetArtifacts()
+    return [name for name in expected if expected[name] != found[name]]
+    # End VerifyPushdown ==================================
+
+
+def SpecificsType(specifics):
+    """
+    Name:           SpecificsType
+
+    Description:    Finds the record type of a specifics blob from its leading bytes
+
+    Input:          The specifics column as bytes or a memoryview
+
+    Actions:        Reads the first two bytes as an int and looks them up in SPECIFICS_SIGNATURES
+                    Checks the rest of the signature against the prefix without copying the blob
+                    Computers need more than the signature to remove false positives that don't have enough data
+                    Returns the record type or None
+    """
+    # Program was hanging on None values, text values are never records
+    if not isinstance(specifics, (bytes, memoryview)) or len(specifics) < 2:
+        return None
+    signature = SPECIFICS_SIGNATURES.get(specifics[0] << 8 | specifics[1])
+    if signature is None:
+        return None
+    recordType, prefix = signature
+    if specifics[:len(prefix)] != prefix:
+        return None
+    # Any computer record over 14 bytes has enough data, shorter ones use the printed length as before
+    if recordType == RECORD_COMPUTER and len(specifics) <= 14 and len(repr(bytes(specifics))) <= 23:
+        return None
+    return recordType
+    # End SpecificsType ===================================
+
+
+def ReadVarint(buffer, offset=0):
+    """
+    Name:           ReadVarint
+
+    Description:    Reads one protobuf varint
+
+    Input:          Bytes or memoryview, offset of the first byte of the varint
+
+    Actions:        Returns the value and the offset of the byte after it
+                    Raises ValueError if the varint is cut off or longer than 10 bytes
+    """
+    result = 0
+    shift = 0
+    end = len(buffer)
+    while True:
+        if offset >= end:
+            raise ValueError("Truncated varint")
+        byte = buffer[offset]
+        offset += 1
+        result |= (byte & 0x7f) << shift
+        if not byte & 0x80:
+            return result, offset
+        shift += 7
+        if shift >= 70:
+            raise ValueError("Varint is longer than 10 bytes")
+    # End ReadVarint ======================================
+
+
+def IterFields(buffer):
+    """
+    Name:           IterFields
+
+    Description:    Yields the fields of one protobuf message
+
+    Input:          Bytes or memoryview of the message
+
+    Actions:        Yields (field number, wire type, value) for every field in the order they are stored
+                    Varint and fixed fields are ints, length delimited fields are memoryview slices of the
+                        buffer so nested messages and strings are never copied
+                    Raises ValueError on a truncated field or a group wire type
+    """
+    view = buffer if isinstance(buffer, memoryview) else memoryview(buffer)
+    end = len(view)
+    offset = 0
+    while offset < end:
+        key, offset = ReadVarint(view, offset)
+        number = key >> 3
+        wireType = key & 7
+        if wireType == WIRE_VARINT:
+            value, offset = ReadVarint(view, offset)
+        elif wireType == WIRE_LENGTH:
+            length, offset = ReadVarint(view, offset)
+            if offset + length > end:
+                raise ValueError("Truncated field {0}".format(number))
+            value = view[offset:offset + length]
+            offset += length
+        elif wireType in WIRE_FIXED_SIZES:
+            size = WIRE_FIXED_SIZES[wireType]
+            if offset + size > end:
+                raise ValueError("Truncated field {0}".format(number))
+            value = int.from_bytes(view[offset:offset + size], "little")
+            offset += size
         else:
-            Report("ERROR: no system detected", 3)
-            return databaseList
-    except Exception as err:
-        Report(str(err),2)
-
-    # Performs the actual glob search using the previously defined databasePath
-    for file in glob.glob(databasePath):
-        # Adds each found database to the databaseList
-        databaseList.append(SyncFile(file))
-    # Returns the databaseList
-    return databaseList
-    # End GetDatabases ====================================
+            raise ValueError("Unsupported wire type {0} in field {1}".format(wireType, number))
+        yield number, wireType, value
+    # End IterFields ======================================
 
 
-class SyncFile():
-    def __init__(self, database):
+def DecodeMessage(buffer, fields):
+    """
+    Name:           DecodeMessage
+
+    Description:    Decodes the known fields of one protobuf message
+
+    Input:          Bytes or memoryview of the message
+                    Dictionary of field number to (name, type), the type is str, int, bool or
+                        the fields dictionary of a nested message
+
+    Actions:        Returns a dictionary of the typed values, unknown fields and fields with an
+                        unexpected wire type are skipped, the last value of a repeated field is kept
+                    Strings are decoded as UTF-8 with bad bytes replaced
+    """
+    result = {}
+    for number, wireType, value in IterFields(buffer):
+        field = fields.get(number)
+        if field is None:
+            continue
+        name, kind = field
+        if wireType == WIRE_LENGTH:
+            if kind is str:
+                result[name] = str(value, "utf-8", "replace")
+            elif isinstance(kind, dict):
+                result[name] = DecodeMessage(value, kind)
+        elif wireType == WIRE_VARINT and kind in (int, bool):
+            result[name] = kind(value)
+    return result
+    # End DecodeMessage ===================================
+
+
+def DecodeSpecifics(specifics):
+    """
+    Name:           DecodeSpecifics
+
+    Description:    Decodes the typed fields of a specifics blob
+
+    Input:          The specifics column as bytes or a memoryview
+
+    Actions:        Walks the EntitySpecifics message in one pass without copying it
+                    Returns (kind, fields) for the first record type in SPECIFICS_FIELDS,
+                        such as ("deviceInfo", {"clientName": ..., ...})
+                    Returns None for text values, unknown record types and blobs that do not decode
+    """
+    # Program was hanging on None values, text values are never records
+    if not isinstance(specifics, (bytes, memoryview)):
+        return None
+    try:
+        for number, wireType, value in IterFields(specifics):
+            known = SPECIFICS_FIELDS.get(number)
+            if known is not None and wireType == WIRE_LENGTH:
+                return known[0], DecodeMessage(value, known[1])
+    except ValueError:
+        return None
+    return None
+    # End DecodeSpecifics =================================
+
+
+def SpecificsValue(specifics):
+    """
+    Name:           SpecificsValue
+
+    Description:    Returns the value of a preference, priority preference or autofill record,
+                        the client name of a device info record or the name of an extension record
+
+    Input:          The specifics column as bytes or a memoryview
+
+    Actions:        Uses DecodeSpecifics, preference values are stored as JSON so a JSON string is unquoted
+                    Returns None if the blob has no such value, the caller then falls back to the
+                        value in the name of the row
+    """
+    decoded = DecodeSpecifics(specifics)
+    if decoded is None:
+        return None
+    kind, fields = decoded
+    if kind == "deviceInfo":
+        return fields.get("clientName")
+    elif kind == "extension":
+        return fields.get("name")
+    elif kind == "priorityPreference":
+        fields = fields.get("preference", {})
+    value = fields.get("value")
+    if value is None:
+        return None
+    if len(value) > 1 and value[0] == value[-1] == '"':
+        try:
+            return json.loads(value)
+        except ValueError:
+            pass
+    return value
+    # End SpecificsValue ==================================
+
+
+def ProfileValue(specifics, name, start):
+    """
+    Name:           ProfileValue
+
+    Description:    Returns the value of a profile row
+
+    Input:          The row specifics, the raw row name and where the value starts in the name
+
+    Actions:        Uses the preference value decoded by SpecificsValue
+                    Falls back to the legacy slice of the name, such as name[25:] for FirstName,
+                        when the specifics do not hold a preference value
+    """
+    value = SpecificsValue(specifics)
+    if value is None:
+        return str(name[start:])
+    return str(value)
+    # End ProfileValue ====================================
+
+
+def RecordValue(specifics, fallback):
+    """
+    Name:           RecordValue
+
+    Description:    Returns the value of a computer, recovery email or extension row
+
+    Input:          The row specifics, the value taken from the row name
+
+    Actions:        Uses the client name, autofill value or extension name decoded by SpecificsValue
+                    Falls back to the value from the row name when the specifics do not hold one
+    """
+    value = SpecificsValue(specifics)
+    if value is None:
+        return fallback
+    return value
+    # End RecordValue =====================================
+
+
+def FreelistMap(data, pageSize, pageCount):
+    """
+    Name:           FreelistMap
+
+    Description:    Marks every page on the freelist of a database
+
+    Input:          Mapped database file, page size, number of pages in the file
+
+    Actions:        Follows the freelist trunk pages from the first trunk page in the header at offset 32
+                    Marks each trunk page and the leaf pages it lists in a bitmap, one bit per page,
+                        so the map stays small on multi GB databases
+                    Stops on a page number outside the file or a trunk page seen before
+                    Returns the bitmap as a bytearray
+    """
+    free = bytearray((pageCount >> 3) + 1)
+    trunk = int.from_bytes(data[32:36], "big")
+    while 1 <= trunk <= pageCount and not free[(trunk - 1) >> 3] & 1 << ((trunk - 1) & 7):
+        free[(trunk - 1) >> 3] |= 1 << ((trunk - 1) & 7)
+        base = (trunk - 1) * pageSize
+        # A trunk page starts with the next trunk page and the number of leaf pages listed after it
+        header = data[base:base + 8]
+        leaves = min(int.from_bytes(header[4:8], "big"), pageSize // 4 - 2)
+        leafNumbers = data[base + 8:base + 8 + leaves * 4]
+        for offset in range(0, len(leafNumbers), 4):
+            leaf = int.from_bytes(leafNumbers[offset:offset + 4], "big")
+            if 1 <= leaf <= pageCount:
+                free[(leaf - 1) >> 3] |= 1 << ((leaf - 1) & 7)
+        trunk = int.from_bytes(header[:4], "big")
+    return free
+    # End FreelistMap =====================================
+
+
+def IterUnallocated(data, pageSize, usable, pageCount, free):
+    """
+    Name:           IterUnallocated
+
+    Description:    Yields the unallocated regions of a database one page at a time
+
+    Input:          Mapped database file, page size, usable bytes of each page,
+                        number of pages in the file, bitmap from FreelistMap
+
+    Actions:        Yields (page number, bytes) for every freelist page
+                    Yields the gap between the cell pointers and the cell content of every table leaf page,
+                        and each freeblock on its freeblock chain
+                    Only one page is copied out of the map at a time, the mapped pages of every
+                        CARVE_WINDOW bytes already read are released so memory stays bounded
+    """
+    release = hasattr(mmap, "MADV_DONTNEED")
+    for number in range(1, pageCount + 1):
+        base = (number - 1) * pageSize
+        if release and base and base % CARVE_WINDOW == 0:
+            data.madvise(mmap.MADV_DONTNEED, base - CARVE_WINDOW, CARVE_WINDOW)
+        page = data[base:base + usable]
+        if free[(number - 1) >> 3] & 1 << ((number - 1) & 7):
+            yield number, page
+            continue
+        # The first page starts with the 100 byte database header
+        header = 100 if number == 1 else 0
+        if len(page) < header + 8 or page[header] != TABLE_LEAF_PAGE:
+            continue
+        cells = int.from_bytes(page[header + 3:header + 5], "big")
+        content = int.from_bytes(page[header + 5:header + 7], "big") or 65536
+        pointers = header + 8 + cells * 2
+        if pointers < content:
+            yield number, page[pointers:content]
+        # Freeblocks are kept in order, each starts with the offset of the next one and its size
+        block = int.from_bytes(page[header + 1:header + 3], "big")
+        while pointers <= block < usable - 4:
+            size = int.from_bytes(page[block + 2:block + 4], "big")
+            yield number, page[block:block + size]
+            following = int.from_bytes(page[block:block + 2], "big")
+            if following <= block:
+                break
+            block = following
+    # End IterUnallocated =================================
+
+
+def CarveRegion(region, artifacts=ARTIFACTS):
+    """
+    Name:           CarveRegion
+
+    Description:    Yields the artifacts found in one unallocated region
+
+    Input:          Bytes of the region
+                    Artifacts to carve, the others are not decoded and sites are not searched for unless asked
+
+    Actions:        Looks for the EntitySpecifics tags in CARVE_SIGNATURES and decodes the one field at each hit,
+                        a protobuf field carries its own length so no row structure is needed
+                    Looks for http and https names, a name and server name are stored one after the other
+                        so a url ends where the next one starts
+                    Priority preferences are labelled by CARVE_PROFILE_PREFERENCES and the other ones are dropped
+                    Yields (artifact, value) pairs
+    """
+    for match in CARVE_PATTERN.finditer(region):
+        artifact = CARVE_SIGNATURES[match.lastindex - 1][0]
+        if artifact not in artifacts:
+            continue
+        try:
+            _, start = ReadVarint(region, match.start())
+            length, start = ReadVarint(region, start)
+        except ValueError:
+            continue
+        if start + length > len(region):
+            continue
+        decoded = DecodeSpecifics(region[match.start():start + length])
+        if decoded is None:
+            continue
+        fields = decoded[1]
+        if artifact == ARTIFACT_PROFILE:
+            preference = fields.get("preference", {})
+            # The name may carry the google.profile. prefix and a trailing colon
+            name = (preference.get("name") or "").rstrip(":").rsplit(".", 1)[-1]
+            if name in CARVE_PROFILE_PREFERENCES and preference.get("value"):
+                yield CARVE_PROFILE_PREFERENCES[name], preference["value"]
+        elif artifact == RECORD_COMPUTER and fields.get("clientName"):
+            yield artifact, fields["clientName"]
+        elif artifact == RECORD_RECOVERY_EMAIL and fields.get("value"):
+            yield artifact, fields["value"]
+        elif artifact == RECORD_EXTENSION and (fields.get("name") or fields.get("id")):
+            yield artifact, fields.get("name") or fields["id"]
+    if ARTIFACT_SITES not in artifacts:
+        return
+    for match in SITE_PATTERN.finditer(region):
+        url = match.group()
+        end = url.find(b"http", 1)
+        if end > 0:
+            url = url[:end]
+        yield "site", url.decode("ascii")
+    # End CarveRegion =====================================
+
+
+def CarveDatabase(database, artifacts=ARTIFACTS):
+    """
+    Name:           CarveDatabase
+
+    Description:    Carves artifacts out of the freelist pages and unallocated space of a database
+
+    Input:          Path to the syncFile Database
+                    Artifacts passed to CarveRegion
+
+    Actions:        Maps the file read only with mmap, nothing is written and SQLite does not open it
+                    Reads the page size from the header at offset 16 and the reserved bytes at offset 20
+                    Runs CarveRegion over every region from IterUnallocated
+                    Returns a list of [artifact, value, page number], each artifact value only once
+    """
+    with open(database, "rb") as f:
+        if os.fstat(f.fileno()).st_size < 100:
+            return []
+        data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    try:
+        if data[:16] != SQLITE_MAGIC:
+            raise ValueError("{0} is not a SQLite database".format(database))
+        pageSize = int.from_bytes(data[16:18], "big")
+        # A page size of 1 is how the header stores 65536
+        if pageSize == 1:
+            pageSize = 65536
+        usable = pageSize - data[20]
+        pageCount = len(data) // pageSize
+        free = FreelistMap(data, pageSize, pageCount)
+        carved = []
+        seen = set()
+        for number, region in IterUnallocated(data, pageSize, usable, pageCount, free):
+            for artifact, value in CarveRegion(region, artifacts):
+                if (artifact, value) not in seen:
+                    seen.add((artifact, value))
+                    carved.append([artifact, value, number])
+    finally:
+        data.close()
+    return carved
+    # End CarveDatabase ===================================
+
+
+def WalChecksum(data, bigEndian, first=0, second=0):
+    """
+    Name:           WalChecksum
+
+    Description:    Continues the WAL checksum over a block of bytes
+
+    Input:          Bytes whose length is a multiple of 8, True if the words are big endian,
+                        the two checksum values to continue from
+
+    Actions:        Adds the 32 bit words two at a time the way SQLite does
+                    Returns the two new checksum values
+    """
+    words = struct.unpack("{0}{1}I".format(">" if bigEndian else "<", len(data) // 4), data)
+    for index in range(0, len(words), 2):
+        first = (first + words[index] + second) & 0xffffffff
+        second = (second + words[index + 1] + first) & 0xffffffff
+    return first, second
+    # End WalChecksum =====================================
+
+
+def WalFrames(wal):
+    """
+    Name:           WalFrames
+
+    Description:    Finds the newest committed version of every page in a WAL file
+
+    Input:          Mapped -wal file
+
+    Actions:        Checks the header magic and checksum, the magic says which byte order the checksums use
+                    Walks the frames while their salts match the header and their running checksum is valid
+                    Only frames up to the last commit frame are used, later frames were never committed
+                    Returns (page size, {page number: offset of its data in the WAL}, pages in the database
+                        after the last commit), or None if the WAL holds no committed transaction
+    """
+    if len(wal) < WAL_HEADER_SIZE:
+        return None
+    magic, version, pageSize, sequence, salt1, salt2, check1, check2 = struct.unpack(">8I", wal[:WAL_HEADER_SIZE])
+    if magic not in WAL_MAGIC:
+        return None
+    bigEndian = bool(magic & 1)
+    checksum = WalChecksum(wal[:24], bigEndian)
+    if checksum != (check1, check2):
+        return None
+    pages = {}
+    committed = {}
+    databasePages = 0
+    offset = WAL_HEADER_SIZE
+    while offset + WAL_FRAME_HEADER_SIZE + pageSize <= len(wal):
+        header = wal[offset:offset + WAL_FRAME_HEADER_SIZE]
+        page, commit, frameSalt1, frameSalt2, check1, check2 = struct.unpack(">6I", header)
+        # Frames left over from before the last checkpoint have the old salts
+        if (frameSalt1, frameSalt2) != (salt1, salt2):
+            break
+        checksum = WalChecksum(header[:8], bigEndian, *checksum)
+        checksum = WalChecksum(wal[offset + WAL_FRAME_HEADER_SIZE:offset + WAL_FRAME_HEADER_SIZE + pageSize],
+                               bigEndian, *checksum)
+        if checksum != (check1, check2):
+            break
+        pages[page] = offset + WAL_FRAME_HEADER_SIZE
+        if commit:
+            committed.update(pages)
+            pages = {}
+            databasePages = commit
+        offset += WAL_FRAME_HEADER_SIZE + pageSize
+    if not databasePages:
+        return None
+    return pageSize, committed, databasePages
+    # End WalFrames =======================================
+
+
+def WalImage(database):
+    """
+    Name:           WalImage
+
+    Description:    Builds an in memory image of a database with its committed WAL frames applied
+
+    Input:          Path to the syncFile Database
+
+    Actions:        Maps the database and its -wal file read only, neither file is changed and no -shm is made
+                    Copies the main file into the image, sized to the last commit, and overlays the
+                        newest version of each page from WalFrames
+                    Sets the read and write versions at header bytes 18 and 19 to 1 so SQLite reads the
+                        image as a rollback journal database and does not look for a WAL
+                    Returns the image as a bytearray, or None if there is no -wal file or it has no commits
+    """
+    walPath = database + "-wal"
+    if not os.path.isfile(walPath) or os.path.getsize(walPath) < WAL_HEADER_SIZE:
+        return None
+    with open(walPath, "rb") as f:
+        wal = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    try:
+        frames = WalFrames(wal)
+        if frames is None:
+            return None
+        pageSize, pages, databasePages = frames
+        image = bytearray(pageSize * databasePages)
+        with open(database, "rb") as f:
+            if os.fstat(f.fileno()).st_size:
+                main = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+                try:
+                    size = min(len(main), len(image))
+                    image[:size] = main[:size]
+                finally:
+                    main.close()
+        for page, offset in pages.items():
+            if page <= databasePages:
+                image[(page - 1) * pageSize:page * pageSize] = wal[offset:offset + pageSize]
+    finally:
+        wal.close()
+    image[18] = 1
+    image[19] = 1
+    return image
+    # End WalImage ========================================
+
+
+def OpenImage(image):
+    """
+    Name:           OpenImage
+
+    Description:    Opens a database image held in memory
+
+    Input:          Bytes like object holding a whole database file
+
+    Actions:        Loads the image into an in memory connection with Connection.deserialize,
+                        SQLite keeps its own copy so the image can be dropped afterwards
+                    An image of a WAL mode database is copied once to set header bytes 18 and 19 to 1,
+                        SQLite cannot open it otherwise, the passed image is never changed
+                    Sets the SCAN_PRAGMAS on the new connection, query_only keeps it read only
+                    Returns the connection, the caller is responsible for closing it
+                    Raises RuntimeError on Python versions before 3.11
+    """
+    if not hasattr(lite.Connection, "deserialize"):
+        # Connection.deserialize was added in Python 3.11, the file can still be parsed from disk
+        raise RuntimeError("Reading a database from memory needs Python 3.11 or later, running Python {0}.{1}".format(
+            *sys.version_info[:2]))
+    if len(image) >= 100 and bytes(image[18:20]) != b"\x01\x01":
+        image = bytearray(image)
+        image[18] = 1
+        image[19] = 1
+    connection = lite.connect(":memory:")
+    try:
+        connection.deserialize(image)
+        for pragma in SCAN_PRAGMAS:
+            connection.execute(pragma)
+    except lite.Error:
+        connection.close()
+        raise
+    return connection
+    # End OpenImage =======================================
+
+
+def WalOnly(main, wal):
+    """
+    Name:           WalOnly
+
+    Description:    Returns the artifacts only found once the WAL is applied
+
+    Input:          GetArtifacts dictionaries of the main file and of the WAL image
+
+    Actions:        Keeps the list entries of the WAL image that are not in the main file
+                    Keeps a single value such as the recovery phone only if it changed
+                    Returns a dictionary with the GetArtifacts keys, empty values where nothing is new
+    """
+    only = {}
+    for name, value in wal.items():
+        if isinstance(value, list):
+            seen = set(repr(item) for item in main.get(name) or [])
+            only[name] = [item for item in value if repr(item) not in seen]
+        else:
+            only[name] = value if value != main.get(name) else False
+    return only
+    # End WalOnly =========================================
+
+
+def OpenDatabase(database):
+    """
+    Name:           OpenDatabase
+
+    Description:    Opens a database read only without touching the file or its journals
+
+    Input:          Path to the database
+
+    Actions:        Uses a read only immutable=1 URI so SQLite takes no locks and never creates
+                        or replays a journal next to the evidence file
+                    Sets the SCAN_PRAGMAS on the new connection
+                    Returns the connection, the caller is responsible for closing it
+    """
+    uri = "file:{0}?mode=ro&immutable=1".format(urllib.request.pathname2url(os.path.abspath(database)))
+    connection = lite.connect(uri, uri=True)
+    try:
+        for pragma in SCAN_PRAGMAS:
+            connection.execute(pragma)
+    except lite.Error:
+        connection.close()
+        raise
+    return connection
+    # End OpenDatabase ====================================
+
+
+def StreamRows(cursor, batchSize=BATCH_SIZE):
+    """
+    Name:           StreamRows
+
+    Description:    Yields the rows of an executed cursor a batch at a time
+
+    Input:          Cursor with an executed query
+                    Number of rows to pull from the cursor at once
+
+    Actions:        Uses fetchmany so only one batch of rows is in memory at a time
+    """
+    while True:
+        rows = cursor.fetchmany(batchSize)
+        if not rows:
+            break
+        for row in rows:
+            yield row
+    # End StreamRows ======================================
+
+
+class NullStage():
+    # Number of rows set by the stage, never read
+    rows = 0
+
+    def __enter__(self):
         """
-        Name:           SyncFile
+        Name:           __enter__
 
-        Description:    Creates objects from passed database
+        Description:    Context returned for every stage when profiling is off
 
-        Input:          Path to the syncFile Database
+        Input:          None
 
-        Actions:        Creates the object using set functions
-                        Uses the sqlite3 library as lite
+        Actions:        Does nothing, a single shared instance is used so a stage costs one method call
+        """
+        return self
+        # End __enter__ ===================================
 
+    def __exit__(self, *exc):
         """
-        # Sets the self.database to the database path
-        self.database = database
+        Name:           __exit__
 
-        # Creates a connection to the database
-        self.connection = lite.connect(self.database)
-        # Creates a cursor object for the database
-        self.cursor = self.connection.cursor()
+        Description:    Ends a stage when profiling is off
 
-        # Sets the initial database tables to nothing
-        self.tables = []
+        Input:          Exception details, errors are not handled here
 
-        # Checks to see if the passed database is locked. If so, will raise the error and stop creating the object.
-        # Also sets the tables var
-        try:
-            # Runs the objects SQLiteTables function
-            self.SQLiteTables()
-        except lite.OperationalError as err:
-            raise err
-        # Will initiate the userAccount var
-        self.UserInfo()
-
-        # Gets all data from the metas table from the database
-        self.cursor.execute("SELECT * FROM `metas`;")
-        # Fill the metadata var with the contents of the metas table
-        self.metadata = self.cursor.fetchall()
-
-        # Used to set Object variables
-
-        self.Encrypted()
-        self.AttachedComputers()
-        self.RecoveryEmail()
-        self.FirstName()
-        self.LastName()
-        self.DateOfBirth()
-        self.RecoveryPhoneNumber()
-        self.Extensions()
-        self.HTTPSites()
-        self.HTTPSSites()
+        Actions:        Does nothing
+        """
+        return False
+        # End __exit__ ====================================
+
+
+NULL_STAGE = NullStage()
+
+
+class ProfileStage():
+    def __init__(self, profiler, name, database):
+        """
+        Name:           ProfileStage
+
+        Description:    Times one stage of one database and records its rows and peak memory
+
+        Input:          Profiler the record is added to
+                        Name of the stage
+                        Path of the database, None for stages that are not about one database
+
+        Actions:        Adds the record to the profiler, it is filled in when the stage ends
+                        The code in the stage sets self.rows to the number of rows it handled
+        """
+        self.profiler = profiler
+        self.record = profiler.Record(name, database, len(profiler.Stack()))
+        self.rows = 0
+        self.peak = 0
+        self.start = 0.0
         # End __init__ ====================================
 
-    def SQLiteTables(self):
+    def __enter__(self):
         """
-        Name:           SQLiteTables
+        Name:           __enter__
 
-        Description:    Sets a list of the tables in the SQLite database
+        Description:    Starts the stage
 
         Input:          None
 
-        Actions:        Uses the sqlite_master tables to pull all tables names
+        Actions:        Keeps the peak of the enclosing stage before resetting the tracemalloc peak,
+                            peaks are only taken when the profiler traces memory
+        """
+        stack = self.profiler.Stack()
+        if self.profiler.memory:
+            if stack:
+                stack[-1].peak = max(stack[-1].peak, tracemalloc.get_traced_memory()[1])
+            tracemalloc.reset_peak()
+        stack.append(self)
+        self.start = time.perf_counter()
+        return self
+        # End __enter__ ===================================
+
+    def __exit__(self, *exc):
+        """
+        Name:           __exit__
 
-        Note:           should always be 5 tables
-                            deleted_metas, metas, models, share_info, share_version
+        Description:    Ends the stage and fills in its record
+
+        Input:          Exception details, errors are not handled here
+
+        Actions:        Hands the peak of the stage on to the enclosing stage
         """
+        seconds = time.perf_counter() - self.start
+        stack = self.profiler.Stack()
+        stack.pop()
+        self.record.update(seconds=seconds, rows=self.rows)
+        if self.profiler.memory:
+            self.peak = max(self.peak, tracemalloc.get_traced_memory()[1])
+            if stack:
+                stack[-1].peak = max(stack[-1].peak, self.peak)
+            tracemalloc.reset_peak()
+            self.record["peakMiB"] = self.peak / 1048576.0
+        return False
+        # End __exit__ ====================================
+
+
+def Lap(seconds, handler, start, clock):
+    """
+    Name:           Lap
+
+    Description:    Adds the time since start to one handler of ClassifyMetadata
+
+    Input:          Dictionary of seconds by handler, handler name, start time, clock function
+
+    Actions:        Returns the current time, the start of the next handler
+    """
+    now = clock()
+    seconds[handler] += now - start
+    return now
+    # End Lap =============================================
+
+
+class TimedIterator():
+    def __init__(self, iterable, record):
+        """
+        Name:           TimedIterator
+
+        Description:    Times the work done producing each item of an iterable
+
+        Input:          Iterable, such as StreamRows or IterDatabasePaths
+                        Profiler record the seconds and number of items are added to
+
+        Actions:        Only the time spent inside the iterable is counted, not the time of the consumer
+        """
+        self.iterable = iterable
+        self.record = record
+        # End __init__ ====================================
+
+    def __iter__(self):
+        """
+        Name:           __iter__
+
+        Description:    Yields the items of the iterable
+
+        Input:          None
+
+        Actions:        Adds the time of every next call and the number of items to the record
+        """
+        iterator = iter(self.iterable)
+        record = self.record
+        end = object()
+        while True:
+            start = time.perf_counter()
+            item = next(iterator, end)
+            record["seconds"] += time.perf_counter() - start
+            if item is end:
+                return
+            record["rows"] += 1
+            yield item
+        # End __iter__ ====================================
+
+
+class Profiler():
+    def __init__(self, enabled=True, memory=False):
+        """
+        Name:           Profiler
+
+        Description:    Records the wall time, rows and peak memory of every stage of every database
+
+        Input:          True to record, False for the null profiler used when --profile is not set
+                        True to also record peak memory
+
+        Actions:        Starts tracemalloc when memory is recorded, the peaks are of memory allocated by Python,
+                            SQLite's own page cache is not included
+                        tracemalloc slows every allocation several times over, so without memory the
+                            times are those of a normal run and the peaks are shown as n/a
+                        When disabled Stage returns the shared NULL_STAGE and Iterate returns the
+                            iterable itself, so nothing is timed or stored
+        """
+        self.enabled = enabled
+        self.memory = enabled and memory
+        self.records = []
+        # Stages currently running in each thread, used to hand peaks to the enclosing stage
+        self.local = threading.local()
+        if self.memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+        # End __init__ ====================================
+
+    def Stack(self):
+        """
+        Name:           Stack
+
+        Description:    Returns the stages running in the calling thread
+
+        Input:          None
+
+        Actions:        Keeps one list per thread so stages of the pipeline threads do not nest into each other
+                        Peaks still come from tracemalloc, which counts the memory of the whole process
+        """
+        stack = getattr(self.local, "stack", None)
+        if stack is None:
+            stack = self.local.stack = []
+        return stack
+        # End Stack =======================================
+
+    def Record(self, name, database, depth):
+        """
+        Name:           Record
+
+        Description:    Adds an empty record for a stage
+
+        Input:          Name of the stage, database path or None, number of enclosing stages
+
+        Actions:        Returns the record so the caller can fill it in
+        """
+        record = {"stage": name, "database": database, "depth": depth, "seconds": 0.0, "rows": 0,
+                  "peakMiB": None}
+        self.records.append(record)
+        return record
+        # End Record ======================================
+
+    def Stage(self, name, database=None):
+        """
+        Name:           Stage
+
+        Description:    Returns the context a stage is run in
+
+        Input:          Name of the stage, database path or None
+
+        Actions:        Returns NULL_STAGE when profiling is off
+        """
+        if not self.enabled:
+            return NULL_STAGE
+        return ProfileStage(self, name, database)
+        # End Stage =======================================
+
+    def Iterate(self, name, iterable, database=None):
+        """
+        Name:           Iterate
+
+        Description:    Times the work done inside an iterable as a stage
+
+        Input:          Name of the stage, iterable, database path or None
+
+        Actions:        Returns a TimedIterator, or the iterable itself when profiling is off
+                        Peak memory is not recorded, the iterable may be read from another thread
+        """
+        if not self.enabled:
+            return iterable
+        return TimedIterator(iterable, self.Record(name, database, None))
+        # End Iterate =====================================
+
+    def Take(self):
+        """
+        Name:           Take
+
+        Description:    Removes and returns the records made so far
+
+        Input:          None
+
+        Actions:        Used by the worker processes to send their records back with each result
+        """
+        records = self.records
+        self.records = []
+        return records
+        # End Take ========================================
+
+    def Merge(self, records):
+        """
+        Name:           Merge
+
+        Description:    Adds records made in a worker process
+
+        Input:          List of records from Take
+
+        Actions:        Adds the records in the order the results are received
+        """
+        self.records.extend(records)
+        # End Merge =======================================
+
+    def Summary(self):
+        """
+        Name:           Summary
+
+        Description:    Totals the records by stage and by database
+
+        Input:          None
+
+        Actions:        Stage totals add up every record of the stage
+                        Database totals only add up the outermost stages so nested time is not counted twice,
+                            rows are the most metas rows read by one extract stage
+                        Returns a dictionary that can be written as JSON
+        """
+        stages = {}
+        databases = {}
+        for record in self.records:
+            stage = stages.setdefault(record["stage"], {"calls": 0, "seconds": 0.0, "rows": 0, "peakMiB": None})
+            stage["calls"] += 1
+            stage["seconds"] += record["seconds"]
+            stage["rows"] += record["rows"]
+            if record["peakMiB"] is not None:
+                stage["peakMiB"] = max(stage["peakMiB"] or 0.0, record["peakMiB"])
+            if record["database"] is None:
+                continue
+            database = databases.setdefault(record["database"], {"seconds": 0.0, "rows": 0, "peakMiB": None})
+            if record["depth"] == 0:
+                database["seconds"] += record["seconds"]
+            if record["stage"].startswith("extract"):
+                database["rows"] = max(database["rows"], record["rows"])
+            if record["peakMiB"] is not None:
+                database["peakMiB"] = max(database["peakMiB"] or 0.0, record["peakMiB"])
+        return {"stages": stages, "databases": databases, "records": self.records}
+        # End Summary =====================================
+
+    def Display(self, summary, stream):
+        """
+        Name:           Display
+
+        Description:    Prints the summary as two tables, one by stage and one by database
+
+        Input:          Dictionary from Summary, stream the tables are printed to
+
+        Actions:        Peaks are shown as n/a for stages timed with Iterate
+        """
+        line = "{0:<22} {1:>6} {2:>10} {3:>10} {4:>9}"
+        print(file=stream)
+        print(line.format("stage", "calls", "time (s)", "rows", "peak MiB"), file=stream)
+        for name, stage in summary["stages"].items():
+            peak = "n/a" if stage["peakMiB"] is None else "{0:.1f}".format(stage["peakMiB"])
+            print(line.format(name, stage["calls"], "{0:.4f}".format(stage["seconds"]), stage["rows"], peak),
+                  file=stream)
+        print(file=stream)
+        # Database paths are long, they are printed last so the columns stay lined up
+        line = "{0:>10} {1:>10} {2:>9}  {3}"
+        print(line.format("time (s)", "rows", "peak MiB", "database"), file=stream)
+        for name, database in summary["databases"].items():
+            peak = "n/a" if database["peakMiB"] is None else "{0:.1f}".format(database["peakMiB"])
+            print(line.format("{0:.4f}".format(database["seconds"]), database["rows"], peak, name), file=stream)
+        print(file=stream)
+        # End Display =====================================
+
+
+# Profiler used by every stage, replaced by SetProfiler when --profile is set
+profiler = Profiler(False)
+
+
+def SetProfiler(enabled, memory=False):
+    """
+    Name:           SetProfiler
+
+    Description:    Replaces the module profiler, also the initializer of the worker processes
+
+    Input:          True to record stages, False to turn the profiler off
+                    True to also record peak memory with tracemalloc
+
+    Actions:        Sets the global profiler to a new Profiler
+    """
+    global profiler
+    profiler = Profiler(enabled, memory)
+    # End SetProfiler =====================================
+
+
+class TimeConverter():
+    def __init__(self, style=TIME_UTC):
+        """
+        Name:           TimeConverter
+
+        Description:    Converts seconds since epoch into readable times, remembering each one converted
+
+        Input:          Time style, TIME_UTC, TIME_LOCAL or TIME_ISO
+
+        Actions:        Keeps a memo of every epoch already converted, the same times show up again and again
+                            across computers, users and databases
+                        The memo is cleared once it holds TIME_MEMO_SIZE times so it stays bounded
+        """
+        if style not in TIME_STYLES:
+            raise ValueError("Unknown time style: {0}".format(style))
+        self.style = style
+        self.memo = {}
+        # End __init__ ====================================
+
+    def Format(self, epoch):
+        """
+        Name:           Format
+
+        Description:    Converts one epoch without the memo
+
+        Input:          Seconds since epoch
+
+        Actions:        Formats UTC or local time as 2014-02-24 21:49:54, or UTC as 2014-02-24T21:49:54Z for iso
+        """
+        if self.style == TIME_LOCAL:
+            return time.strftime(TIME_TEXT_FORMAT, time.localtime(epoch))
+        if self.style == TIME_ISO:
+            return time.strftime(TIME_ISO_FORMAT, time.gmtime(epoch))
+        return time.strftime(TIME_TEXT_FORMAT, time.gmtime(epoch))
+        # End Format ======================================
+
+    def Convert(self, epoch):
+        """
+        Name:           Convert
+
+        Description:    Converts one epoch
+
+        Input:          Seconds since epoch
+
+        Actions:        Returns the memoized text, formatting it the first time the epoch is seen
+        """
+        text = self.memo.get(epoch)
+        if text is None:
+            if len(self.memo) >= TIME_MEMO_SIZE:
+                self.memo.clear()
+            text = self.memo[epoch] = self.Format(epoch)
+        return text
+        # End Convert =====================================
+
+    def ConvertMany(self, epochs):
+        """
+        Name:           ConvertMany
+
+        Description:    Converts a whole column of epochs
+
+        Input:          List of seconds since epoch
+
+        Actions:        Formats each distinct epoch not in the memo once, then looks every value up
+                        Returns the list of texts in the same order
+        """
+        memo = self.memo
+        missing = set(epochs).difference(memo)
+        if len(memo) + len(missing) > TIME_MEMO_SIZE:
+            memo.clear()
+            missing = set(epochs)
+        for epoch in missing:
+            memo[epoch] = self.Format(epoch)
+        return [memo[epoch] for epoch in epochs]
+        # End ConvertMany =================================
+
+
+# Converter used for every time shown, replaced by SetTimeStyle from the --time argument
+timeConverter = TimeConverter()
+
+
+def SetTimeStyle(style):
+    """
+    Name:           SetTimeStyle
+
+    Description:    Replaces the module time converter
+
+    Input:          Time style, TIME_UTC, TIME_LOCAL or TIME_ISO
+
+    Actions:        Sets the global timeConverter to a new TimeConverter
+    """
+    global timeConverter
+    timeConverter = TimeConverter(style)
+    # End SetTimeStyle ====================================
+
+
+def InitWorker(profiling, timeStyle, memory=False):
+    """
+    Name:           InitWorker
+
+    Description:    Initializer of the worker processes
+
+    Input:          True if this process profiles, the time style of this process,
+                        True if it also records peak memory
+
+    Actions:        Sets the worker profiler and time converter to match this process,
+                        needed where workers are started fresh instead of forked
+    """
+    SetProfiler(profiling, memory)
+    SetTimeStyle(timeStyle)
+    # End InitWorker ======================================
+
+
+class SyncFile():
+    def __init__(self, database, mode=READ_FULL, cache=None, table=METAS_TABLE, image=None):
+        """
+        Name:           SyncFile
+
+        Description:    Creates objects from passed database
+
+        Input:          Path to the syncFile Database
+                        Read mode, READ_FULL, READ_STREAM or READ_PUSHDOWN
+                        Optional ExtractionCache, an unchanged database is loaded from it without opening SQLite
+                        Table the artifacts are read from, deleted_metas runs the same extractors on deleted rows
+                        Optional in memory image of the database, read with OpenImage instead of the file
+
+        Actions:        Creates the object and checks the database can be read
+                        Uses the sqlite3 library as lite
+                        Artifacts are not extracted here, each one is extracted the first time one of its
+                            variables is used, or all at once with Extract
+                        In stream and pushdown mode the metas rows are never held in memory,
+                            self.metadata is set to None
+                        The extraction cache only holds metas results of files, it is not used for other tables
+                            or images
+
+        """
+        if mode not in READ_MODES:
+            raise ValueError("Unknown read mode: {0}".format(mode))
+        # Sets the self.database to the database path
+        self.database = database
+        self.mode = mode
+        self.table = table
+        self.image = image
+        # Artifacts already extracted and memoized getter results
+        self.extracted = set()
+        self.cache = {}
+
+        # The connection is only open while something is being read from the database
+        self.connection = None
+        self.cursor = None
+        # An image is deserialized once, its connection is kept open for the life of the object
+        self.imageConnection = None
+
+        # Sets the initial database tables to nothing
+        self.tables = []
+
+        if mode != READ_FULL:
+            self.metadata = None
+
+        # Every artifact is set from the cache if the database has not changed since it was stored
+        if table != METAS_TABLE or image is not None:
+            cache = None
+        self.extractionCache = cache
+        if cache is not None:
+            with profiler.Stage("cache", database):
+                if cache.Load(self):
+                    return
+
+        # Checks to see if the passed database can be read. If not, will raise the error and stop creating the object.
+        # Also sets the tables var
+        with profiler.Stage("open", database):
+            opened = self.Open()
+            try:
+                # Runs the objects SQLiteTables function
+                self.SQLiteTables()
+            finally:
+                if opened:
+                    self.Close()
+        # End __init__ ====================================
+
+    def __getattr__(self, name):
+        """
+        Name:           __getattr__
+
+        Description:    Extracts an artifact the first time one of its variables is used
+
+        Input:          Name of the missing variable
+
+        Actions:        Only called when the variable has not been set yet
+                        Loads the metas table for metadata in full mode
+                        Runs Extract for the artifact that sets the variable and returns it
+        """
+        if name == "metadata":
+            with profiler.Stage("sqlite", self.database) as stage:
+                opened = self.Open()
+                try:
+                    # Gets all data from the metas table from the database
+                    self.cursor.execute("SELECT * FROM `{0}`;".format(self.table))
+                    # Fill the metadata var with the contents of the metas table
+                    self.metadata = self.cursor.fetchall()
+                finally:
+                    if opened:
+                        self.Close()
+                stage.rows = len(self.metadata)
+            return self.metadata
+        if name in ARTIFACT_ATTRIBUTES:
+            self.Extract([ARTIFACT_ATTRIBUTES[name]])
+            return self.__dict__[name]
+        raise AttributeError(name)
+        # End __getattr__ =================================
+
+    @classmethod
+    def FromBytes(cls, data, name="<memory>", mode=READ_FULL):
+        """
+        Name:           FromBytes
+
+        Description:    Creates a SyncFile from a database held in memory
+
+        Input:          Bytes, bytearray, memoryview or mmap of a whole SyncData.sqlite3 file
+                        Name the results are reported under, such as the path inside an archive
+                        Read mode, READ_FULL, READ_STREAM or READ_PUSHDOWN
+
+        Actions:        Opens the image with OpenImage the first time the connection is opened and keeps that
+                            connection, no temporary file is written and the same extractors are run
+                        The SyncFile drops its reference to data once SQLite holds its own copy
+                        Only the main file is read, WAL frames are not in the image
+        """
+        return cls(name, mode, image=data)
+        # End FromBytes ===================================
+
+    # Name used by the acquisition pipeline
+    from_bytes = FromBytes
+
+    def Extract(self, artifacts=ARTIFACTS):
+        """
+        Name:           Extract
+
+        Description:    Sets the variables of the passed artifacts that have not been extracted yet
+
+        Input:          Artifacts to extract, defaults to all of them
+
+        Actions:        Runs UserInfo for the user artifact
+                        Reads the metas table once for every other artifact using the read mode
+                            full walks self.metadata, stream reads the needed columns in batches,
+                            pushdown only asks SQLite for the rows of the passed artifacts
+                        Uses ClassifyMetadata so every artifact comes from a single walk over the rows
+                        Closes the connection as soon as the extraction is finished
+                        Stores the artifacts in the extraction cache once every artifact has been extracted
+        """
+        artifacts = set(artifacts) - self.extracted
+        if not artifacts:
+            return
+        opened = self.Open()
+        try:
+            self.ExtractOpen(artifacts)
+        finally:
+            if opened:
+                self.Close()
+        if self.extractionCache is not None and self.extracted.issuperset(ARTIFACTS):
+            self.extractionCache.Store(self)
+        # End Extract =====================================
+
+    def ExtractOpen(self, artifacts):
+        """
+        Name:           ExtractOpen
+
+        Description:    Extract body, run while the connection is open
+
+        Input:          Set of artifacts that have not been extracted yet
+
+        Actions:        Sets the variables of the artifacts using the read mode
+                        When profiling the same single pass is timed as one extract stage, with a classify
+                            record for each handler inside it, so the profiled run does the same work
+        """
+        if ARTIFACT_USER in artifacts:
+            with profiler.Stage("extract:" + ARTIFACT_USER, self.database):
+                # Will initiate the userAccount var
+                self.UserInfo()
+            self.extracted.add(ARTIFACT_USER)
+            artifacts.discard(ARTIFACT_USER)
+        if not artifacts:
+            return
+
+        if not profiler.enabled:
+            self.ClassifyMetadata(self.MetasRows(artifacts), artifacts)
+            return
+        with profiler.Stage("extract", self.database) as stage:
+            rows = self.MetasRows(artifacts)
+            if self.mode != READ_FULL:
+                # Time spent fetching rows from SQLite is also recorded on its own
+                rows = profiler.Iterate("sqlite", rows, self.database)
+            timings = {}
+            self.ClassifyMetadata(rows, artifacts, timings)
+            stage.rows = len(self.metadata) if self.mode == READ_FULL else rows.record["rows"]
+            # The handler times are recorded one level below the extract stage
+            depth = len(profiler.Stack())
+            for handler, (seconds, handled) in timings.items():
+                record = profiler.Record("classify:" + handler, self.database, depth)
+                record.update(seconds=seconds, rows=handled)
+        # End ExtractOpen =================================
+
+    def MetasRows(self, artifacts):
+        """
+        Name:           MetasRows
+
+        Description:    Returns the metas rows the passed artifacts are classified from
+
+        Input:          Artifacts that will be classified
+
+        Actions:        Runs the query of the read mode on the open connection
+                        Returns an iterable of (ctime, non_unique_name, specifics) tuples
+        """
+        if self.mode == READ_STREAM:
+            # Only the columns used by the extractors are read, the rows are dropped once classified
+            self.cursor.execute("SELECT `ctime`, `non_unique_name`, `specifics` FROM `{0}`;".format(self.table))
+            return StreamRows(self.cursor)
+        if self.mode == READ_PUSHDOWN:
+            # SQLite only returns the rows an extractor can use, the classifier still checks each one
+            self.cursor.execute(PushdownQuery(artifacts, self.table))
+            return StreamRows(self.cursor)
+        # Used to set Object variables, every artifact is pulled from a single walk over the metadata
+        return ((row[CTIME_COLUMN], row[NAME_COLUMN], row[SPECIFICS_COLUMN]) for row in self.metadata)
+        # End MetasRows ===================================
+
+    def Open(self):
+        """
+        Name:           Open
+
+        Description:    Opens the connection and cursor if they are not open already
+
+        Input:          None
+
+        Actions:        Uses OpenDatabase so the database is opened read only and immutable
+                        Uses OpenImage instead if the SyncFile was given an image, only the first time,
+                            later calls reuse the connection holding the deserialized copy
+                        Returns True if this call opened the connection, the caller then closes it with Close
+        """
+        if self.connection is not None:
+            return False
+        # Creates a connection to the database
+        if self.image is not None:
+            self.imageConnection = OpenImage(self.image)
+            # SQLite holds its own copy of the image, so the passed one can be freed
+            self.image = None
+        if self.imageConnection is not None:
+            self.connection = self.imageConnection
+        else:
+            self.connection = OpenDatabase(self.database)
+        # Creates a cursor object for the database
+        self.cursor = self.connection.cursor()
+        return True
+        # End Open ========================================
+
+    def Close(self):
+        """
+        Name:           Close
+
+        Description:    Closes the connection so no file descriptor is kept for the database
+
+        Input:          None
+
+        Actions:        Closes the connection if it is open and resets the connection and cursor vars
+                        The connection of an image holds no file descriptor and is kept, so the image is not
+                            deserialized again
+        """
+        if self.connection is not None and self.connection is not self.imageConnection:
+            self.connection.close()
+        self.connection = None
+        self.cursor = None
+        # End Close =======================================
+
+    def Reextract(self, artifacts):
+        """
+        Name:           Reextract
+
+        Description:    Extracts artifacts again even if they were already extracted
+
+        Input:          Artifacts to extract
+
+        Actions:        Forgets the passed artifacts were extracted and runs Extract, used by the per-artifact
+                            extractors so there is one decode path, ClassifyMetadata, for every read mode
+        """
+        self.extracted.difference_update(artifacts)
+        self.Extract(artifacts)
+        # End Reextract ===================================
+
+    def ClassifyMetadata(self, rows, artifacts=ARTIFACTS, timings=None):
+        """
+        Name:           ClassifyMetadata
+
+        Description:    Sets the artifact variables from a single walk over the metas rows
+
+        Input:          Iterable of (ctime, non_unique_name, specifics) tuples
+                        Artifacts to set, defaults to all of them
+                        Dictionary the [seconds, rows handled] of each handler are added to when profiling,
+                            None otherwise. The name conversion is timed as name and SpecificsType as records
+
+        Actions:        Resets the variables of the passed artifacts to their empty value
+                        Clears the memoized getter results
+                        Converts the name of each row to a string only once
+                        Profile values, computers, recovery emails and extensions are decoded from the specifics
+                            with SpecificsValue, the name is only used when the specifics do not decode
+                        Uses the name prefix as a key into a dispatch table and SpecificsType on the specifics
+                            so each row is only handed to the extractor that wants it
+                        Picks the plain loop, or the loop timing the handlers when timings is passed, once per
+                            call so a normal run pays nothing per row for profiling
+                        The per-artifact extractors Encrypted, AttachedComputers, RecoveryEmail, FirstName,
+                            LastName, DateOfBirth, RecoveryPhoneNumber, Extensions, HTTPSites and HTTPSSites
+                            run it for their own artifact, so there is one decode path
+        """
+        wantEncrypted = ARTIFACT_ENCRYPTED in artifacts
+        wantProfile = ARTIFACT_PROFILE in artifacts
+        wantSites = ARTIFACT_SITES in artifacts
+        wantRecords = set(artifacts) & set([RECORD_COMPUTER, RECORD_RECOVERY_EMAIL, RECORD_EXTENSION])
+
+        encrypted = False
+        if wantProfile:
+            self.firstName = False
+            self.lastName = False
+            self.DOB = False
+            self.recoveryPhone = False
+        # Values of each record type, filled by ClassifyRecord
+        records = {RECORD_COMPUTER: [], RECORD_RECOVERY_EMAIL: [], RECORD_EXTENSION: []}
+        http = []
+        https = []
+
+        # Characters 15 to 23 of the name identify the profile values, the handler checks the full key
+        nameHandlers = {
+            "FirstNam": self.ClassifyFirstName,
+            "LastName": self.ClassifyLastName,
+            "BirthDay": self.ClassifyBirthDay,
+            "BirthYea": self.ClassifyBirthYear,
+            "Recovery": self.ClassifyRecoveryPhone,
+        }
+
+        if timings is None:
+            # The loop of a normal run, nothing is checked for profiling on each row
+            for ctime, name, specifics in rows:
+                nameText = str(name)
+                # The note about the database being encrypted is reported when the results are displayed
+                if wantEncrypted and not encrypted and nameText == "encrypted":
+                    encrypted = True
+                if wantProfile:
+                    handler = nameHandlers.get(nameText[15:23])
+                    if handler:
+                        handler(nameText, name, specifics)
+                # Program was hanging on None values
+                if wantSites and name is not None:
+                    scheme = str(name[:8]).lower()
+                    if scheme[:7] == "http://":
+                        http.append(name)
+                    elif scheme == "https://":
+                        https.append(name)
+                if wantRecords:
+                    recordType = SpecificsType(specifics)
+                    if recordType in wantRecords:
+                        self.ClassifyRecord(records, recordType, ctime, name, nameText, specifics)
+        else:
+            # The same loop with the handlers timed on one row in PROFILE_SAMPLE, so the profiled run stays close
+            #   to the normal one
+            clock = time.perf_counter
+            seconds = dict((handler, 0.0) for handler in
+                           ["name"] + [artifact for artifact in ARTIFACTS if artifact in artifacts] + ["records"])
+            sampled = 0
+            total = 0
+            profileRows = 0
+            countdown = 1
+            for ctime, name, specifics in rows:
+                total += 1
+                countdown -= 1
+                timed = countdown == 0
+                if timed:
+                    countdown = PROFILE_SAMPLE
+                    sampled += 1
+                    start = clock()
+                nameText = str(name)
+                if timed:
+                    start = Lap(seconds, "name", start, clock)
+                if wantEncrypted and not encrypted and nameText == "encrypted":
+                    encrypted = True
+                if timed:
+                    start = Lap(seconds, ARTIFACT_ENCRYPTED, start, clock)
+
+                if wantProfile:
+                    handler = nameHandlers.get(nameText[15:23])
+                    if handler:
+                        handler(nameText, name, specifics)
+                        profileRows += 1
+                    if timed:
+                        start = Lap(seconds, ARTIFACT_PROFILE, start, clock)
+
+                if wantSites and name is not None:
+                    scheme = str(name[:8]).lower()
+                    if scheme[:7] == "http://":
+                        http.append(name)
+                    elif scheme == "https://":
+                        https.append(name)
+                    if timed:
+                        start = Lap(seconds, ARTIFACT_SITES, start, clock)
+
+                if not wantRecords:
+                    continue
+                recordType = SpecificsType(specifics)
+                if timed:
+                    start = Lap(seconds, "records", start, clock)
+                if recordType not in wantRecords:
+                    continue
+                self.ClassifyRecord(records, recordType, ctime, name, nameText, specifics)
+                if timed:
+                    Lap(seconds, recordType, start, clock)
+
+            # The sampled times are scaled up to every row, the rows handled are counted exactly
+            scale = float(total) / sampled if sampled else 0.0
+            handled = {
+                "name": total,
+                "records": total if wantRecords else 0,
+                ARTIFACT_ENCRYPTED: int(encrypted),
+                ARTIFACT_PROFILE: profileRows,
+                ARTIFACT_SITES: len(http) + len(https),
+                RECORD_COMPUTER: len(records[RECORD_COMPUTER]),
+                RECORD_RECOVERY_EMAIL: len(records[RECORD_RECOVERY_EMAIL]),
+                RECORD_EXTENSION: len(records[RECORD_EXTENSION]),
+            }
+            for handler, value in seconds.items():
+                if handler == "records" and not wantRecords:
+                    continue
+                timing = timings.setdefault(handler, [0.0, 0])
+                timing[0] += value * scale
+                timing[1] += handled.get(handler, 0)
+
+        # Empty artifact lists are stored as False to match the individual extractors
+        if wantEncrypted:
+            self.encrypted = encrypted
+        if RECORD_COMPUTER in wantRecords:
+            self.computerNames = records[RECORD_COMPUTER]
+        if RECORD_RECOVERY_EMAIL in wantRecords:
+            self.recoveryEmail = records[RECORD_RECOVERY_EMAIL] or False
+        if RECORD_EXTENSION in wantRecords:
+            self.extension = records[RECORD_EXTENSION] or False
+        if wantSites:
+            self.http = http or False
+            self.https = https or False
+        self.extracted.update(set(artifacts) - set([ARTIFACT_USER]))
+        self.cache.clear()
+        # End ClassifyMetadata ============================
+
+    def ClassifyRecord(self, records, recordType, ctime, name, nameText, specifics):
+        """
+        Name:           ClassifyRecord
+
+        Description:    ClassifyMetadata handler for a row SpecificsType matched to a wanted record type
+
+        Input:          Dictionary of the values of each record type, the record type, the row ctime,
+                            the raw row name, the row name as a string and the row specifics
+
+        Actions:        Adds the computer name and raw ctime, the recovery email or the extension name
+                            decoded with RecordValue to the list of the record type
+        """
+        if recordType == RECORD_COMPUTER:
+            # The raw ctime integer is kept, milliseconds since epoch, it is only converted when shown
+            records[recordType].append([RecordValue(specifics, name), ctime])
+        elif recordType == RECORD_RECOVERY_EMAIL:
+            # The autofill value is used, the end of the name if the specifics do not decode
+            records[recordType].append(RecordValue(specifics, nameText[36:]))
+        elif recordType == RECORD_EXTENSION:
+            records[recordType].append(RecordValue(specifics, nameText))
+        # End ClassifyRecord ==============================
+
+    def ClassifyFirstName(self, nameText, name, specifics):
+        """
+        Name:           ClassifyFirstName
+
+        Description:    ClassifyMetadata handler for a possible FirstName row
+
+        Input:          The row name as a string, the raw row name and the row specifics
+
+        Actions:        Sets the firstName variable if the full key matches
+        """
+        if nameText[15:24] == "FirstName":
+            self.firstName = ProfileValue(specifics, name, 25)
+        # End ClassifyFirstName ===========================
+
+    def ClassifyLastName(self, nameText, name, specifics):
+        """
+        Name:           ClassifyLastName
+
+        Description:    ClassifyMetadata handler for a LastName row
+
+        Input:          The row name as a string, the raw row name and the row specifics
+
+        Actions:        Sets the lastName variable
+        """
+        self.lastName = ProfileValue(specifics, name, 24)
+        # End ClassifyLastName ============================
+
+    def ClassifyBirthDay(self, nameText, name, specifics):
+        """
+        Name:           ClassifyBirthDay
+
+        Description:    ClassifyMetadata handler for a BirthDay row
+
+        Input:          The row name as a string, the raw row name and the row specifics
+
+        Actions:        Adds the zero padded day to the beginning of the DOB value
+                        Uses dashes as the placeholder if the DOB has not been set yet
+        """
+        date = ProfileValue(specifics, name, 24)
+        if len(date) == 1:
+            date = "0" + date
+        self.DOB = date + (self.DOB or "------")[2:]
+        # End ClassifyBirthDay ============================
+
+    def ClassifyBirthYear(self, nameText, name, specifics):
+        """
+        Name:           ClassifyBirthYear
+
+        Description:    ClassifyMetadata handler for a BirthYear row
+
+        Input:          The row name as a string, the raw row name and the row specifics
+
+        Actions:        Preserves the set day value and adds the year to the end of the DOB value
+                        Uses dashes as the placeholder if the DOB has not been set yet
+        """
+        self.DOB = (self.DOB or "------")[:2] + ProfileValue(specifics, name, 25)
+        # End ClassifyBirthYear ===========================
+
+    def ClassifyRecoveryPhone(self, nameText, name, specifics):
+        """
+        Name:           ClassifyRecoveryPhone
+
+        Description:    ClassifyMetadata handler for a possible RecoveryPhone row
+
+        Input:          The row name as a string, the raw row name and the row specifics
+
+        Actions:        Sets the recoveryPhone variable if the full key matches
+        """
+        if nameText[15:28] == "RecoveryPhone":
+            self.recoveryPhone = ProfileValue(specifics, name, 35)
+        # End ClassifyRecoveryPhone =======================
+
+    def SQLiteTables(self):
+        """
+        Name:           SQLiteTables
+
+        Description:    Sets a list of the tables in the SQLite database
+
+        Input:          None
+
+        Actions:        Uses the sqlite_master tables to pull all tables names
+                        Opens the connection for the query if it is not open, in any read mode
+
+        Note:           should always be 5 tables
+                            deleted_metas, metas, models, share_info, share_version
+        """
+        opened = self.Open()
         try:
             self.cursor.execute("SELECT name FROM sqlite_master WHERE type='table';")
-        # Will error out if database is locked due to database being open (Chrome open)
-        except lite.OperationalError as err:
-            raise err
-        # Sets the tables to all the records in the cursor
-        self.tables = self.cursor.fetchall()
+            # Sets the tables to all the records in the cursor
+            self.tables = self.cursor.fetchall()
+        finally:
+            if opened:
+                self.Close()
         # Removes the tuple and returns just the names in the list
         self.tables = [i[0] for i in self.tables]
         # End SQLiteTables ================================
 
-    def UserInfo(self):
+    def UserInfo(self):
+        """
+        Name:           UserInfo
+
+        Description:    Pulls the name and create time from the share_info table
+
+        Input:          None
+
+        Actions:        Pulls the name and db_create_time from the share_info table sets the out put to self.userAccount
+                        Opens the connection for the query if it is not open, in any read mode
+        """
+        self.userAccount = []
+        opened = self.Open()
+        try:
+            self.cursor.execute("SELECT `name`, `db_create_time` FROM `share_info`;")
+            # Returns a tuple of email account and creation time in epoch
+            self.userAccount = self.cursor.fetchall()
+        finally:
+            if opened:
+                self.Close()
+        self.extracted.add(ARTIFACT_USER)
+        self.cache.pop("GetUserInfo", None)
+        # End UserInfo ====================================
+
+    def ConvertTime(self, timeInEpoch):
+        """
+        Name:           ConvertTime
+
+        Description:    Converts seconds since epoch into readable format (2014-02-24 21:49:54)
+
+        Input:          Epoch Time in seconds
+
+        Actions:        Uses the module timeConverter so the time style and memo are shared
+        """
+        return timeConverter.Convert(timeInEpoch)
+        # End ConvertTime =================================
+
+    def AttachedComputers(self):
+        """
+        Name:           AttachedComputers
+
+        Description:    Sets the computer names that the users has logged into
+
+        Input:          None
+
+        Actions:        Runs ClassifyMetadata for the computers with Reextract, in the read mode of the SyncFile
+        """
+        self.Reextract([RECORD_COMPUTER])
+        # End AttachedComputers ===========================
+
+    def GetUserInfo(self):
+        """
+        Name:           GetUserInfo
+
+        Description:    Returns list of list, each mini list has user email and when Chrome was first signed in
+
+        Input:          None
+
+        Actions:        Needs UserInfo function to be run prior to get userAccount initialized
+                        converts time stored in userAccount's list of tuples into human readable
+                        Converts the whole time column at once with timeConverter.ConvertMany
+                        returns the new list, memoized until the next extraction
+        """
+        if "GetUserInfo" in self.cache:
+            return self.cache["GetUserInfo"]
+        times = timeConverter.ConvertMany([user[1] for user in self.userAccount])
+        users = [[user[0], timeAdded] for user, timeAdded in zip(self.userAccount, times)]
+        self.cache["GetUserInfo"] = users
+        return users
+        # End GetUserInfo =================================
+
+    def GetAttachedComputers(self):
+        """
+        Name:           GetAttachedComputers
+
+        Description:    Returns list of lists, each mini list has computer string name and date account was added
+
+        Input:          None
+
+        Actions:        Needs AttachedComputers function to be run prior to get computerNames initialized
+                        converts time stored in computerNames's list of tuples into human readable
+                        Converts the whole time column at once with timeConverter.ConvertMany,
+                            the milliseconds stored by sync are divided by 1000 here
+                        returns the new list, memoized until the next extraction
+        """
+        if "GetAttachedComputers" in self.cache:
+            return self.cache["GetAttachedComputers"]
+        times = timeConverter.ConvertMany([computer[1] / 1000 for computer in self.computerNames])
+        computerInfo = [[computer[0], timeAdded] for computer, timeAdded in zip(self.computerNames, times)]
+        self.cache["GetAttachedComputers"] = computerInfo
+        return computerInfo
+        # End GetAttachedComputers ========================
+
+    def GetUserEpochs(self):
+        """
+        Name:           GetUserEpochs
+
+        Description:    Returns list of lists, each mini list has user email and the raw sign in time
+
+        Input:          None
+
+        Actions:        Returns the seconds since epoch unconverted, used by the machine readable outputs
+        """
+        return [[user[0], user[1]] for user in self.userAccount]
+        # End GetUserEpochs ===============================
+
+    def GetComputerEpochs(self):
+        """
+        Name:           GetComputerEpochs
+
+        Description:    Returns list of lists, each mini list has computer name and the raw time added
+
+        Input:          None
+
+        Actions:        Returns the ctime integer unconverted, milliseconds since epoch, used by the machine
+                            readable outputs
+        """
+        return [[computer[0], computer[1]] for computer in self.computerNames]
+        # End GetComputerEpochs ===========================
+
+    def RecoveryEmail(self):
+        """
+        Name:           RecoveryEmail
+
+        Description:    Sets the recoveryEmail variable
+
+        Input:          None
+
+        Actions:        Runs ClassifyMetadata for the recovery emails with Reextract, in the read mode of the SyncFile
+        """
+        self.Reextract([RECORD_RECOVERY_EMAIL])
+        # End RecoveryEmail ===============================
+
+    def GetRecoveryEmail(self):
+        """
+        Name:           GetRecoveryEmail
+
+        Description:    Returns the recoveryEmail var
+
+        Input:          None
+
+        Actions:        Returns the recoveryEmail var
+        """
+        return self.recoveryEmail
+        # End GetRecoveryEmail ============================
+
+    def FirstName(self):
+        """
+        Name:           FirstName
+
+        Description:    Sets the firstName variable
+
+        Input:          None
+
+        Actions:        Runs ClassifyMetadata for the profile values with Reextract, in the read mode of the SyncFile,
+                            which also sets lastName, DOB and recoveryPhone
+        """
+        self.Reextract([ARTIFACT_PROFILE])
+        # End FirstName ===================================
+
+    def GetFirstName(self):
+        """
+        Name:           GetFirstName
+
+        Description:    Returns the firstName Var
+
+        Input:          None
+
+        Actions:        Returns the firstName var
+        """
+        return self.firstName
+        # End GetFirstName ================================
+
+    def LastName(self):
+        """
+        Name:           LastName
+
+        Description:    Sets the lastName variable
+
+        Input:          None
+
+        Actions:        Runs ClassifyMetadata for the profile values with Reextract, in the read mode of the SyncFile,
+                            which also sets firstName, DOB and recoveryPhone
+        """
+        self.Reextract([ARTIFACT_PROFILE])
+        # End LastName ====================================
+
+    def GetLastName(self):
+        """
+        Name:           GetLastName
+
+        Description:    Returns the lastName var
+
+        Input:          None
+
+        Actions:        Returns the lastName var
+        """
+        return self.lastName
+        # End GetLastName =================================
+
+    def GetFullName(self):
+        """
+        Name:           GetFullName
+
+        Description:    Concatenates the first and last name
+
+        Input:          None
+
+        Actions:        Checks if both the first and last name have content
+                            Concatenates the first and last name, adding a space in-between
+                        Returns the full name or false
+        """
+        if self.firstName and self.lastName:
+            return str(self.firstName + " " + self.lastName)
+        else:
+            # If the first or last name do not exits a full name can not be found and return False
+            return False
+        # End GetFullName =================================
+
+    def DateOfBirth(self):
+        """
+        Name:           DateOfBirth
+
+        Description:    Sets the Date of Birth variable if data is found else sets it to False
+
+        Input:          None
+
+        Actions:        Runs ClassifyMetadata for the profile values with Reextract, in the read mode of the SyncFile,
+                            which also sets firstName, lastName and recoveryPhone
+        """
+        self.Reextract([ARTIFACT_PROFILE])
+        # End DateOfBirth =================================
+
+    def GetFullInfo(self):
+        """
+        Name:           GetFullInfo
+
+        Description:    Returns the full name and the DOB. Returns False if either of the values do not exist
+
+        Input:          None
+
+        Actions:        Returns the full name and the DOB in a list.
+                        Returns False if either of the values are set to False
+        """
+        # Returns a list inside a list for printing unification, memoized until the next extraction
+        if "GetFullInfo" not in self.cache:
+            fullName = self.GetFullName()
+            if fullName and self.DOB:
+                self.cache["GetFullInfo"] = [[fullName, self.DOB]]
+            else:
+                self.cache["GetFullInfo"] = False
+        return self.cache["GetFullInfo"]
+        # End GetFullInfo =================================
+
+    def RecoveryPhoneNumber(self):
+        """
+        Name:           RecoveryPhoneNumber
+
+        Description:    Sets recoveryPhone var
+
+        Input:          None
+
+        Actions:        Runs ClassifyMetadata for the profile values with Reextract, in the read mode of the SyncFile,
+                            which also sets firstName, lastName and DOB
+        """
+        self.Reextract([ARTIFACT_PROFILE])
+        # End RecoveryPhoneNumber =========================
+
+    def GetRecoveryPhone(self):
+        """
+        Name:           GetRecoveryPhone
+
+        Description:    Returns recoveryPhone Var
+
+        Input:          None
+
+        Actions:        Returns recoveryPhone Var
+        """
+        return self.recoveryPhone
+        # End GetRecoveryPhone
+
+    def Extensions(self):
+        """
+        Name:           Extensions
+
+        Description:    Returns a list of all extensions found in the metas table
+
+        Input:          None
+
+        Actions:        Runs ClassifyMetadata for the extensions with Reextract, in the read mode of the SyncFile
+        """
+        self.Reextract([RECORD_EXTENSION])
+        # End Extensions ==================================
+
+    def GetExtensions(self):
+        """
+        Name:           GetExtensions
+
+        Description:    Returns extension var
+
+        Input:          None
+
+        Actions:        Returns extension var
+        """
+        return self.extension
+        # End GetExtensions ===============================
+
+    def Encrypted(self):
+        """
+        Name:           Encrypted
+
+        Description:    Checks to see if records are encrypted
+
+        Input:          None
+
+        Actions:        Runs ClassifyMetadata for the encrypted note with Reextract, in the read mode of the SyncFile
+                        Reports that the database is encrypted
+        """
+        self.Reextract([ARTIFACT_ENCRYPTED])
+        if self.encrypted:
+            # Report using level 1 due to some information being able to be found, just not all
+            Report(str("NOTE: The database located at: {0} is encrypted\n".format(self.database)), 1)
+        # End Encrypted ===================================
+
+    def HTTPSites(self):
+        """
+        Name:           HTTPSites
+
+        Description:    Finds all HTTP sites and adds them to a list
+
+        Input:          None
+
+        Actions:        Runs ClassifyMetadata for the sites with Reextract, in the read mode of the SyncFile,
+                            which also sets the https sites
+        """
+        self.Reextract([ARTIFACT_SITES])
+        # End HTTPSites ===================================
+
+    def HTTPSSites(self):
+        """
+        Name:           HTTPSSites
+
+        Description:    Finds all HTTPS sites and adds them to a list
+
+        Input:          None
+
+        Actions:        Runs ClassifyMetadata for the sites with Reextract, in the read mode of the SyncFile,
+                            which also sets the http sites
+        """
+        self.Reextract([ARTIFACT_SITES])
+        # End HTTPSSites ==================================
+
+    def GetAllSites(self):
+        """
+        Name:           GetAllSites
+
+        Description:    Returns all http and https sites in one list
+
+        Input:          None
+
+        Actions:        Checks to see if both http and https have data
+                        Returns the new list, memoized until the next extraction
+                        If only one list has data return that one
+                        Return False if both lists are False
+        """
+        if "GetAllSites" in self.cache:
+            return self.cache["GetAllSites"]
+        if self.http and self.https:
+            sites = self.http + self.https
+        elif not self.https and not self.http:
+            sites = False
+        elif self.http:
+            sites = self.http
+        else:
+            sites = self.https
+        self.cache["GetAllSites"] = sites
+        return sites
+        # End GetAllSites =================================
+
+    def GetArtifacts(self, artifacts=ARTIFACTS):
+        """
+        Name:           GetArtifacts
+
+        Description:    Returns every artifact of the database in one dictionary
+
+        Input:          Artifacts to return, defaults to all of them
+
+        Actions:        Extracts the passed artifacts not extracted yet in a single pass, the others are never read
+                        Calls each getter and stores the result under the artifact name,
+                            keys of artifacts that were not asked for are left out
+                        Used to compare the results of different read modes
+        """
+        self.Extract(artifacts)
+        found = {}
+        if ARTIFACT_ENCRYPTED in artifacts:
+            found["encrypted"] = self.encrypted
+        if ARTIFACT_USER in artifacts:
+            found["userInfo"] = self.GetUserInfo()
+            found["userEpochs"] = self.GetUserEpochs()
+        if ARTIFACT_PROFILE in artifacts:
+            found["fullInfo"] = self.GetFullInfo()
+            found["recoveryPhone"] = self.GetRecoveryPhone()
+        if RECORD_COMPUTER in artifacts:
+            found["computers"] = self.GetAttachedComputers()
+            found["computerEpochs"] = self.GetComputerEpochs()
+        if RECORD_RECOVERY_EMAIL in artifacts:
+            found["recoveryEmail"] = self.GetRecoveryEmail()
+        if RECORD_EXTENSION in artifacts:
+            found["extensions"] = self.GetExtensions()
+        if ARTIFACT_SITES in artifacts:
+            found["sites"] = self.GetAllSites()
+        return found
+        # End GetArtifacts ================================
+
+class ExtractionCache():
+    def __init__(self, path, maxBytes=CACHE_SIZE * 1048576, useHash=False):
+        """
+        Name:           ExtractionCache
+
+        Description:    On disk cache of the artifacts extracted from each database
+
+        Input:          Path to the cache, a SQLite database created if it does not exist
+                        Size limit of the stored artifacts in bytes
+                        Also match entries on a SHA-256 of the database contents if True
+
+        Actions:        Entries are keyed on the database path, size, modification time and CACHE_VERSION
+                        and on the hash if set
+                        The connection is opened on first use so the object can be sent to worker processes
+        """
+        self.path = path
+        self.maxBytes = maxBytes
+        self.useHash = useHash
+        self.connection = None
+        # End __init__ ====================================
+
+    def __getstate__(self):
+        """
+        Name:           __getstate__
+
+        Description:    Returns what is pickled when the cache is sent to a worker process
+
+        Input:          None
+
+        Actions:        Returns only the settings, each worker opens its own connection
+        """
+        return (self.path, self.maxBytes, self.useHash)
+        # End __getstate__ ================================
+
+    def __setstate__(self, state):
+        """
+        Name:           __setstate__
+
+        Description:    Rebuilds the cache in a worker process
+
+        Input:          Settings tuple from __getstate__
+
+        Actions:        Runs __init__ with the settings, the connection is opened on first use
+        """
+        self.__init__(*state)
+        # End __setstate__ ================================
+
+    def Connection(self):
+        """
+        Name:           Connection
+
+        Description:    Returns the connection to the cache, opening it if needed
+
+        Input:          None
+
+        Actions:        Uses the WAL journal so several worker processes can read and write the cache
+                        Creates the entries table, recreating a table written before entries had a version
+                        Deletes the entries stored by another CACHE_VERSION
+        """
+        if self.connection is None:
+            # The pipeline opens the cache in its extraction thread and closes it from the main thread
+            self.connection = lite.connect(self.path, timeout=60, check_same_thread=False)
+            self.connection.execute("PRAGMA journal_mode = WAL;")
+            with self.connection:
+                columns = [column[1] for column in self.connection.execute("PRAGMA table_info(`entries`);")]
+                if columns and "version" not in columns:
+                    # Entries from before the version column cannot be trusted by any parser version
+                    self.connection.execute("DROP TABLE `entries`;")
+                self.connection.execute("CREATE TABLE IF NOT EXISTS `entries` (path TEXT PRIMARY KEY, size INTEGER, "
+                                        "mtime INTEGER, version INTEGER, digest TEXT, artifacts TEXT, "
+                                        "bytes INTEGER, used REAL);")
+                self.connection.execute("DELETE FROM `entries` WHERE version != ?;", (CACHE_VERSION,))
+        return self.connection
+        # End Connection ==================================
+
+    def FileKey(self, database):
+        """
+        Name:           FileKey
+
+        Description:    Returns the identity of a database file
+
+        Input:          Path to the database
+
+        Actions:        Returns the absolute path, size and modification time in nanoseconds
+        """
+        info = os.stat(database)
+        return os.path.abspath(database), info.st_size, info.st_mtime_ns
+        # End FileKey =====================================
+
+    def Digest(self, database):
+        """
+        Name:           Digest
+
+        Description:    Returns the SHA-256 of a database, or None if hashing is off
+
+        Input:          Path to the database
+
+        Actions:        Reads the file a chunk at a time so memory stays the same for any file size
+        """
+        if not self.useHash:
+            return None
+        digest = hashlib.sha256()
+        with open(database, "rb") as f:
+            for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b""):
+                digest.update(chunk)
+        return digest.hexdigest()
+        # End Digest ======================================
+
+    def Load(self, syncFile):
+        """
+        Name:           Load
+
+        Description:    Sets every artifact of a SyncFile from the cache if the database and parser have not changed
+
+        Input:          SyncFile object
+
+        Actions:        Remembers the file key on the SyncFile so Store uses the identity from before it was read
+                        Remembers the digest when a stale entry is hashed so Store does not hash the file again
+                        Sets the tables and every ARTIFACT_ATTRIBUTES variable and marks every artifact extracted
+                        Updates the last used time of the entry
+                        Returns True on a hit, False otherwise
+        """
+        path, size, mtime = syncFile.cacheKey = self.FileKey(syncFile.database)
+        connection = self.Connection()
+        row = connection.execute("SELECT `digest`, `artifacts` FROM `entries` WHERE path = ? AND size = ? "
+                                 "AND mtime = ? AND version = ?;", (path, size, mtime, CACHE_VERSION)).fetchone()
+        if row is None:
+            return False
+        digest, artifacts = row
+        if self.useHash:
+            syncFile.cacheDigest = self.Digest(syncFile.database)
+            if digest != syncFile.cacheDigest:
+                return False
+        values = json.loads(artifacts)
+        syncFile.tables = values.pop("tables")
+        for name, value in values.items():
+            setattr(syncFile, name, value)
+        syncFile.extracted.update(ARTIFACTS)
+        with connection:
+            connection.execute("UPDATE `entries` SET used = ? WHERE path = ?;", (time.time(), path))
+        return True
+        # End Load ========================================
+
+    def Store(self, syncFile):
+        """
+        Name:           Store
+
+        Description:    Stores every artifact of a SyncFile
+
+        Input:          SyncFile object with every artifact extracted
+
+        Actions:        Stores the tables and every ARTIFACT_ATTRIBUTES variable as JSON under CACHE_VERSION
+                            with the digest Load computed, or a new one if Load did not hash the file
+                        Replaces the entry stored for the same path
+        """
+        path, size, mtime = getattr(syncFile, "cacheKey", None) or self.FileKey(syncFile.database)
+        values = dict((name, getattr(syncFile, name)) for name in ARTIFACT_ATTRIBUTES)
+        values["tables"] = syncFile.tables
+        artifacts = json.dumps(values)
+        # Reuses the digest Load computed for a stale entry
+        if hasattr(syncFile, "cacheDigest"):
+            digest = syncFile.cacheDigest
+        else:
+            digest = self.Digest(syncFile.database)
+        with self.Connection() as connection:
+            connection.execute("INSERT OR REPLACE INTO `entries` VALUES (?, ?, ?, ?, ?, ?, ?, ?);",
+                               (path, size, mtime, CACHE_VERSION, digest, artifacts,
+                                len(artifacts), time.time()))
+        # End Store =======================================
+
+    def Evict(self):
+        """
+        Name:           Evict
+
+        Description:    Removes the least recently used entries until the cache is under its size limit
+
+        Input:          None
+
+        Actions:        Walks the entries from the most recently used and deletes every one past the limit
+        """
+        connection = self.Connection()
+        total = 0
+        evict = []
+        for path, size in connection.execute("SELECT `path`, `bytes` FROM `entries` ORDER BY `used` DESC;"):
+            total += size
+            if total > self.maxBytes:
+                evict.append((path,))
+        if evict:
+            with connection:
+                connection.executemany("DELETE FROM `entries` WHERE path = ?;", evict)
+        return len(evict)
+        # End Evict =======================================
+
+    def Close(self):
+        """
+        Name:           Close
+
+        Description:    Evicts entries over the size limit and closes the connection
+
+        Input:          None
+
+        Actions:        Runs Evict, which opens the connection if this process never used it, and closes it
+        """
+        self.Evict()
+        self.connection.close()
+        self.connection = None
+        # End Close =======================================
+
+
+class SyncResult():
+    def __init__(self, database, artifacts=None, error=False, recovered=None):
+        """
+        Name:           SyncResult
+
+        Description:    Compact, picklable record of everything extracted from one database
+
+        Input:          Path to the syncFile Database
+                        Dictionary from SyncFile.GetArtifacts, or None if the database could not be parsed
+                        Error message if the database could not be parsed
+                        Dictionary from RecoverDatabase, or None if recovery was not asked for
+
+        Actions:        Stores the getter results so the record can be sent back from a worker process
+                            and displayed the same way as a SyncFile
+        """
+        self.database = database
+        self.error = error
+        self.artifacts = artifacts or {}
+        self.encrypted = self.artifacts.get("encrypted", False)
+        self.recovered = recovered
+        # Profiler records of a worker process, sent back with the result
+        self.profile = []
+        # End __init__ ====================================
+
+    def GetUserInfo(self):
+        """
+        Name:           GetUserInfo
+
+        Description:    Returns the stored user email and time added list
+
+        Input:          None
+
+        Actions:        Returns the value SyncFile.GetUserInfo gave, [] if the database could not be parsed
+        """
+        return self.artifacts.get("userInfo", [])
+        # End GetUserInfo =================================
+
+    def GetFullInfo(self):
+        """
+        Name:           GetFullInfo
+
+        Description:    Returns the stored full name and DOB list
+
+        Input:          None
+
+        Actions:        Returns the value SyncFile.GetFullInfo gave, False if the database could not be parsed
+        """
+        return self.artifacts.get("fullInfo", False)
+        # End GetFullInfo =================================
+
+    def GetAttachedComputers(self):
+        """
+        Name:           GetAttachedComputers
+
+        Description:    Returns the stored computer name and time added list
+
+        Input:          None
+
+        Actions:        Returns the value SyncFile.GetAttachedComputers gave, [] if the database could not be parsed
+        """
+        return self.artifacts.get("computers", [])
+        # End GetAttachedComputers ========================
+
+    def GetUserEpochs(self):
+        """
+        Name:           GetUserEpochs
+
+        Description:    Returns the stored user email and raw sign in time list
+
+        Input:          None
+
+        Actions:        Returns the value SyncFile.GetUserEpochs gave, [] if the database could not be parsed
+        """
+        return self.artifacts.get("userEpochs", [])
+        # End GetUserEpochs ===============================
+
+    def GetComputerEpochs(self):
+        """
+        Name:           GetComputerEpochs
+
+        Description:    Returns the stored computer name and raw time added list
+
+        Input:          None
+
+        Actions:        Returns the value SyncFile.GetComputerEpochs gave, [] if the database could not be parsed
+        """
+        return self.artifacts.get("computerEpochs", [])
+        # End GetComputerEpochs ===========================
+
+    def GetRecoveryEmail(self):
+        """
+        Name:           GetRecoveryEmail
+
+        Description:    Returns the stored recovery email list
+
+        Input:          None
+
+        Actions:        Returns the value SyncFile.GetRecoveryEmail gave, False if the database could not be parsed
+        """
+        return self.artifacts.get("recoveryEmail", False)
+        # End GetRecoveryEmail ============================
+
+    def GetRecoveryPhone(self):
+        """
+        Name:           GetRecoveryPhone
+
+        Description:    Returns the stored recovery phone number
+
+        Input:          None
+
+        Actions:        Returns the value SyncFile.GetRecoveryPhone gave, False if the database could not be parsed
+        """
+        return self.artifacts.get("recoveryPhone", False)
+        # End GetRecoveryPhone ============================
+
+    def GetExtensions(self):
+        """
+        Name:           GetExtensions
+
+        Description:    Returns the stored extension list
+
+        Input:          None
+
+        Actions:        Returns the value SyncFile.GetExtensions gave, False if the database could not be parsed
+        """
+        return self.artifacts.get("extensions", False)
+        # End GetExtensions ===============================
+
+    def GetAllSites(self):
+        """
+        Name:           GetAllSites
+
+        Description:    Returns the stored list of all http and https sites
+
+        Input:          None
+
+        Actions:        Returns the value SyncFile.GetAllSites gave, False if the database could not be parsed
+        """
+        return self.artifacts.get("sites", False)
+        # End GetAllSites =================================
+
+    def GetArtifacts(self):
+        """
+        Name:           GetArtifacts
+
+        Description:    Returns the stored dictionary of every artifact
+
+        Input:          None
+
+        Actions:        Returns the dictionary SyncFile.GetArtifacts gave
+        """
+        return self.artifacts
+        # End GetArtifacts ================================
+
+
+def RecoveryError(recovered, source, err):
+    """
+    Name:           RecoveryError
+
+    Description:    Records why one source of recovered artifacts could not be read
+
+    Input:          Recovered dictionary of a database, source name such as wal, the exception
+
+    Actions:        Stores the error under recovered["errors"][source], the artifacts already found are kept
+                        and HandleResult reports the error as a warning
+    """
+    recovered.setdefault("errors", {})[source] = "{0}: {1}".format(type(err).__name__, err)
+    # End RecoveryError ===================================
+
+
+def RecoverDatabase(database, mode=READ_STREAM, artifacts=ARTIFACTS):
+    """
+    Name:           RecoverDatabase
+
+    Description:    Recovers the artifacts sync has deleted from one database
+
+    Input:          Path to the syncFile Database
+                    Read mode used for the deleted_metas table
+                    Artifacts to recover
+
+    Actions:        Runs the extractors over deleted_metas if the table exists
+                    Carves the freelist pages and unallocated space with CarveDatabase
+                    Returns {"deleted": artifacts dictionary, "carved": list of [artifact, value, page]}
+                    An error in either step is stored with RecoveryError and the other step still runs
+    """
+    recovered = {"deleted": {}, "carved": []}
+    with profiler.Stage("recover:deleted", database):
+        try:
+            syncFile = SyncFile(database, mode, table=DELETED_TABLE)
+            if DELETED_TABLE in syncFile.tables:
+                recovered["deleted"] = syncFile.GetArtifacts(artifacts)
+        except Exception as err:
+            RecoveryError(recovered, "deleted", err)
+    with profiler.Stage("recover:carve", database) as stage:
+        try:
+            recovered["carved"] = CarveDatabase(database, artifacts)
+        except Exception as err:
+            RecoveryError(recovered, "carved", err)
+        stage.rows = len(recovered["carved"])
+    return recovered
+    # End RecoverDatabase =================================
+
+
+def ParseWal(database, artifacts, mode=READ_STREAM, selected=ARTIFACTS):
+    """
+    Name:           ParseWal
+
+    Description:    Finds the artifacts only present in the -wal file of a database
+
+    Input:          Path to the syncFile Database
+                    GetArtifacts dictionary of the main file
+                    Read mode used for the WAL image
+                    Artifacts to extract from the image
+
+    Actions:        Builds the image with WalImage and extracts every artifact from it
+                    Returns the WalOnly dictionary, empty if there is no -wal file with a commit
+    """
+    with profiler.Stage("wal", database):
+        image = WalImage(database)
+        if image is None:
+            return {}
+        return WalOnly(artifacts, SyncFile(database, mode, image=image).GetArtifacts(selected))
+    # End ParseWal ========================================
+
+
+def ParseDatabase(database, mode=READ_STREAM, cache=None, recover=False, wal=False, artifacts=ARTIFACTS):
+    """
+    Name:           ParseDatabase
+
+    Description:    Parses one database into a SyncResult, used directly or by the worker processes
+
+    Input:          Path to the syncFile Database
+                    Read mode passed to the SyncFile
+                    Optional ExtractionCache passed to the SyncFile
+                    True to also recover deleted artifacts with RecoverDatabase
+                    True to also report the artifacts only found in the -wal file with ParseWal
+                    Artifacts to extract, defaults to all of them
+
+    Actions:        Creates the SyncFile and extracts the artifacts in a single pass
+                    Catches any error so one corrupt or locked database does not stop the run,
+                        the error is stored in the returned SyncResult instead
+                    An error recovering artifacts or reading the -wal file is stored with RecoveryError,
+                        the artifacts of the main file are still returned
+                    Hands an ArchiveMember to ParseArchiveMember
+    """
+    if isinstance(database, ArchiveMember):
+        return ParseArchiveMember(database, mode, recover, wal, artifacts)
+    with profiler.Stage("parse", database):
+        try:
+            found = SyncFile(database, mode, cache).GetArtifacts(artifacts)
+        except Exception as err:
+            return SyncResult(database, error="{0}: {1}".format(type(err).__name__, err))
+        recovered = None
+        if recover or wal:
+            recovered = RecoverDatabase(database, mode, artifacts) if recover else {}
+        if wal:
+            try:
+                recovered["wal"] = ParseWal(database, found, mode, artifacts)
+            except Exception as err:
+                RecoveryError(recovered, "wal", err)
+        return SyncResult(database, found, recovered=recovered)
+    # End ParseDatabase ===================================
+
+
+def ParseBytes(data, name="<memory>", mode=READ_STREAM, artifacts=ARTIFACTS):
+    """
+    Name:           ParseBytes
+
+    Description:    Parses one database held in memory into a SyncResult
+
+    Input:          Bytes like object holding the whole database file
+                    Name the result is reported under
+                    Read mode passed to the SyncFile
+                    Artifacts to extract, defaults to all of them
+
+    Actions:        Uses SyncFile.FromBytes and catches any error the same way as ParseDatabase
+    """
+    with profiler.Stage("parse", name):
+        try:
+            return SyncResult(name, SyncFile.FromBytes(data, name, mode).GetArtifacts(artifacts))
+        except Exception as err:
+            return SyncResult(name, error="{0}: {1}".format(type(err).__name__, err))
+    # End ParseBytes ======================================
+
+
+def ParseArchiveMember(member, mode=READ_STREAM, recover=False, wal=False, artifacts=ARTIFACTS):
+    """
+    Name:           ParseArchiveMember
+
+    Description:    Parses one database read out of an archive into a SyncResult
+
+    Input:          ArchiveMember from IterArchiveDatabases
+                    Read mode passed to the SyncFile
+                    True to also recover deleted artifacts, True to also parse the -wal file
+                    Artifacts to extract
+
+    Actions:        Parses a database held in memory with ParseBytes and a spooled copy with ParseDatabase,
+                        the extraction cache is not used as the copy is new on every run
+                    Reports the result under the archive and member name
+                    Discards the bytes or the temporary copy once parsed
+    """
+    try:
+        if member.data is not None:
+            return ParseBytes(member.data, member.name, mode, artifacts)
+        result = ParseDatabase(member.path, mode, None, recover, wal, artifacts)
+        result.database = member.name
+        return result
+    finally:
+        member.Discard()
+    # End ParseArchiveMember ==============================
+
+
+def Throttle(items, slots, stop):
+    """
+    Name:           Throttle
+
+    Description:    Passes items on only while a slot is free
+
+    Input:          Iterable, threading.Semaphore with one slot per item allowed ahead of the consumer,
+                        threading.Event set when the consumer has stopped
+
+    Actions:        Takes a slot before reading each item, the consumer frees it once the item is done
+                    Keeps Pool.imap from reading every database, or spooling every archive member, ahead of
+                        the workers
+                    Returns once stop is set so a blocked pool can still be terminated
+    """
+    for item in items:
+        while not slots.acquire(timeout=0.1):
+            if stop.is_set():
+                return
+        yield item
+    # End Throttle ========================================
+
+
+def ParseDatabaseArgs(args):
+    """
+    Name:           ParseDatabaseArgs
+
+    Description:    Unpacks a (database, mode, cache, recover, wal, artifacts) tuple for ParseDatabase,
+                        used with Pool.imap
+
+    Input:          Tuple of the database path, read mode, extraction cache, recovery flag, WAL flag and artifacts
+
+    Actions:        Returns the SyncResult from ParseDatabase
+                    Moves the profiler records of the database onto the result
+    """
+    result = ParseDatabase(*args)
+    result.profile = profiler.Take()
+    return result
+    # End ParseDatabaseArgs ===============================
+
+
+def ParseDatabases(databases, mode=READ_STREAM, jobs=1, cache=None, recover=False, wal=False, artifacts=ARTIFACTS):
+    """
+    Name:           ParseDatabases
+
+    Description:    Parses every passed database, in worker processes if more than one job is requested
+
+    Input:          Iterable of database paths
+                    Read mode passed to each SyncFile
+                    Number of worker processes
+                    Optional ExtractionCache, each worker opens its own connection to it
+                    True to also recover deleted artifacts
+                    True to also report the artifacts only found in the -wal files
+                    Artifacts to extract from each database, defaults to all of them
+
+    Actions:        Yields a SyncResult for each database in the order the databases were passed
+                    Uses Pool.imap so results are yielded as soon as they and the ones before them are done
+                    Workers profile if this process does, their records are merged as the results arrive,
+                        and use the same time style
+                    At most PARSE_AHEAD databases per worker are read ahead of the results, so the
+                        members of an archive are not all held in memory or spooled at once
+    """
+    if jobs <= 1:
+        for database in databases:
+            yield ParseDatabase(database, mode, cache, recover, wal, artifacts)
+        return
+    pool = multiprocessing.Pool(jobs, initializer=InitWorker, initargs=(profiler.enabled, timeConverter.style,
+                                                                        profiler.memory))
+    slots = threading.Semaphore(jobs * PARSE_AHEAD)
+    stop = threading.Event()
+    try:
+        for result in pool.imap(ParseDatabaseArgs, ((database, mode, cache, recover, wal, artifacts)
+                                                         for database in Throttle(databases, slots, stop))):
+            slots.release()
+            profiler.Merge(result.profile)
+            yield result
+    finally:
+        stop.set()
+        pool.terminate()
+        pool.join()
+    # End ParseDatabases ==================================
+
+
+async def DiscoverStage(databases, paths, workers, executor):
+    """
+    Name:           DiscoverStage
+
+    Description:    First pipeline stage, puts each database path on the paths queue
+
+    Input:          Iterable of database paths, paths queue, number of extract stages, executor to walk in
+
+    Actions:        Pulls each path from the iterable in the executor so a slow share does not block the loop
+                    Waits when the queue is full, so discovery never runs far ahead of extraction
+                    Puts one None per extract stage once every path has been found
+    """
+    loop = asyncio.get_running_loop()
+    iterator = iter(databases)
+    try:
+        while True:
+            database = await loop.run_in_executor(executor, next, iterator, None)
+            if database is None:
+                break
+            await paths.put(database)
+    finally:
+        for _ in range(workers):
+            await paths.put(None)
+    # End DiscoverStage ===================================
+
+
+async def ExtractStage(paths, results, executor, args, merge):
+    """
+    Name:           ExtractStage
+
+    Description:    Second pipeline stage, parses each path from the paths queue
+
+    Input:          Paths queue, results queue, executor to parse in,
+                        (mode, cache, recover, wal, artifacts) arguments of ParseDatabase,
+                        True if the executor is a process pool whose profiler records are merged
+
+    Actions:        Runs ParseDatabase in the executor and puts the SyncResult on the results queue
+                    Puts None on the results queue when it takes None from the paths queue
+    """
+    loop = asyncio.get_running_loop()
+    while True:
+        database = await paths.get()
+        if database is None:
+            break
+        if merge:
+            result = await loop.run_in_executor(executor, ParseDatabaseArgs, (database,) + args)
+            profiler.Merge(result.profile)
+        else:
+            result = await loop.run_in_executor(executor, ParseDatabase, database, *args)
+        await results.put(result)
+    await results.put(None)
+    # End ExtractStage ====================================
+
+
+async def OutputStage(results, workers, handle):
+    """
+    Name:           OutputStage
+
+    Description:    Last pipeline stage, hands each result to the output as soon as it is parsed
+
+    Input:          Results queue, number of extract stages, function called with each SyncResult
+
+    Actions:        Runs until every extract stage has put its None on the queue
+                    Results are handled in the order they finish, not the order they were found
+    """
+    finished = 0
+    while finished < workers:
+        result = await results.get()
+        if result is None:
+            finished += 1
+            continue
+        handle(result)
+    # End OutputStage =====================================
+
+
+async def RunPipeline(databases, handle, mode=READ_STREAM, jobs=1, cache=None, recover=False, wal=False,
+                      artifacts=ARTIFACTS, queueSize=PIPELINE_QUEUE_SIZE):
+    """
+    Name:           RunPipeline
+
+    Description:    Parses databases with discovery, extraction and output as separate stages
+
+    Input:          Iterable of database paths
+                    Function called with each SyncResult
+                    Read mode, number of parallel extractions, extraction cache, recovery and WAL flags
+                        and artifacts as for ParseDatabases
+                    Size of the queues between the stages
+
+    Actions:        Joins the stages with bounded asyncio queues, a full queue makes the stage before it wait
+                        so memory is capped however fast discovery or extraction runs
+                    Discovery runs in its own thread, extraction in a process pool when more than one job is
+                        asked for and in one thread otherwise, output runs in the event loop
+    """
+    paths = asyncio.Queue(queueSize)
+    results = asyncio.Queue(queueSize)
+    finder = concurrent.futures.ThreadPoolExecutor(1)
+    if jobs > 1:
+        parser = concurrent.futures.ProcessPoolExecutor(jobs, initializer=InitWorker,
+                                                        initargs=(profiler.enabled, timeConverter.style,
+                                                                  profiler.memory))
+    else:
+        parser = concurrent.futures.ThreadPoolExecutor(1)
+    workers = max(jobs, 1)
+    args = (mode, cache, recover, wal, artifacts)
+    try:
+        await asyncio.gather(DiscoverStage(databases, paths, workers, finder),
+                             *[ExtractStage(paths, results, parser, args, jobs > 1) for _ in range(workers)],
+                             OutputStage(results, workers, handle))
+    finally:
+        finder.shutdown(wait=False, cancel_futures=True)
+        parser.shutdown(wait=True, cancel_futures=True)
+    # End RunPipeline =====================================
+
+
+def DisplayData(data):
+    """
+    Name:           DisplayData
+
+    Description:    Prints lists that has lists of pairs, second usually being a formatted date
+                        or prints entire passed list
+
+    Input:          data, either a list of lists, a list, or a string
+
+    Actions:        Prints each line from DataLines
+    """
+    for line in DataLines(data):
+        Report(line)
+    # End DisplayData =====================================
+
+
+def Report(msg, level=False):
+    """
+    Name:           Report
+
+    Description:    Custom outputter  with verbosity checker, will print to screen or file depending on arguments
+
+    Input:          Message which to be displayed: String
+                    Importance level: Int
+
+    Action:         Prints the msg based on the verbosity level.
+                    If no verbosity level passed, it will print the message.
+                    Higher levels are more important. A 1 verbosity will print everything,
+                    a 2 will print level 2&3, a 3 will print 3
+
+                    Messages with out level are Data
+                    Level 1 messages are statuses
+                    Level 2 messages are errors
+                    Level 3 messages are critical errors
+    """
+    # Checks if a level was provided
+    if not level:
+        # Determines if a output file was set
+        if not outFile:
+            # If no output file was set, print to the screen
+            print(msg)
+        else:
+            # If output file was set, add data to a new line in that file
+            outFile.write(msg+'\n')
+    # Makes sure importance level is higher than the verbosity filter
+    elif level >= verbosity:
+        # Prints to screen if output file was not set
+        if not outFile:
+            print(msg)
+        # If output file was set, add data to a new line in that file
+        else:
+            outFile.write(msg+'\n')
+    # End Report ==========================================
+
+
+def DisplaySyncFile(syncFile, artifacts=ARTIFACTS):
+    """
+    Name:           DisplaySyncFile
+
+    Description:    Prints every section for one database
+
+    Input:          SyncFile or SyncResult object
+                    Artifacts that were extracted, the sections of the others are left out
+
+    Actions:        Builds the SyncReport of the database and renders it with a TextRenderer
+                        to the out file or the screen at the current verbosity
+    """
+    TextRenderer(outFile or sys.stdout, verbosity).Render(SyncReport(syncFile, artifacts))
+    # End DisplaySyncFile =================================
+
+
+def IterRecovered(syncFile):
+    """
+    Name:           IterRecovered
+
+    Description:    Yields every recovered artifact of a database as a flat tuple
+
+    Input:          SyncFile or SyncResult object with a recovered dictionary from RecoverDatabase
+
+    Actions:        Yields (source, artifact, value, time, epoch) where source is deleted, wal or carved
+                    Artifacts from deleted_metas and the WAL use the same names as IterRecords,
+                        the account is left out because it is read from share_info for both
+                    Computer times are converted from the computerEpochs milliseconds with timeConverter
+                    Carved artifacts have no time, the page they were found on is not part of the tuple
+    """
+    recovered = getattr(syncFile, "recovered", None) or {}
+    for source in ["deleted", "wal"]:
+        artifacts = recovered.get(source) or {}
+        for fullName, dateOfBirth in artifacts.get("fullInfo") or []:
+            yield source, "fullName", fullName, None, None
+            yield source, "dateOfBirth", dateOfBirth, None, None
+        for name, epoch in artifacts.get("computerEpochs") or []:
+            yield source, "computer", name, timeConverter.Convert(epoch / 1000), epoch
+        for email in artifacts.get("recoveryEmail") or []:
+            yield source, "recoveryEmail", email, None, None
+        if artifacts.get("recoveryPhone"):
+            yield source, "recoveryPhone", artifacts["recoveryPhone"], None, None
+        for extension in artifacts.get("extensions") or []:
+            yield source, "extension", extension, None, None
+        for site in artifacts.get("sites") or []:
+            yield source, "site", site, None, None
+    for artifact, value, page in recovered.get("carved") or []:
+        yield "carved", artifact, value, None, None
+    # End IterRecovered ===================================
+
+
+def IterRecords(syncFile):
+    """
+    Name:           IterRecords
+
+    Description:    Yields one flat record per artifact of a database for the structured writers
+
+    Input:          SyncFile or SyncResult object
+
+    Actions:        Yields dictionaries with the RECORD_FIELDS keys, time and epoch are None when the artifact has none
+                    epoch is the raw seconds since epoch the time was converted from
+                    Yields a single error record if the database could not be parsed
+                    Recovered artifacts are named source:artifact, such as deleted:computer or carved:site
+    """
+    database = syncFile.database
+    if getattr(syncFile, "error", False):
+        yield {"database": database, "artifact": "error", "value": syncFile.error, "time": None, "epoch": None}
+        return
+    if syncFile.encrypted:
+        yield {"database": database, "artifact": "encrypted", "value": True, "time": None, "epoch": None}
+    for user, epoch in zip(syncFile.GetUserInfo(), syncFile.GetUserEpochs()):
+        yield {"database": database, "artifact": "user", "value": user[0], "time": user[1], "epoch": epoch[1]}
+    for fullName, dateOfBirth in syncFile.GetFullInfo() or []:
+        yield {"database": database, "artifact": "fullName", "value": fullName, "time": None, "epoch": None}
+        yield {"database": database, "artifact": "dateOfBirth", "value": dateOfBirth, "time": None, "epoch": None}
+    for computer, epoch in zip(syncFile.GetAttachedComputers(), syncFile.GetComputerEpochs()):
+        yield {"database": database, "artifact": "computer", "value": computer[0], "time": computer[1],
+               "epoch": epoch[1]}
+    for email in syncFile.GetRecoveryEmail() or []:
+        yield {"database": database, "artifact": "recoveryEmail", "value": email, "time": None, "epoch": None}
+    if syncFile.GetRecoveryPhone():
+        yield {"database": database, "artifact": "recoveryPhone", "value": syncFile.GetRecoveryPhone(), "time": None,
+               "epoch": None}
+    for extension in syncFile.GetExtensions() or []:
+        yield {"database": database, "artifact": "extension", "value": extension, "time": None, "epoch": None}
+    for site in syncFile.GetAllSites() or []:
+        yield {"database": database, "artifact": "site", "value": site, "time": None, "epoch": None}
+    for source, artifact, value, timeAdded, epoch in IterRecovered(syncFile):
+        yield {"database": database, "artifact": "{0}:{1}".format(source, artifact), "value": value,
+               "time": timeAdded, "epoch": epoch}
+    # End IterRecords =====================================
+
+
+class JsonLinesWriter():
+    def __init__(self, stream, batchSize=WRITE_BATCH_SIZE, append=False):
+        """
+        Name:           JsonLinesWriter
+
+        Description:    Writes records as JSON Lines, one JSON object per line
+
+        Input:          Open text stream to write to
+                        Number of records to hold before writing them out
+                        True when adding to the records of an earlier run
+
+        Actions:        Holds at most batchSize encoded lines, so memory stays the same however many are written
+        """
+        self.stream = stream
+        self.batchSize = batchSize
+        self.lines = []
+        # End __init__ ====================================
+
+    def Write(self, record):
+        """
+        Name:           Write
+
+        Description:    Adds a record to the batch
+
+        Input:          Record dictionary
+
+        Actions:        Encodes the record and writes the batch out once it is full
+        """
+        self.lines.append(json.dumps(record) + "\n")
+        if len(self.lines) >= self.batchSize:
+            self.Flush()
+        # End Write =======================================
+
+    def Flush(self):
+        """
+        Name:           Flush
+
+        Description:    Writes out the held records
+
+        Input:          None
+
+        Actions:        Writes every held line with a single write call and empties the batch
+        """
+        if self.lines:
+            self.stream.write("".join(self.lines))
+            self.lines = []
+        # End Flush =======================================
+
+    def Close(self):
+        """
+        Name:           Close
+
+        Description:    Writes out the last records
+
+        Input:          None
+
+        Actions:        Flushes the batch and the stream, the stream itself is left open
+        """
+        self.Flush()
+        self.stream.flush()
+        # End Close =======================================
+
+
+class CsvWriter(JsonLinesWriter):
+    def __init__(self, stream, batchSize=WRITE_BATCH_SIZE, append=False):
+        """
+        Name:           CsvWriter
+
+        Description:    Writes records as CSV rows with a RECORD_FIELDS header
+
+        Input:          Open text stream to write to
+                        Number of records to hold before writing them out
+                        True when adding to the records of an earlier run, the header is not written again
+
+        Actions:        Formats the rows into an in memory buffer that is written out a batch at a time
+                        Writes the header row first
+        """
+        JsonLinesWriter.__init__(self, stream, batchSize, append)
+        self.buffer = io.StringIO()
+        self.writer = csv.DictWriter(self.buffer, RECORD_FIELDS, lineterminator="\n")
+        if not append:
+            self.writer.writeheader()
+        self.count = 0
+        # End __init__ ====================================
+
+    def Write(self, record):
+        """
+        Name:           Write
+
+        Description:    Adds a record to the batch
+
+        Input:          Record dictionary
+
+        Actions:        Formats the record into the buffer and writes the batch out once it is full
+        """
+        self.writer.writerow(record)
+        self.count += 1
+        if self.count >= self.batchSize:
+            self.Flush()
+        # End Write =======================================
+
+    def Flush(self):
+        """
+        Name:           Flush
+
+        Description:    Writes out the held records
+
+        Input:          None
+
+        Actions:        Writes the buffer with a single write call and empties it
+        """
+        if self.buffer.tell():
+            self.stream.write(self.buffer.getvalue())
+            self.buffer.seek(0)
+            self.buffer.truncate()
+        self.count = 0
+        # End Flush =======================================
+
+
+# Structured writer class for each output format
+WRITERS = {
+    FORMAT_JSONL: JsonLinesWriter,
+    FORMAT_CSV: CsvWriter,
+}
+
+
+# Sections of a SyncReport in report order: attribute, heading and column names, used by the JSON and HTML output
+REPORT_SECTIONS = [
+    ("users", "Email Account", ["Email Account", "Time added"]),
+    ("fullInfo", "Full Name", ["Full Name", "DOB (DDYYYY)"]),
+    ("computers", "Computers", ["Computer Name", "Time added"]),
+    ("recoveryEmail", "Recovery Email", ["Recovery Email"]),
+    ("recoveryPhone", "Recovery Phone", ["Recovery Phone"]),
+    ("extensions", "Extensions", ["Extension"]),
+    ("sites", "All Sites", ["Site"]),
+    ("recovered", "Recovered", ["Source", "Artifact", "Value", "Time added", "Epoch"]),
+]
+
+
+class SyncReport():
+    def __init__(self, syncFile, artifacts=ARTIFACTS):
+        """
+        Name:           SyncReport
+
+        Description:    Everything shown for one database, read once and handed to a renderer
+
+        Input:          SyncFile or SyncResult object
+                        Artifacts that were extracted, the sections of the others are set to None
+
+        Actions:        Calls each getter of the extracted artifacts once, the renderers only read the attributes
+                        Only the database and error are set if the database could not be parsed
+        """
+        self.database = syncFile.database
+        self.error = getattr(syncFile, "error", False)
+        self.artifacts = artifacts
+        self.encrypted = False
+        for attribute, heading, columns in REPORT_SECTIONS:
+            setattr(self, attribute, None)
+        if self.error:
+            return
+        self.encrypted = syncFile.encrypted
+        if ARTIFACT_USER in artifacts:
+            self.users = syncFile.GetUserInfo()
+        if ARTIFACT_PROFILE in artifacts:
+            self.fullInfo = syncFile.GetFullInfo()
+            self.recoveryPhone = syncFile.GetRecoveryPhone()
+        if RECORD_COMPUTER in artifacts:
+            self.computers = syncFile.GetAttachedComputers()
+        if RECORD_RECOVERY_EMAIL in artifacts:
+            self.recoveryEmail = syncFile.GetRecoveryEmail()
+        if RECORD_EXTENSION in artifacts:
+            self.extensions = syncFile.GetExtensions()
+        if ARTIFACT_SITES in artifacts:
+            self.sites = syncFile.GetAllSites()
+        if getattr(syncFile, "recovered", None) is not None:
+            self.recovered = list(IterRecovered(syncFile))
+        # End __init__ ====================================
+
+    def Rows(self, attribute):
+        """
+        Name:           Rows
+
+        Description:    Returns one section as a list of rows
+
+        Input:          Attribute of the section, a REPORT_SECTIONS name
+
+        Actions:        Pairs and tuples become rows of their values, single values rows of one,
+                            a section with nothing found has no rows
+        """
+        value = getattr(self, attribute)
+        if not value:
+            return []
+        if not isinstance(value, list):
+            return [[value]]
+        return [list(item) if isinstance(item, (list, tuple)) else [item] for item in value]
+        # End Rows ========================================
+
+    def Dict(self):
+        """
+        Name:           Dict
+
+        Description:    Returns the report as a dictionary for JSON
+
+        Input:          None
+
+        Actions:        Keeps the database, error and encrypted flag, then the rows of every section that was
+                            extracted, the sections that were not are left out
+        """
+        report = {"database": self.database, "error": self.error or None, "encrypted": self.encrypted}
+        for attribute, heading, columns in REPORT_SECTIONS:
+            if getattr(self, attribute) is not None:
+                report[attribute] = self.Rows(attribute)
+        return report
+        # End Dict ========================================
+
+
+def DataLines(data):
+    """
+    Name:           DataLines
+
+    Description:    Formats data the way DisplayData prints it
+
+    Input:          data, either a list of lists, a list, or a string
+
+    Actions:        Returns the lines, pairs are padded with : so the second values line up on the right
+    """
+    if not isinstance(data, list):
+        return [str(data)]
+    return [str(item[0].ljust(35, ":") + " " + item[1].rjust(20, ":")) if len(item) == 2 else str(item)
+            for item in data]
+    # End DataLines =======================================
+
+
+class TextRenderer():
+    def __init__(self, stream, level=3):
+        """
+        Name:           TextRenderer
+
+        Description:    Renders reports as the text report
+
+        Input:          Open text stream to write to
+                        Verbosity level, statuses and errors below it are left out the same way Report does
+
+        Actions:        Builds the lines of a report in a list and writes them with a single write call
+        """
+        self.stream = stream
+        self.level = level
+        # End __init__ ====================================
+
+    def Render(self, report):
+        """
+        Name:           Render
+
+        Description:    Writes one report
+
+        Input:          SyncReport object
+
+        Actions:        Writes the error if the database could not be parsed, otherwise a note if it is encrypted
+                        Writes the account, full info, computers, recovery email and phone, extensions, sites and
+                            recovered artifacts that were extracted, with status lines at level 1
+        """
+        self.lines = []
+        if report.error:
+            self.Line("ERROR: Could not parse the database located at: {0}\n{1}".format(report.database,
+                                                                                       report.error), 3)
+            return self.Write()
+        if report.encrypted:
+            self.Line(str("NOTE: The database located at: {0} is encrypted\n".format(report.database)), 1)
+
+        self.Line("\nDatabase: {0}\n".format(report.database).center(56))
+        if report.users is not None:
+            self.Line("Email Account".center(35, "=")+" "+"Time added".center(20, "=")+"\n")
+            self.Data(report.users)
+            self.Line("")
+        if report.fullInfo is not None:
+            if report.fullInfo:
+                self.Line("Full Name".center(35, "=")+" "+"DOB (DDYYYY)".center(20, "=")+"\n")
+                self.Data(report.fullInfo)
+                self.Line("")
+            else:
+                self.Line("Full Name".center(35, "=")+" "+"DOB (DDYYYY)".center(20, "=")+"\n", 1)
+                self.Line("No full info available", 1)
+                self.Line("", 1)
+        if report.computers is not None:
+            self.Line("Computer Name".center(35, "=")+" "+"Time added".center(20, "="))
+            self.Line("{0} Computer(s) were synced".format(len(report.computers)).center(35, "_"), 1)
+            self.Line("")
+            self.Data(report.computers)
+            self.Line("")
+        self.Section(report.recoveryEmail, "Recovery Email", "No Recovery email found")
+        self.Section(report.recoveryPhone, "Recovery Phone", "No Recovery phone found")
+        self.Section(report.extensions, "Extensions(s)", "No Extensions found", "{0} Extensions were Found")
+        self.Section(report.sites, "All Sites", "No sites were found", "{0} Sites found")
+        if report.recovered is not None:
+            self.Line("Recovered".center(35, "=")+" "+"Time added".center(20, "="))
+            self.Line("{0} Artifacts recovered".format(len(report.recovered)).center(35, "_"), 1)
+            self.Line("")
+            for source, artifact, value, timeAdded, epoch in report.recovered:
+                self.Line("{0} {1} {2}".format("{0}:{1}".format(source, artifact).ljust(22), str(value).ljust(35),
+                                               timeAdded or ""))
+            self.Line("")
+        self.Write()
+        # End Render ======================================
+
+    def Section(self, data, heading, missing, count=None):
+        """
+        Name:           Section
+
+        Description:    Adds a section that is left out at the default verbosity when nothing was found
+
+        Input:          Section data, None if it was not extracted
+                        Heading, line shown when nothing was found, optional count line format
+
+        Actions:        Adds the heading, the count status line and the data,
+                            or the heading and missing line as statuses if there is no data
+        """
+        if data is None:
+            return
+        if data:
+            if count:
+                self.Line(heading.center(35, "="))
+                self.Line(count.format(len(data)).center(35, "_"), 1)
+                self.Line("")
+            else:
+                self.Line(heading.center(35, "=")+"\n")
+            self.Data(data)
+            self.Line("")
+        else:
+            self.Line(heading.center(35, "=")+"\n", 1)
+            self.Line(missing, 1)
+            self.Line("", 1)
+        # End Section =====================================
+
+    def Line(self, msg, level=False):
+        """
+        Name:           Line
+
+        Description:    Adds one line of the report
+
+        Input:          Text of the line, level the same way as Report
+
+        Actions:        Keeps the line if it has no level or the level is at or above the verbosity
+        """
+        if not level or level >= self.level:
+            self.lines.append(msg)
+        # End Line ========================================
+
+    def Data(self, data):
+        """
+        Name:           Data
+
+        Description:    Adds data formatted by DataLines
+
+        Input:          data, either a list of lists, a list, or a string
+
+        Actions:        Adds every line of it
+        """
+        self.lines.extend(DataLines(data))
+        # End Data ========================================
+
+    def Write(self):
+        """
+        Name:           Write
+
+        Description:    Writes the lines of the current report
+
+        Input:          None
+
+        Actions:        Joins the lines and writes them with one call, the list is dropped afterwards
+        """
+        if self.lines:
+            self.lines.append("")
+            self.stream.write("\n".join(self.lines))
+        self.lines = []
+        # End Write =======================================
+
+    def Close(self):
+        """
+        Name:           Close
+
+        Description:    Finishes the output
+
+        Input:          None
+
+        Actions:        Flushes the stream, the stream itself is left open
+        """
+        self.stream.flush()
+        # End Close =======================================
+
+
+class JsonRenderer(TextRenderer):
+    def __init__(self, stream, level=3):
+        """
+        Name:           JsonRenderer
+
+        Description:    Renders reports as one JSON array with an object per database
+
+        Input:          Open text stream to write to
+                        Verbosity level, used for the errors reported while rendering
+
+        Actions:        Writes the opening bracket, every report is written as it is rendered
+        """
+        TextRenderer.__init__(self, stream, level)
+        self.count = 0
+        self.stream.write("[")
+        # End __init__ ====================================
+
+    def Render(self, report):
+        """
+        Name:           Render
+
+        Description:    Writes one report
+
+        Input:          SyncReport object
+
+        Actions:        Writes the SyncReport.Dict of the report with one write call
+                        Reports the error of a database that could not be parsed, errors are also in the object
+        """
+        if report.error:
+            Report("ERROR: Could not parse the database located at: {0}\n{1}".format(report.database,
+                                                                                     report.error), 3)
+        self.stream.write(("," if self.count else "") + "\n" + json.dumps(report.Dict()))
+        self.count += 1
+        # End Render ======================================
+
+    def Close(self):
+        """
+        Name:           Close
+
+        Description:    Finishes the output
+
+        Input:          None
+
+        Actions:        Writes the closing bracket and flushes the stream
+        """
+        self.stream.write("\n]\n")
+        self.stream.flush()
+        # End Close =======================================
+
+
+class HtmlRenderer(TextRenderer):
+    def __init__(self, stream, level=3):
+        """
+        Name:           HtmlRenderer
+
+        Description:    Renders reports as one HTML page with a table per section
+
+        Input:          Open text stream to write to
+                        Verbosity level, sections with nothing found are only shown at level 1
+
+        Actions:        Writes the head of the page, every report is written as it is rendered
+        """
+        TextRenderer.__init__(self, stream, level)
+        self.stream.write("<!DOCTYPE html>\n<html>\n<head>\n<meta charset=\"utf-8\">\n"
+                          "<title>Chrome Sync Parser</title>\n</head>\n<body>\n")
+        # End __init__ ====================================
+
+    def Render(self, report):
+        """
+        Name:           Render
+
+        Description:    Writes one report
+
+        Input:          SyncReport object
+
+        Actions:        Writes a section for the database with a table for every section that was extracted,
+                            every value is escaped
+                        Reports the error of a database that could not be parsed, errors are also in the page
+        """
+        parts = ["<section>\n<h2>Database: {0}</h2>\n".format(html.escape(report.database))]
+        if report.error:
+            Report("ERROR: Could not parse the database located at: {0}\n{1}".format(report.database,
+                                                                                     report.error), 3)
+            parts.append("<p class=\"error\">Could not parse the database: {0}</p>\n".format(
+                html.escape(report.error)))
+        elif report.encrypted:
+            parts.append("<p class=\"note\">The database is encrypted</p>\n")
+        for attribute, heading, columns in REPORT_SECTIONS:
+            if getattr(report, attribute) is None:
+                continue
+            rows = report.Rows(attribute)
+            if not rows and self.level > 1:
+                continue
+            parts.append("<h3>{0} ({1})</h3>\n<table>\n<tr>{2}</tr>\n".format(
+                heading, len(rows), "".join("<th>{0}</th>".format(column) for column in columns)))
+            parts.extend("<tr>{0}</tr>\n".format("".join("<td>{0}</td>".format(
+                html.escape("" if value is None else str(value))) for value in row)) for row in rows)
+            parts.append("</table>\n")
+        parts.append("</section>\n")
+        self.stream.write("".join(parts))
+        # End Render ======================================
+
+    def Close(self):
+        """
+        Name:           Close
+
+        Description:    Finishes the output
+
+        Input:          None
+
+        Actions:        Writes the end of the page and flushes the stream
+        """
+        self.stream.write("</body>\n</html>\n")
+        self.stream.flush()
+        # End Close =======================================
+
+
+# Renderers of the report formats, by format name
+RENDERERS = {
+    FORMAT_TEXT: TextRenderer,
+    FORMAT_JSON: JsonRenderer,
+    FORMAT_HTML: HtmlRenderer,
+}
+
+
+class CaseDatabase():
+    def __init__(self, path, batchSize=CASE_BATCH_SIZE, durable=False):
         """
-        Name:           UserInfo
+        Name:           CaseDatabase
 
-        Description:    Pulls the name and create time from the share_info table
+        Description:    Normalized SQLite store for the artifacts of every database in a run
 
-        Input:          None
+        Input:          Path to the case database, created if it does not exist
+                        Number of rows to hold before inserting them
+                        True to keep the journal, used by a resumable job
 
-        Actions:        Pulls the name and db_create_time from the share_info table sets the out put to self.userAccount
+        Actions:        Creates the CASE_TABLES, rows are added to an existing case database
+                        Drops the CASE_INDEXES so the load does not have to keep them up to date
+                        Turns off the journal and syncing unless durable is set, a crash can then leave the case
+                            database corrupt, it can be rebuilt from the evidence
         """
-        self.userAccount = []
-        self.cursor.execute("SELECT `name`, `db_create_time` FROM `share_info`;")
-        # Returns a tuple of email account and creation time in epoch
-        self.userAccount = self.cursor.fetchall()
-        # End UserInfo ====================================
+        self.path = path
+        self.batchSize = batchSize
+        self.connection = lite.connect(path)
+        if not durable:
+            self.connection.execute("PRAGMA journal_mode = OFF;")
+            self.connection.execute("PRAGMA synchronous = OFF;")
+        for table, columns in CASE_TABLES:
+            self.connection.execute("CREATE TABLE IF NOT EXISTS `{0}` ({1});".format(table, columns))
+        for index, table, column in CASE_INDEXES:
+            self.connection.execute("DROP INDEX IF EXISTS `{0}`;".format(index))
+        # Ids are handed out here so every row of a database can be queued without a round trip
+        self.nextId = self.connection.execute("SELECT IFNULL(MAX(id), 0) + 1 FROM `databases`;").fetchone()[0]
+        # Rows waiting to be inserted, by table
+        self.pending = dict((table, []) for table, columns in CASE_TABLES)
+        self.count = 0
+        # End __init__ ====================================
 
-    def ConvertTime(self, timeInEpoch):
+    def Add(self, syncFile):
         """
-        Name:           ConvertTime
+        Name:           Add
 
-        Description:    Converts seconds since epoch into readable format (2014-02-24 21:49:54)
+        Description:    Queues every artifact of a database
 
-        Input:          Epoch Time in seconds
+        Input:          SyncFile or SyncResult object
 
-        Actions:        Uses the time library to format passed epoch time
+        Actions:        Queues one databases row and one row per artifact value
+                        Inserts the queued rows once there are batchSize of them
         """
-        return time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(timeInEpoch))
-        # End ConvertTime =================================
-
-    def AttachedComputers(self):
+        databaseId = self.nextId
+        self.nextId += 1
+        error = getattr(syncFile, "error", False)
+        self.Queue("databases", (databaseId, syncFile.database, int(bool(not error and syncFile.encrypted)),
+                                 error or None))
+        if not error:
+            for user, epoch in zip(syncFile.GetUserInfo(), syncFile.GetUserEpochs()):
+                self.Queue("users", (databaseId, user[0], user[1], epoch[1]))
+            for fullName, dateOfBirth in syncFile.GetFullInfo() or []:
+                self.Queue("profiles", (databaseId, fullName, dateOfBirth))
+            for computer, epoch in zip(syncFile.GetAttachedComputers(), syncFile.GetComputerEpochs()):
+                self.Queue("computers", (databaseId, computer[0], computer[1], epoch[1]))
+            for email in syncFile.GetRecoveryEmail() or []:
+                self.Queue("recovery_emails", (databaseId, email))
+            if syncFile.GetRecoveryPhone():
+                self.Queue("recovery_phones", (databaseId, syncFile.GetRecoveryPhone()))
+            for extension in syncFile.GetExtensions() or []:
+                self.Queue("extensions", (databaseId, extension))
+            for site in syncFile.GetAllSites() or []:
+                self.Queue("sites", (databaseId, site))
+            for source, artifact, value, timeAdded, epoch in IterRecovered(syncFile):
+                self.Queue("recovered", (databaseId, source, artifact, value, timeAdded, epoch))
+        if self.count >= self.batchSize:
+            self.Flush()
+        # End Add =========================================
+
+    def Queue(self, table, row):
         """
-        Name:           AttachedComputers
+        Name:           Queue
 
-        Description:    Sets the computer names that the users has logged into
+        Description:    Queues one row for a table
 
-        Input:          None
+        Input:          Table name and the row tuple
 
-        Actions:        Runs through each row in the metas table and adds the found computers to a list
-                        Sets the ComputerNames list to the values from column 19 in the metadata file
+        Actions:        Adds the row to the pending rows of the table
         """
-        self.computerNames = []
-        for row in self.metadata:
-            # b'\xd2\xb9 is the signature for a computer, remove false positives that don't have enough data
-            if str(row[23])[:10] == "b'\\xd2\\xb9" and len(str(row[23])) > 23:
-                # Adds a list item to the list with the computer name in [0] and date first signed in to [1]
-                # Row 7 needs to be divided by 1000 because the value is stored in milliseconds since epoch
-                self.computerNames.append([row[18], row[7]/1000])
-        # End AttachedComputers ===========================
+        self.pending[table].append(row)
+        self.count += 1
+        # End Queue =======================================
 
-    def GetUserInfo(self):
+    def Flush(self):
         """
-        Name:           GetUserInfo
+        Name:           Flush
 
-        Description:    Returns list of list, each mini list has user email and when Chrome was first signed in
+        Description:    Inserts every queued row
 
         Input:          None
 
-        Actions:        Needs UserInfo function to be run prior to get userAccount initialized
-                        converts time stored in userAccount's list of tuples into human readable
-                        Uses ConvertTime function
-                        returns the new list
-        """
-        users = []
-        for user in self.userAccount:
-            tempList = []
-            tempList.append(user[0])
-            tempList.append(self.ConvertTime(user[1]))
-            users.append(tempList)
-        return users
-        # End GetUserInfo =================================
-
-    def GetAttachedComputers(self):
+        Actions:        Uses one executemany per table inside a single transaction
         """
-        Name:           GetAttachedComputers
-
-        Description:    Returns list of lists, each mini list has computer string name and date account was added
+        with self.connection:
+            for table, rows in self.pending.items():
+                if rows:
+                    marks = ", ".join("?" * len(rows[0]))
+                    self.connection.executemany("INSERT INTO `{0}` VALUES ({1});".format(table, marks), rows)
+                    self.pending[table] = []
+        self.count = 0
+        # End Flush =======================================
+
+    def Remove(self, databases):
+        """
+        Name:           Remove
 
-        Input:          None
+        Description:    Deletes the rows of databases that are about to be parsed again
 
-        Actions:        Needs AttachedComputers function to be run prior to get computerNames initialized
-                        converts time stored in computerNames's list of tuples into human readable
-                        Uses ConvertTime function
-                        returns the new list
-        """
-        computerInfo = []
-        for computer in self.computerNames:
-            tempList = []
-            tempList.append(computer[0])
-            tempList.append(self.ConvertTime(computer[1]))
-            computerInfo.append(tempList)
-        return computerInfo
-        # End GetAttachedComputers ========================
+        Input:          Iterable of database paths
 
-    def RecoveryEmail(self):
+        Actions:        Deletes the databases rows with those paths and every artifact row pointing to them,
+                            so a database parsed again by a resumed job is stored once
+                        Returns the number of databases rows deleted
         """
-        Name:           RecoveryEmail
+        with self.connection:
+            # The paths go through a temporary table so the artifact tables are each scanned once
+            self.connection.execute("CREATE TEMP TABLE IF NOT EXISTS `removed` (path TEXT PRIMARY KEY);")
+            self.connection.execute("DELETE FROM `removed`;")
+            self.connection.executemany("INSERT OR IGNORE INTO `removed` VALUES (?);",
+                                        ((database,) for database in databases))
+            ids = "SELECT id FROM `databases` WHERE path IN (SELECT path FROM `removed`)"
+            for table, columns in CASE_TABLES[1:]:
+                self.connection.execute("DELETE FROM `{0}` WHERE database_id IN ({1});".format(table, ids))
+            count = self.connection.execute("DELETE FROM `databases` WHERE path IN (SELECT path FROM "
+                                            "`removed`);").rowcount
+            self.connection.execute("DROP TABLE `removed`;")
+        return count
+        # End Remove ======================================
+
+    def Close(self):
+        """
+        Name:           Close
 
-        Description:    Sets the recoveryEmail variable
+        Description:    Finishes loading the case database
 
         Input:          None
 
-        Actions:        Adds recovery emails found in the metas table into the recoveryEmail list
+        Actions:        Inserts the last queued rows, creates the CASE_INDEXES and closes the connection
         """
-        # Sets the var to false to begin with.
-        self.recoveryEmail = False
-        for row in self.metadata:
-            # b'\x8a\xbf\x0f5 is the signature for a recovery email
-            if str(row[23])[:15] == "b'\\x8a\\xbf\\x0f5":
-                if self.recoveryEmail:
-                    # Adds other found email to the list
-                    self.recoveryEmail.append(str(row[18])[36:])
-                else:
-                    # Sets the first found email to the first item in the list
-                    self.recoveryEmail = [str(row[18])[36:]]
-        # End RecoveryEmail ===============================
-
-    def GetRecoveryEmail(self):
+        self.Flush()
+        with self.connection:
+            for index, table, column in CASE_INDEXES:
+                self.connection.execute("CREATE INDEX IF NOT EXISTS `{0}` ON `{1}` (`{2}`);".format(index, table,
+                                                                                                  column))
+        self.connection.close()
+        # End Close =======================================
+
+    def Sync(self):
         """
-        Name:           GetRecoveryEmail
+        Name:           Sync
 
-        Description:    Returns the recoveryEmail var
+        Description:    Makes the rows added so far durable
 
         Input:          None
 
-        Actions:        Returns the recoveryEmail var
+        Actions:        Inserts the queued rows and syncs the file to disk,
+                            the connection itself does not sync unless the case database is durable
         """
-        return self.recoveryEmail
-        # End GetRecoveryEmail ============================
+        self.Flush()
+        fd = os.open(self.path, os.O_RDONLY)
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+        # End Sync ========================================
 
-    def FirstName(self):
-        """
-        Name:           FirstName
 
-        Description:    Sets the firstName variable
+def ReadManifest(path):
+    """
+    Name:           ReadManifest
 
-        Input:          None
+    Description:    Reads the database paths of a job manifest
 
-        Actions:        Sets the firstName variable to either the found name or False
-        """
-        self.firstName = False
-        for row in self.metadata:
-            name = str(row[18])[15:24]
-            if name == "FirstName":
-                self.firstName = str(row[18][25:])
-        # End FirstName ===================================
+    Input:          Path to the manifest, one database path per line
 
-    def GetFirstName(self):
-        """
-        Name:           GetFirstName
+    Actions:        Returns the paths in file order, blank lines are skipped
+    """
+    with open(path, encoding="utf-8") as f:
+        return [line.rstrip("\n") for line in f if line.strip()]
+    # End ReadManifest ====================================
 
-        Description:    Returns the firstName Var
 
-        Input:          None
+def WriteManifest(path, databases):
+    """
+    Name:           WriteManifest
 
-        Actions:        Returns the firstName var
-        """
-        return self.firstName
-        # End GetFirstName ================================
+    Description:    Writes the database paths found by discovery to a job manifest
 
-    def LastName(self):
-        """
-        Name:           LastName
+    Input:          Path to the manifest, iterable of database paths
 
-        Description:    Sets the lastName variable
+    Actions:        Writes a temporary file next to the manifest, syncs it and renames it into place,
+                        so an interrupted discovery never leaves a partial manifest behind
+                    Returns the list of paths written
+    """
+    databases = list(databases)
+    temporary = path + ".tmp"
+    with open(temporary, "w", encoding="utf-8") as f:
+        f.writelines(database + "\n" for database in databases)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temporary, path)
+    return databases
+    # End WriteManifest ===================================
+
+
+def ReadCheckpoint(path):
+    """
+    Name:           ReadCheckpoint
 
-        Input:          None
+    Description:    Reads the databases a job has already finished
 
-        Actions:        Sets the lastName variable to either the found name or False
-        """
-        self.lastName = False
-        for row in self.metadata:
-            name = str(row[18])[15:23]
-            if name == "LastName":
-                self.lastName = str(row[18][24:])
-        # End LastName ====================================
+    Input:          Path to the checkpoint file
 
-    def GetLastName(self):
-        """
-        Name:           GetLastName
+    Actions:        Returns the set of finished database paths, empty if the file does not exist yet,
+                        the size of the output file at the last checkpoint, None if it went to the screen,
+                        and the length in bytes of the complete checkpoints
+                    The paths of a checkpoint only count once its end line, a tab and the size, is on disk,
+                        a checkpoint cut off by a crash is not counted
+    """
+    done = set()
+    size = None
+    length = 0
+    if not os.path.isfile(path):
+        return done, size, length
+    with open(path, "rb") as f:
+        lines = f.read().split(b"\n")
+    batch = []
+    position = 0
+    # The piece after the last newline is empty, or a line that was never finished
+    for line in lines[:-1]:
+        position += len(line) + 1
+        line = line.decode("utf-8")
+        if line.startswith("\t"):
+            done.update(batch)
+            batch = []
+            size = int(line[1:]) if line[1:] else None
+            length = position
+        elif line:
+            batch.append(line)
+    return done, size, length
+    # End ReadCheckpoint ==================================
+
+
+def SyncOutputs(writer, case, stream):
+    """
+    Name:           SyncOutputs
 
-        Description:    Returns the lastName var
+    Description:    Makes everything written so far durable before a checkpoint is recorded
 
-        Input:          None
+    Input:          Record writer or False, CaseDatabase or False, output file or False for the screen
 
-        Actions:        Returns the lastName var
-        """
-        return self.lastName
-        # End GetLastName =================================
+    Actions:        Writes out the held records and case rows
+                    Flushes the output file and syncs it and the case database to disk
+                    Returns the size of the output file, or None for the screen
+    """
+    size = None
+    if writer:
+        writer.Flush()
+    if stream:
+        stream.flush()
+        os.fsync(stream.fileno())
+        size = os.fstat(stream.fileno()).st_size
+    else:
+        sys.stdout.flush()
+    if case:
+        case.Sync()
+    return size
+    # End SyncOutputs =====================================
 
-    def GetFullName(self):
+
+class Checkpoint():
+    def __init__(self, path, sync=None, interval=CHECKPOINT_INTERVAL, seconds=CHECKPOINT_SECONDS):
         """
-        Name:           GetFullName
+        Name:           Checkpoint
 
-        Description:    Concatenates the first and last name
+        Description:    Append only record of the databases a job has finished
 
-        Input:          None
+        Input:          Path to the checkpoint file, created if it does not exist
+                        Function making the outputs durable and returning the size of the output file, called
+                            before each checkpoint is written
+                        Number of finished databases, or seconds since the last checkpoint, before writing one
 
-        Actions:        Checks if both the first and last name have content
-                            Concatenates the first and last name, adding a space in-between
-                        Returns the full name or false
+        Actions:        Opens the file for appending only, every checkpoint is a single write of whole lines
+                        Cuts off a checkpoint left unfinished by an earlier crash, its databases are parsed again
         """
-        if self.firstName and self.lastName:
-            return str(self.firstName + " " + self.lastName)
-        else:
-            # If the first or last name do not exits a full name can not be found and return False
-            return False
-        # End GetFullName =================================
+        self.path = path
+        self.sync = sync
+        self.interval = interval
+        self.seconds = seconds
+        self.pending = []
+        self.last = time.monotonic()
+        self.fd = os.open(path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        # Otherwise the paths of the unfinished checkpoint would be counted with the next end line
+        os.ftruncate(self.fd, ReadCheckpoint(path)[2])
+        # End __init__ ====================================
 
-    def DateOfBirth(self):
+    def Mark(self, database):
         """
-        Name:           DateOfBirth
+        Name:           Mark
 
-        Description:    Sets the Date of Birth variable if data is found else sets it to False
+        Description:    Records that a database has been parsed and written out
 
-        Input:          None
+        Input:          Path of the database
 
-        Actions:        Sets DOB var to False
-                        Checks to see if date can be found, if so sets the var to it
-                        Uses dashes to indicate blanks, only used if only day or year not found
-                        Current data suggests only day and year are stored, code reflects as such
-        """
-        # Sets the DOB var to False
-        self.DOB = False
-        # Loops through each line in the metadata var
-        for row in self.metadata:
-            # Sets the value of row 18 to name
-            name = str(row[18])[15:23]
-            # Checks if name is BirthDay
-            if name == "BirthDay":
-                # Checks if the DOB is false or it has been initialized
-                if self.DOB:
-                    # Sets the value found to temporary date var
-                    date = str(row[18][24:])
-                    # Checks to see if the date is a single digit
-                    if len(date) == 1:
-                        # Adds a 0 before the single digit
-                        date = "0"+ date
-                    # Adds the day to the beginning of the DOB value
-                    self.DOB = date + self.DOB[2:]
-                else:
-                    # Creates a placeholder of dashes
-                    self.DOB = "------"
-                    date = str(row[18][24:])
-                    if len(date) == 1:
-                        date = "0"+ date
-                    self.DOB = date + self.DOB[2:]
-            elif name == "BirthYea":
-                if self.DOB:
-                    # Preserves the set day value adds the year to the end
-                    self.DOB = self.DOB[:2] + str(row[18][25:])
-                else:
-                    self.DOB = "------"
-                    self.DOB = self.DOB[:2] + str(row[18][25:])
-        # End DateOfBirth =================================
+        Actions:        Queues the path and writes a checkpoint every interval databases or seconds
+        """
+        self.pending.append(database)
+        if len(self.pending) >= self.interval or time.monotonic() - self.last >= self.seconds:
+            self.Flush()
+        # End Mark ========================================
 
-    def GetFullInfo(self):
+    def Flush(self):
         """
-        Name:           GetFullInfo
+        Name:           Flush
 
-        Description:    Returns the full name and the DOB. Returns False if either of the values do not exist
+        Description:    Writes a checkpoint of the queued databases
 
         Input:          None
 
-        Actions:        Returns the full name and the DOB in a list.
-                        Returns False if either of the values are set to False
+        Actions:        Makes the outputs durable first, so no database is marked before its results are on disk
+                        Appends every queued path and an end line holding the size of the output file with one
+                            write call and syncs the file
+                        A resumed job cuts the outputs back to the last checkpoint, so the databases finished since
+                            then are parsed again without being written twice
         """
-        # Returns a list inside a list for printing unification
-        if self.GetFullName() and self.DOB:
-            return [[self.GetFullName(), self.DOB]]
-        else:
-            return False
-        # End GetFullInfo =================================
-
-    def RecoveryPhoneNumber(self):
+        if self.pending:
+            size = self.sync() if self.sync else None
+            lines = "".join(database + "\n" for database in self.pending)
+            lines += "\t{0}\n".format("" if size is None else size)
+            os.write(self.fd, lines.encode("utf-8"))
+            os.fsync(self.fd)
+            self.pending = []
+        self.last = time.monotonic()
+        # End Flush =======================================
+
+    def Close(self):
         """
-        Name:           RecoveryPhoneNumber
+        Name:           Close
 
-        Description:    Sets recoveryPhone var
+        Description:    Writes the last checkpoint and closes the file
 
         Input:          None
 
-        Actions:        Sets recoveryPhone var to False
-                        Sets the var to the number if found
+        Actions:        Flushes the queued databases and closes the file descriptor
         """
-        self.recoveryPhone = False
-        for row in self.metadata:
-            name = str(row[18])[15:28]
-            if name == "RecoveryPhone":
-                self.recoveryPhone = str(row[18][35:])
-        # End RecoveryPhoneNumber =========================
+        self.Flush()
+        os.close(self.fd)
+        # End Close =======================================
 
-    def GetRecoveryPhone(self):
+
+def NormalizeUrl(url):
+    """
+    Name:           NormalizeUrl
+
+    Description:    Returns the normalized form of a site url and its domain
+
+    Input:          Url string
+
+    Actions:        Lowercases the scheme and host, drops the user info, the fragment and the default port
+                    Uses / as the path when there is none
+                    Falls back to the lowercased url and an empty domain if the url does not parse
+                    Returns (url, domain)
+    """
+    try:
+        parts = urllib.parse.urlsplit(url)
+        host = parts.hostname or ""
+        port = parts.port
+    except ValueError:
+        return url.lower(), ""
+    scheme = parts.scheme.lower()
+    netloc = host
+    if port is not None and DEFAULT_PORTS.get(scheme) != port:
+        netloc = "{0}:{1}".format(host, port)
+    return urllib.parse.urlunsplit((scheme, netloc, parts.path or "/", parts.query, "")), host
+    # End NormalizeUrl ====================================
+
+
+class SiteIndex():
+    def __init__(self):
         """
-        Name:           GetRecoveryPhone
+        Name:           SiteIndex
 
-        Description:    Returns recoveryPhone Var
+        Description:    Index of the sites of every database, by domain
 
         Input:          None
 
-        Actions:        Returns recoveryPhone Var
+        Actions:        Keeps a count of sites per domain, for the fleet and for each database, and of all sites
+                        The urls themselves are not kept and domains are interned so every database shares the
+                            same string objects, memory grows with the unique domains, not with the urls or sites
         """
-        return self.recoveryPhone
-        # End GetRecoveryPhone
+        self.sites = 0
+        self.domains = {}
+        self.profiles = {}
+        # End __init__ ====================================
 
-    def Extensions(self):
+    def Add(self, syncFile):
         """
-        Name:           Extensions
+        Name:           Add
 
-        Description:    Returns a list of all extensions found in the metas table
+        Description:    Adds the sites of one database
 
-        Input:          None
+        Input:          SyncFile or SyncResult object
 
-        Actions:        Sets var to False
-                        Adds Extension name to list if extension is found
+        Actions:        Skips databases that could not be parsed
+                        Normalizes each url and counts it under its domain
         """
-        self.extension = False
-        for row in self.metadata:
-            if str(row[23])[:15] == "b'\\xba\\xbf\\x17i":
-                if self.extension:
-                    self.extension.append(str(row[18]))
-                else:
-                    self.extension = [str(row[18])]
-        # End Extensions ==================================
-
-    def GetExtensions(self):
+        if getattr(syncFile, "error", False):
+            return
+        counts = self.profiles.setdefault(syncFile.database, {})
+        for site in syncFile.GetAllSites() or []:
+            domain = sys.intern(NormalizeUrl(site)[1])
+            self.sites += 1
+            self.domains[domain] = self.domains.get(domain, 0) + 1
+            counts[domain] = counts.get(domain, 0) + 1
+        # End Add =========================================
+
+    def Top(self, count, database=None):
         """
-        Name:           GetExtensions
+        Name:           Top
 
-        Description:    Returns extension var
+        Description:    Returns the domains with the most sites
 
-        Input:          None
+        Input:          Number of domains to return
+                        Database path to only count its sites, None for the whole fleet
 
-        Actions:        Returns extension var
+        Actions:        Uses heapq.nlargest so only count domains are kept while walking the counts
+                        Returns a list of (domain, sites) pairs, most sites first
         """
-        return self.extension
-        # End GetExtensions ===============================
+        counts = self.domains if database is None else self.profiles.get(database, {})
+        return heapq.nlargest(count, counts.items(), key=operator.itemgetter(1))
+        # End Top =========================================
 
-    def Encrypted(self):
+
+def DisplayTopDomains(siteIndex, count):
+    """
+    Name:           DisplayTopDomains
+
+    Description:    Prints the domains with the most sites for each database and for the whole fleet
+
+    Input:          SiteIndex with every database added, number of domains in each list
+
+    Actions:        Prints one list per database with sites, then the fleet list
+    """
+    for database in siteIndex.profiles:
+        top = siteIndex.Top(count, database)
+        if top:
+            Report("\nTop Domains: {0}\n".format(database).center(56))
+            DisplayData([[domain, str(sites)] for domain, sites in top])
+    Report("\nTop Domains: All Databases\n".center(56))
+    Report("{0} sites over {1} domains".format(siteIndex.sites, len(siteIndex.domains)).center(56, "_"), 1)
+    DisplayData([[domain, str(sites)] for domain, sites in siteIndex.Top(count)])
+    Report("")
+    # End DisplayTopDomains ===============================
+
+
+class CorrelationIndex():
+    def __init__(self):
         """
-        Name:           Encrypted
+        Name:           CorrelationIndex
 
-        Description:    Checks to see if records are encrypted
+        Description:    Index of the identifiers found in every database, built as the databases are parsed
 
         Input:          None
 
-        Actions:        Checks to see if metas table values are encrypted
-                            This will limit the amount of data obtainable
-                        Sets var to False
-                        If encryption is found
-                            Set encryption var to true
-                            Report that the database is encrypted
+        Actions:        Maps each CORRELATION_KINDS kind to a dictionary of identifier to the set of databases
+                            it was found in, so finding the databases that share an identifier is one lookup
+                        Identifiers are normalized with NormalizeIdentifier, paths and identifiers are interned
+                        Keeps the accounts of each database so shared identifiers can be shown with them
         """
-        self.encrypted = False
-        for row in self.metadata:
-            if str(row[18]) == "encrypted":
-                self.encrypted = True
-                # Report using level 1 due to some information being able to be found, just not all
-                Report(str("NOTE: The database located at: {0} is encrypted\n".format(self.database)), 1)
-                break
-        # End Encrypted ===================================
+        self.index = dict((kind, {}) for kind in CORRELATION_KINDS)
+        self.accounts = {}
+        # End __init__ ====================================
 
-    def HTTPSites(self):
+    def Add(self, syncFile):
         """
-        Name:           HTTPSites
+        Name:           Add
 
-        Description:    Finds all HTTP sites and adds them to a list
+        Description:    Adds the identifiers of one database
 
-        Input:          None
+        Input:          SyncFile or SyncResult object
 
-        Actions:        Sets HTTP var to false
-                        If http:// is found, add site to list
+        Actions:        Skips databases that could not be parsed
+                        Adds the account emails, computer names, recovery emails and recovery phone
+                        Skips NULL and empty identifiers, they do not link databases together
         """
-        self.http = False
-        for row in self.metadata:
-            # Program was hanging on None values
-            if row[18] == None:
-                continue
-            elif str(row[18][:7]).lower() == "http://":
-                if self.http:
-                    # TODO when visit time is determined add this in to the append function
-                    self.http.append(row[18])
-                else:
-                    self.http = [row[18]]
-        # End HTTPSites ===================================
-
-    def HTTPSSites(self):
+        if getattr(syncFile, "error", False):
+            return
+        database = sys.intern(syncFile.database)
+        accounts = [user[0] for user in syncFile.GetUserInfo()]
+        self.accounts[database] = accounts
+        phone = syncFile.GetRecoveryPhone()
+        for kind, values in [(CORRELATE_ACCOUNT, accounts),
+                             (RECORD_COMPUTER, [computer[0] for computer in syncFile.GetAttachedComputers()]),
+                             (RECORD_RECOVERY_EMAIL, syncFile.GetRecoveryEmail() or []),
+                             (CORRELATE_PHONE, [phone] if phone else [])]:
+            found = self.index[kind]
+            for value in values:
+                value = NormalizeIdentifier(kind, value)
+                if value:
+                    found.setdefault(sys.intern(value), set()).add(database)
+        # End Add =========================================
+
+    def Lookup(self, kind, value):
         """
-        Name:           HTTPSSites
+        Name:           Lookup
 
-        Description:    Finds all HTTPS sites and adds them to a list
+        Description:    Returns the databases an identifier was found in
 
-        Input:          None
+        Input:          Identifier kind from CORRELATION_KINDS, identifier value
 
-        Actions:        Sets HTTPS var to false
-                        If https:// is found, add site to list
+        Actions:        Normalizes the value the same way Add does
+                        Returns the set of database paths, empty if the identifier was not seen
         """
-        self.https = False
-        for row in self.metadata:
-            if row[18] == None:
-                continue
-            elif str(row[18][:8]).lower() == "https://":
-                if self.https:
-                    # TODO when visit time is determined add this in to the append function
-                    self.https.append(row[18])
-                else:
-                    self.https = [row[18]]
-        # End HTTPSSites ==================================
+        return self.index[kind].get(NormalizeIdentifier(kind, value), set())
+        # End Lookup ======================================
 
-    def GetAllSites(self):
+    def Shared(self, minimum=2):
         """
-        Name:           GetAllSites
+        Name:           Shared
 
-        Description:    Returns all http and https sites in one list
+        Description:    Yields the identifiers found in more than one database
 
-        Input:          None
+        Input:          Smallest number of databases an identifier has to be in
 
-        Actions:        Checks to see if both http and https have data
-                        Returns the new list
-                        If only one list has data return that one
-                        Return False if both lists are False
+        Actions:        Yields (kind, identifier, sorted database paths) for each identifier in at least minimum
+                            databases, walking the index once
         """
-        if self.http and self.https:
-            return self.http + self.https
-        elif not self.https and not self.http:
-            return False
-        elif self.http:
-            return self.http
-        else:
-            return self.https
-        # End GetAllSites =================================
+        for kind in CORRELATION_KINDS:
+            for value, databases in self.index[kind].items():
+                if len(databases) >= minimum:
+                    yield kind, value, sorted(databases)
+        # End Shared ======================================
 
-def DisplayData(data):
+
+def NormalizeIdentifier(kind, value):
     """
-    Name:           DisplayData
+    Name:           NormalizeIdentifier
 
-    Description:    Prints lists that has lists of pairs, second usually being a formatted date
-                        or prints entire passed list
+    Description:    Returns the form of an identifier used as an index key
 
-    Input:          data, either a list of lists, a list, or a string
+    Input:          Identifier kind from CORRELATION_KINDS, identifier value
 
-    Actions:        Checks if the passed var is a list
-                        prints the values in the list, formats them if they are tuples of two
-                    Prints the passed data if not a list
+    Actions:        Lowercases emails, keeps only the digits and a leading + of phone numbers
+                    Strips the spaces around computer names
+                    Returns None for a NULL value, so databases missing an identifier are never correlated
     """
-    if isinstance(data, list):
-        for item in data:
-            if len(item) == 2:
-                Report(str(item[0].ljust(35, ":") + " " + item[1].rjust(20, ":")))
-            else:
-                Report(str(item))
-    else:
-        Report(str(data))
-    # End DisplayData =====================================
+    if value is None:
+        return None
+    value = str(value).strip()
+    if kind in (CORRELATE_ACCOUNT, RECORD_RECOVERY_EMAIL):
+        return value.lower()
+    if kind == CORRELATE_PHONE:
+        return ("+" if value.startswith("+") else "") + "".join(c for c in value if c.isdigit())
+    return value
+    # End NormalizeIdentifier =============================
+
+
+def DisplayCorrelations(correlationIndex):
+    """
+    Name:           DisplayCorrelations
 
+    Description:    Prints every identifier found in more than one database
 
-def Report(msg, level=False):
-    """
-    Name:           Report
+    Input:          CorrelationIndex with every database added
 
-    Description:    Custom outputter  with verbosity checker, will print to screen or file depending on arguments
+    Actions:        Prints the identifier and kind, then each database with its accounts
+    """
+    shared = list(correlationIndex.Shared())
+    Report("\nShared Identifiers\n".center(56))
+    Report("{0} identifiers were found in more than one database".format(len(shared)).center(56, "_"), 1)
+    Report("")
+    for kind, value, databases in shared:
+        Report(str(value.ljust(35, ":") + " " + kind.rjust(20, ":")))
+        for database in databases:
+            Report("    {0} ({1})".format(database, ", ".join(correlationIndex.accounts.get(database, []))))
+    Report("")
+    # End DisplayCorrelations =============================
+
+
+def HandleResult(result, writer=False, case=False, siteIndex=False, correlationIndex=False, artifacts=ARTIFACTS,
+                 checkpoint=False, renderer=False):
+    """
+    Name:           HandleResult
 
-    Input:          Message which to be displayed: String
-                    Importance level: Int
+    Description:    Sends one parsed database to every output of the run
 
-    Action:         Prints the msg based on the verbosity level.
-                    If no verbosity level passed, it will print the message.
-                    Higher levels are more important. A 1 verbosity will print everything,
-                    a 2 will print level 2&3, a 3 will print 3
+    Input:          SyncResult or SyncFile object
+                    Record writer for the structured formats, False for the text report
+                    CaseDatabase, SiteIndex and CorrelationIndex, False for the ones not in use
+                    Artifacts that were extracted, passed to DisplaySyncFile
+                    Checkpoint of the job, False when not running one
+                    Renderer the report is written with, False to display it with DisplaySyncFile
 
-                    Messages with out level are Data
-                    Level 1 messages are statuses
-                    Level 2 messages are errors
-                    Level 3 messages are critical errors
+    Actions:        Adds the result to the case database and indexes
+                    Writes its records, or renders its report, errors are reported and the run continues
+                    Warns about every source of recovered artifacts that could not be read
     """
-    # Checks if a level was provided
-    if not level:
-        # Determines if a output file was set
-        if not outFile:
-            # If no output file was set, print to the screen
-            print(msg)
-        else:
-            # If output file was set, add data to a new line in that file
-            outFile.write(msg+'\n')
-    # Makes sure importance level is higher than the verbosity filter
-    elif level >= verbosity:
-        # Prints to screen if output file was not set
-        if not outFile:
-            print(msg)
-        # If output file was set, add data to a new line in that file
+    if case:
+        with profiler.Stage("case", result.database):
+            case.Add(result)
+    if siteIndex:
+        siteIndex.Add(result)
+    if correlationIndex:
+        correlationIndex.Add(result)
+    with profiler.Stage("output", result.database):
+        if writer:
+            for record in IterRecords(result):
+                writer.Write(record)
+            if result.error:
+                Report("ERROR: Could not parse the database located at: {0}\n{1}".format(result.database,
+                                                                                         result.error), 3)
+        elif renderer:
+            renderer.Render(SyncReport(result, artifacts))
         else:
-            outFile.write(msg+'\n')
-    # End Report ==========================================
-
-
-def CheckFile(filePath):
+            DisplaySyncFile(result, artifacts)
+    recovered = getattr(result, "recovered", None) or {}
+    for source, error in sorted(recovered.get("errors", {}).items()):
+        Report("WARNING: Could not read the {0} artifacts of the database located at: {1}\n{2}".format(
+            source, result.database, error), 2)
+    # Failed databases are marked as well, they were reported and would fail the same way again
+    if checkpoint:
+        checkpoint.Mark(result.database)
+    # End HandleResult ====================================
+
+
+def CheckFile(filePath, append=False, size=None):
     """
     Name:           CheckFile
 
     Description:    Checks if the file is create, else creates it
 
     Input:          path to desired file
+                    True to add to the end of an existing file, used when a job is resumed
+                    Size to cut an existing file back to before adding to it, None to keep all of it
 
     Actions:        If the file path is a False value, return False
                     Output changes if file does or does not exits
-                    Will write over the file if it exists
+                    Will write over the file if it exists, unless append is set
     """
     # If the filePath is false return it
     if not filePath:
         return filePath
+    # A resumed job keeps what the earlier run already wrote
+    elif append and os.path.exists(filePath):
+        f = open(filePath, "a")
+        # What was written after the last checkpoint is dropped, those databases are parsed again
+        if size is not None and size < os.fstat(f.fileno()).st_size:
+            f.truncate(size)
+        Report("File {0} already exists, adding to it\n".format(filePath), 1)
+        return f
     # Checks to see if the file is already existing, returns opened file
     elif os.path.exists(filePath):
         f = open(filePath, "w")
@@ -737,110 +4839,144 @@ def main():
 
     # Parses the command line to args object
     args = ParseCommandLine()
-    # Sets blank list of sync files, this will be used to store all the sync file objects
-    syncList = []
     # Sets the global verbosity level to what is passed in the args
     verbosity = args.verbose
+    # A job that already has finished databases is resumed, its outputs are added to rather than replaced
+    checkpointPath = args.manifest and (args.checkpoint or args.manifest + ".done")
+    done, doneSize = ReadCheckpoint(checkpointPath)[:2] if checkpointPath else (set(), None)
+    resuming = bool(done)
+    if resuming and args.format in (FORMAT_JSON, FORMAT_HTML):
+        Report("ERROR: A json or html document can not be added to, resume the job with -o text, jsonl or csv", 3)
+        return
     # Uses the the CheckFile function to open the argument passed file if one was passed
-    outFile = CheckFile(args.outFile)
+    outFile = CheckFile(args.outFile, resuming, doneSize)
+    # Every time shown uses the chosen style
+    SetTimeStyle(args.time)
+    # Only records stages if asked to, otherwise the null profiler is kept
+    if args.profile or args.profileJson or args.profileMemory:
+        SetProfiler(True, args.profileMemory)
+
+    writer = False
+    renderer = False
+    bannerStream = sys.stdout
+    if args.format in WRITERS:
+        # Records go to the out file or the screen, everything else goes to stderr to keep the records clean
+        writer = WRITERS[args.format](outFile or sys.stdout, append=resuming)
+    else:
+        # Each database is rendered once from its report, the text report keeps the banner and messages with it
+        renderer = RENDERERS[args.format](outFile or sys.stdout, verbosity)
+    if args.format != FORMAT_TEXT:
+        bannerStream = sys.stderr
 
     # Data about the program for the user
-    print("ChromeParser.py")
-    print("Created by Marley Jaffe")
-    print("version = 1.00")
-    print()
-
+    print("ChromeParser.py", file=bannerStream)
+    print("Created by Marley Jaffe", file=bannerStream)
+    print("version = 1.00", file=bannerStream)
+    print(file=bannerStream)
+
+    if args.format != FORMAT_TEXT:
+        # Messages are written to stderr while the records are written
+        dataFile = outFile
+        outFile = sys.stderr
+
+    # A job works through the paths of its manifest, skipping the ones its checkpoint has
+    if args.manifest and args.path and IsArchive(args.path):
+        Report("ERROR: A manifest can only list database files, extract the archive or drop --manifest", 3)
+        return
+    elif args.manifest:
+        if os.path.isfile(args.manifest):
+            paths = ReadManifest(args.manifest)
+        else:
+            # Discovery is finished before the job starts so every run works through the same list
+            found = [args.database] if args.database else IterDatabasePaths(args.path, args.system)
+            paths = WriteManifest(args.manifest, profiler.Iterate("discovery", found))
+            Report("The manifest {0} has been written.\n".format(args.manifest), 1)
+        databases = [path for path in paths if path not in done]
+        if resuming:
+            Report("Resuming the job, {0} of {1} databases are already done\n".format(len(paths) - len(databases),
+                                                                                    len(paths)), 1)
     # Checks if a single database was passed to the program
-    if args.database:
-        # Will error out if the object fails to create properly
-        try:
-            syncList.append(SyncFile(args.database))
-        except Exception as err:
-            Report(err, 3)
+    elif args.database:
+        databases = [args.database]
+    elif args.path and IsArchive(args.path):
+        # The databases are read straight out of the archive, recovery and WAL parsing need them on disk
+        databases = profiler.Iterate("discovery", IterArchiveDatabases(args.path, args.archiveMemory * 1048576,
+                                                                       args.recover or args.wal))
     else:
-        try:
-            syncList = GetDatabases(args.path)
-        except Exception as err:
-            Report(err, 3)
-
-    # Loops through the syncList to run commands on each database object
-    for syncFile in syncList:
-        # Displays what the database the results are from
-        Report("\nDatabase: {0}\n".format(syncFile.database).center(56))
-        # Every syncFile will have a email account associated with it
-        Report("Email Account".center(35, "=")+" "+"Time added".center(20, "=")+"\n")
-        # Display the email account and the time it was added
-        DisplayData(syncFile.GetUserInfo())
-        Report("")
-        # If a full name and a DOB exist print them
-        if syncFile.GetFullInfo():
-            Report("Full Name".center(35, "=")+" "+"DOB (DDYYYY)".center(20, "=")+"\n")
-            DisplayData(syncFile.GetFullInfo())
-            Report("")
-        else:
-            # Print no full info only if verbosity level is set to see statuses
-            Report("Full Name".center(35, "=")+" "+"DOB (DDYYYY)".center(20, "=")+"\n", 1)
-            Report("No full info available", 1)
-            Report("", 1)
-        # Print the computers attached to the account
-        Report("Computer Name".center(35, "=")+" "+"Time added".center(20, "="))
-        # Print how many with verbosity of 1 (status)
-        Report("{0} Computer(s) were synced".format(len(syncFile.GetAttachedComputers())).center(35, "_"), 1)
-        Report("")
-        DisplayData(syncFile.GetAttachedComputers())
-        Report("")
-        # If Recovery email is set, print it
-        if syncFile.GetRecoveryEmail():
-            Report("Recovery Email".center(35, "=")+"\n")
-            DisplayData(syncFile.GetRecoveryEmail())
-            Report("")
-        else:
-            # Print no recovery email, if verbosity level is 1
-            Report("Recovery Email".center(35, "=")+"\n", 1)
-            Report("No Recovery email found", 1)
-            Report("", 1)
-        # Prints phone number if one was found
-        if syncFile.GetRecoveryPhone():
-            Report("Recovery Phone".center(35, "=")+"\n")
-            DisplayData(syncFile.GetRecoveryPhone())
-            Report("")
-        else:
-            Report("Recovery Phone".center(35, "=")+"\n", 1)
-            Report("No Recovery phone found", 1)
-            Report("", 1)
-        # Prints extensions if any were found
-        if syncFile.GetExtensions():
-            Report("Extensions(s)".center(35, "="))
-            # Prints how many extensions were found with verbosity of status
-            Report("{0} Extensions were Found".format(len(syncFile.GetExtensions())).center(35, "_"), 1)
-            Report("")
-            DisplayData(syncFile.GetExtensions())
-            Report("")
-        else:
-            Report("Extensions(s)".center(35, "=")+"\n", 1)
-            Report("No Extensions found", 1)
-            Report("", 1)
-        # Prints if any sites were found
-        if syncFile.GetAllSites():
-            Report("All Sites".center(35, "="))
-            Report("{0} Sites found".format(len(syncFile.GetAllSites())).center(35, "_"), 1)
-            Report("")
-            DisplayData(syncFile.GetAllSites())
-            Report("")
-        else:
-            Report("All Sites".center(35, "=")+"\n", 1)
-            Report("No sites were found", 1)
-            Report("", 1)
-
-        # If an outfile was set, close it
-        if outFile:
-            outFile.close()
-            # Sets outFile to false for future report functions to work
-            outFile = False
-            # Print status about file closing
-            Report("The out file has been closed.\n", 1)
-        # Report that the program is finished
-        Report("The Program has finished. Exiting now\n", 3)
+        # Databases are parsed while the rest of the tree is still being searched
+        databases = profiler.Iterate("discovery", IterDatabasePaths(args.path, args.system))
+
+    # Unchanged databases are loaded from the extraction cache if one was set
+    cache = ExtractionCache(args.cache, args.cacheSize * 1048576, args.cacheHash) if args.cache else None
+
+    # Every artifact is also stored in the case database if one was set
+    # A job keeps the journal of the case database so a crash can not corrupt it
+    case = CaseDatabase(args.case, durable=bool(args.manifest)) if args.case else False
+    if case and args.manifest:
+        # Rows of the databases not in the checkpoint are dropped, those databases are parsed again,
+        #   this includes rows flushed by a run that crashed before writing its first checkpoint
+        case.Remove(databases)
+
+    # Sites are counted by domain if a top list was asked for
+    siteIndex = SiteIndex() if args.top > 0 else False
+    # Identifiers are indexed as the databases come in if correlation was asked for
+    correlationIndex = CorrelationIndex() if args.correlate else False
+
+    # Finished databases are recorded once their results are on disk
+    checkpoint = False
+    if checkpointPath:
+        checkpoint = Checkpoint(checkpointPath, functools.partial(SyncOutputs, writer, case,
+                                                                  dataFile if args.format != FORMAT_TEXT else outFile))
+
+    # Displays each database as soon as it has been parsed, errors are reported and the run continues
+    handle = functools.partial(HandleResult, writer=writer, case=case, siteIndex=siteIndex,
+                               correlationIndex=correlationIndex, artifacts=args.only, checkpoint=checkpoint,
+                               renderer=renderer)
+    if args.asyncPipeline:
+        asyncio.run(RunPipeline(databases, handle, args.mode, args.jobs, cache, args.recover, args.wal,
+                                args.only))
+    else:
+        for result in ParseDatabases(databases, args.mode, args.jobs, cache, args.recover, args.wal, args.only):
+            handle(result)
+
+    if checkpoint:
+        checkpoint.Close()
+    if siteIndex:
+        DisplayTopDomains(siteIndex, args.top)
+    if correlationIndex:
+        DisplayCorrelations(correlationIndex)
+    if cache:
+        cache.Close()
+    if case:
+        case.Close()
+        Report("The case database {0} has been written.\n".format(args.case), 1)
+    if writer:
+        writer.Close()
+    if renderer:
+        renderer.Close()
+    if args.format != FORMAT_TEXT:
+        outFile = dataFile
+
+    # If an outfile was set, close it
+    if outFile:
+        outFile.close()
+        # Sets outFile to false for future report functions to work
+        outFile = False
+        # Print status about file closing
+        Report("The out file has been closed.\n", 1)
+    if args.format != FORMAT_TEXT:
+        # The screen may hold the records or the document, the last messages also go to stderr
+        outFile = sys.stderr
+
+    if profiler.enabled:
+        # The profile goes to stderr so it never mixes with the records or the report
+        summary = profiler.Summary()
+        profiler.Display(summary, sys.stderr)
+        if args.profileJson:
+            with open(args.profileJson, "w") as f:
+                json.dump(summary, f, indent=2)
+    # Report that the program is finished
+    Report("The Program has finished. Exiting now\n", 3)
 
 
 if __name__ == '__main__':
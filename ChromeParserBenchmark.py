@@ -0,0 +1,616 @@
+__author__ = 'marleyjaffe'
+
+import argparse
+import copy
+import hashlib
+import json
+import multiprocessing
+import os
+import tempfile
+import time
+
+# resource is only available on Unix, peak RSS is reported as n/a without it
+try:
+    import resource
+except ImportError:
+    resource = None
+
+import ChromeParser
+import SyncDataGenerator
+
+# Baseline extractors, each one is a full scan of the metadata
+EXTRACTORS = ["Encrypted", "AttachedComputers", "RecoveryEmail", "FirstName", "LastName", "DateOfBirth",
+              "RecoveryPhoneNumber", "Extensions", "HTTPSites", "HTTPSSites"]
+
+
+class Baseline():
+    def __init__(self, path):
+        """
+        Name:           Baseline
+
+        Description:    The per-artifact extractors of SyncFile as they were before ClassifyMetadata
+
+        Input:          Database path
+
+        Actions:        Loads every metas row the way SyncFile did, each extractor then scans all of them
+                        The extractors are kept here unchanged, the signatures are checked on the repr of the
+                            specifics and the values sliced out of the name, so the benchmark measures the
+                            single pass against the code it replaced
+        """
+        connection = ChromeParser.OpenDatabase(path)
+        try:
+            self.metadata = connection.execute("SELECT * FROM `metas`;").fetchall()
+        finally:
+            connection.close()
+        # End __init__ ====================================
+
+    def AttachedComputers(self):
+        """
+        Name:           AttachedComputers
+
+        Description:    Sets the computer names that the users has logged into
+
+        Input:          None
+
+        Actions:        Runs through each row in the metas table and adds the found computers to a list
+                        Sets the ComputerNames list to the values from column 19 in the metadata file
+        """
+        self.computerNames = []
+        for row in self.metadata:
+            # b'\xd2\xb9 is the signature for a computer, remove false positives that don't have enough data
+            if str(row[23])[:10] == "b'\\xd2\\xb9" and len(str(row[23])) > 23:
+                # Adds a list item to the list with the computer name in [0] and date first signed in to [1]
+                # Row 7 needs to be divided by 1000 because the value is stored in milliseconds since epoch
+                self.computerNames.append([row[18], row[7]/1000])
+        # End AttachedComputers ===========================
+
+    def RecoveryEmail(self):
+        """
+        Name:           RecoveryEmail
+
+        Description:    Sets the recoveryEmail variable
+
+        Input:          None
+
+        Actions:        Adds recovery emails found in the metas table into the recoveryEmail list
+        """
+        # Sets the var to false to begin with.
+        self.recoveryEmail = False
+        for row in self.metadata:
+            # b'\x8a\xbf\x0f5 is the signature for a recovery email
+            if str(row[23])[:15] == "b'\\x8a\\xbf\\x0f5":
+                if self.recoveryEmail:
+                    # Adds other found email to the list
+                    self.recoveryEmail.append(str(row[18])[36:])
+                else:
+                    # Sets the first found email to the first item in the list
+                    self.recoveryEmail = [str(row[18])[36:]]
+        # End RecoveryEmail ===============================
+
+    def FirstName(self):
+        """
+        Name:           FirstName
+
+        Description:    Sets the firstName variable
+
+        Input:          None
+
+        Actions:        Sets the firstName variable to either the found name or False
+        """
+        self.firstName = False
+        for row in self.metadata:
+            name = str(row[18])[15:24]
+            if name == "FirstName":
+                self.firstName = str(row[18][25:])
+        # End FirstName ===================================
+
+    def LastName(self):
+        """
+        Name:           LastName
+
+        Description:    Sets the lastName variable
+
+        Input:          None
+
+        Actions:        Sets the lastName variable to either the found name or False
+        """
+        self.lastName = False
+        for row in self.metadata:
+            name = str(row[18])[15:23]
+            if name == "LastName":
+                self.lastName = str(row[18][24:])
+        # End LastName ====================================
+
+    def DateOfBirth(self):
+        """
+        Name:           DateOfBirth
+
+        Description:    Sets the Date of Birth variable if data is found else sets it to False
+
+        Input:          None
+
+        Actions:        Sets DOB var to False
+                        Checks to see if date can be found, if so sets the var to it
+                        Uses dashes to indicate blanks, only used if only day or year not found
+                        Current data suggests only day and year are stored, code reflects as such
+        """
+        # Sets the DOB var to False
+        self.DOB = False
+        # Loops through each line in the metadata var
+        for row in self.metadata:
+            # Sets the value of row 18 to name
+            name = str(row[18])[15:23]
+            # Checks if name is BirthDay
+            if name == "BirthDay":
+                # Checks if the DOB is false or it has been initialized
+                if self.DOB:
+                    # Sets the value found to temporary date var
+                    date = str(row[18][24:])
+                    # Checks to see if the date is a single digit
+                    if len(date) == 1:
+                        # Adds a 0 before the single digit
+                        date = "0"+ date
+                    # Adds the day to the beginning of the DOB value
+                    self.DOB = date + self.DOB[2:]
+                else:
+                    # Creates a placeholder of dashes
+                    self.DOB = "------"
+                    date = str(row[18][24:])
+                    if len(date) == 1:
+                        date = "0"+ date
+                    self.DOB = date + self.DOB[2:]
+            elif name == "BirthYea":
+                if self.DOB:
+                    # Preserves the set day value adds the year to the end
+                    self.DOB = self.DOB[:2] + str(row[18][25:])
+                else:
+                    self.DOB = "------"
+                    self.DOB = self.DOB[:2] + str(row[18][25:])
+        # End DateOfBirth =================================
+
+    def RecoveryPhoneNumber(self):
+        """
+        Name:           RecoveryPhoneNumber
+
+        Description:    Sets recoveryPhone var
+
+        Input:          None
+
+        Actions:        Sets recoveryPhone var to False
+                        Sets the var to the number if found
+        """
+        self.recoveryPhone = False
+        for row in self.metadata:
+            name = str(row[18])[15:28]
+            if name == "RecoveryPhone":
+                self.recoveryPhone = str(row[18][35:])
+        # End RecoveryPhoneNumber =========================
+
+    def Extensions(self):
+        """
+        Name:           Extensions
+
+        Description:    Returns a list of all extensions found in the metas table
+
+        Input:          None
+
+        Actions:        Sets var to False
+                        Adds Extension name to list if extension is found
+        """
+        self.extension = False
+        for row in self.metadata:
+            if str(row[23])[:15] == "b'\\xba\\xbf\\x17i":
+                if self.extension:
+                    self.extension.append(str(row[18]))
+                else:
+                    self.extension = [str(row[18])]
+        # End Extensions ==================================
+
+    def Encrypted(self):
+        """
+        Name:           Encrypted
+
+        Description:    Checks to see if records are encrypted
+
+        Input:          None
+
+        Actions:        Checks to see if metas table values are encrypted
+                            This will limit the amount of data obtainable
+                        Sets var to False
+                        If encryption is found
+                            Set encryption var to true
+        """
+        self.encrypted = False
+        for row in self.metadata:
+            if str(row[18]) == "encrypted":
+                self.encrypted = True
+                break
+        # End Encrypted ===================================
+
+    def HTTPSites(self):
+        """
+        Name:           HTTPSites
+
+        Description:    Finds all HTTP sites and adds them to a list
+
+        Input:          None
+
+        Actions:        Sets HTTP var to false
+                        If http:// is found, add site to list
+        """
+        self.http = False
+        for row in self.metadata:
+            # Program was hanging on None values
+            if row[18] == None:
+                continue
+            elif str(row[18][:7]).lower() == "http://":
+                if self.http:
+                    # TODO when visit time is determined add this in to the append function
+                    self.http.append(row[18])
+                else:
+                    self.http = [row[18]]
+        # End HTTPSites ===================================
+
+    def HTTPSSites(self):
+        """
+        Name:           HTTPSSites
+
+        Description:    Finds all HTTPS sites and adds them to a list
+
+        Input:          None
+
+        Actions:        Sets HTTPS var to false
+                        If https:// is found, add site to list
+        """
+        self.https = False
+        for row in self.metadata:
+            if row[18] == None:
+                continue
+            elif str(row[18][:8]).lower() == "https://":
+                if self.https:
+                    # TODO when visit time is determined add this in to the append function
+                    self.https.append(row[18])
+                else:
+                    self.https = [row[18]]
+        # End HTTPSSites ==================================
+
+
+def MultiPass(baseline):
+    """
+    Name:           MultiPass
+
+    Description:    Runs the baseline extractors, one full scan of the metadata each
+
+    Input:          Baseline object
+
+    Actions:        Sets every artifact variable the way SyncFile did before ClassifyMetadata
+    """
+    for extractor in EXTRACTORS:
+        getattr(baseline, extractor)()
+    # End MultiPass =======================================
+
+
+def SinglePass(syncFile, artifacts=ChromeParser.ARTIFACTS):
+    """
+    Name:           SinglePass
+
+    Description:    Runs the single pass classifier over the metadata
+
+    Input:          SyncFile object, artifacts to classify
+
+    Actions:        Sets the artifact variables using ClassifyMetadata
+    """
+    c, n, s = ChromeParser.CTIME_COLUMN, ChromeParser.NAME_COLUMN, ChromeParser.SPECIFICS_COLUMN
+    syncFile.ClassifyMetadata(((row[c], row[n], row[s]) for row in syncFile.metadata), artifacts)
+    # End SinglePass ======================================
+
+
+def Artifacts(syncFile):
+    """
+    Name:           Artifacts
+
+    Description:    Collects the artifact variables so the extractors can be compared
+
+    Input:          SyncFile or Baseline object
+
+    Actions:        Reads the variables the extractors set straight from the object, so nothing is extracted
+                        again and no memoized getter result hides what the extractors produced
+                    Leaves out the user account, the baseline extractors do not set it
+                    Returns a copy, so later runs can not change the returned values
+    """
+    return copy.deepcopy(dict((name, syncFile.__dict__.get(name)) for name, artifact in
+                              ChromeParser.ARTIFACT_ATTRIBUTES.items() if artifact != ChromeParser.ARTIFACT_USER))
+    # End Artifacts =======================================
+
+
+def Fingerprint(artifacts):
+    """
+    Name:           Fingerprint
+
+    Description:    Returns a short hash of an artifacts dictionary so results from child processes can be compared
+
+    Input:          Dictionary from GetArtifacts
+
+    Actions:        Hashes the sorted JSON encoding of the dictionary
+    """
+    return hashlib.sha256(json.dumps(artifacts, sort_keys=True).encode()).hexdigest()[:16]
+    # End Fingerprint =====================================
+
+
+def Time(function, repeat):
+    """
+    Name:           Time
+
+    Description:    Times the best of several runs of a function
+
+    Input:          Function without arguments, number of runs
+
+    Actions:        Returns the fastest run in seconds
+    """
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        elapsed = time.perf_counter() - start
+        if best is None or elapsed < best:
+            best = elapsed
+    return best
+    # End Time ============================================
+
+
+def PeakRss():
+    """
+    Name:           PeakRss
+
+    Description:    Returns the peak resident set size of this process in MiB
+
+    Input:          None
+
+    Actions:        Uses getrusage, ru_maxrss is in KiB on Linux and bytes on macOS
+                    Returns None where resource is not available
+    """
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if os.uname().sysname == "Darwin":
+        return peak / 1048576.0
+    return peak / 1024.0
+    # End PeakRss =========================================
+
+
+def MeasureMode(path, mode, queue):
+    """
+    Name:           MeasureMode
+
+    Description:    Extracts every artifact in one read mode, run in a fresh process so peak RSS is its own
+
+    Input:          Database path, read mode, queue the measurements are put on
+
+    Actions:        Puts the seconds taken, peak RSS and artifact fingerprint on the queue
+    """
+    start = time.perf_counter()
+    syncFile = ChromeParser.SyncFile(path, mode)
+    artifacts = syncFile.GetArtifacts()
+    elapsed = time.perf_counter() - start
+    queue.put((elapsed, PeakRss(), Fingerprint(artifacts)))
+    # End MeasureMode =====================================
+
+
+def BenchExtractors(path, rows, repeat):
+    """
+    Name:           BenchExtractors
+
+    Description:    Times the baseline extractors against the single pass classifier
+
+    Input:          Database path, number of metas rows, number of timed runs
+
+    Actions:        Checks both paths give the same artifacts
+                    Returns the multi and single pass times and the time of each extractor and artifact alone
+    """
+    # Each path has its own object so one can not leave values behind for the other
+    baseline = Baseline(path)
+    MultiPass(baseline)
+    syncFile = ChromeParser.SyncFile(path, ChromeParser.READ_FULL)
+    SinglePass(syncFile)
+    found = Artifacts(syncFile)
+    # The baseline divided the computer times by 1000, the raw milliseconds are kept now
+    found["computerNames"] = [[name, epoch/1000] for name, epoch in found["computerNames"]]
+    if found != Artifacts(baseline):
+        raise SystemExit("ERROR: single pass results differ from the multi pass results")
+
+    result = {
+        "rows": rows,
+        "multiPass": Time(lambda: MultiPass(baseline), repeat),
+        "singlePass": Time(lambda: SinglePass(syncFile), repeat),
+        "extractors": {},
+        "artifacts": {},
+    }
+    for extractor in EXTRACTORS:
+        result["extractors"][extractor] = Time(getattr(baseline, extractor), repeat)
+    for artifact in ChromeParser.ARTIFACTS:
+        if artifact != ChromeParser.ARTIFACT_USER:
+            result["artifacts"][artifact] = Time(lambda: SinglePass(syncFile, [artifact]), repeat)
+    return result
+    # End BenchExtractors =================================
+
+
+def DecodeRows(path):
+    """
+    Name:           DecodeRows
+
+    Description:    Reads the rows whose values the legacy code slices out of the name
+
+    Input:          Database path
+
+    Actions:        Returns the specifics of every row and a list of (name, specifics, start) for the profile
+                        and recovery email rows, start is where the legacy slice of the name begins
+    """
+    connection = ChromeParser.OpenDatabase(path)
+    try:
+        rows = connection.execute("SELECT `non_unique_name`, `specifics` FROM `metas`;").fetchall()
+    finally:
+        connection.close()
+    blobs = [specifics for name, specifics in rows if isinstance(specifics, bytes)]
+    values = []
+    for name, specifics in rows:
+        if name.startswith(SyncDataGenerator.PREFERENCE_PREFIX):
+            values.append((name, specifics, name.index(":") + 1))
+        elif ChromeParser.SpecificsType(specifics) == ChromeParser.RECORD_RECOVERY_EMAIL:
+            values.append((name, specifics, 36))
+    return blobs, values
+    # End DecodeRows ======================================
+
+
+def BenchDecode(path, rows, repeat):
+    """
+    Name:           BenchDecode
+
+    Description:    Times the protobuf decoder against the legacy slices of the name
+
+    Input:          Database path, number of metas rows, number of timed runs
+
+    Actions:        Checks both give the same values
+                    Returns the time of each way of pulling the values and the MB/s of DecodeSpecifics
+                        over every specifics blob
+    """
+    blobs, values = DecodeRows(path)
+    sliced = [str(name[start:]) for name, specifics, start in values]
+    decoded = [ChromeParser.ProfileValue(specifics, name, start) for name, specifics, start in values]
+    if sliced != decoded:
+        raise SystemExit("ERROR: decoded values differ from the sliced values")
+    size = sum(len(blob) for blob in blobs)
+    decodeAll = Time(lambda: [ChromeParser.DecodeSpecifics(blob) for blob in blobs], repeat)
+    return {
+        "rows": rows,
+        "values": len(values),
+        "slice": Time(lambda: [str(name[start:]) for name, specifics, start in values], repeat),
+        "decode": Time(lambda: [ChromeParser.SpecificsValue(specifics) for name, specifics, start in values], repeat),
+        "blobs": len(blobs),
+        "decodeAll": decodeAll,
+        "decodeMBPerSecond": size / decodeAll / 1048576.0,
+    }
+    # End BenchDecode =====================================
+
+
+def BenchModes(path, rows):
+    """
+    Name:           BenchModes
+
+    Description:    Measures rows per second and peak RSS of every read mode
+
+    Input:          Database path, number of metas rows
+
+    Actions:        Runs each mode in its own process and checks every mode gives the same artifacts
+                    Returns a list of measurements, one per mode
+    """
+    results = []
+    expected = None
+    for mode in ChromeParser.READ_MODES:
+        queue = multiprocessing.Queue()
+        process = multiprocessing.Process(target=MeasureMode, args=(path, mode, queue))
+        process.start()
+        elapsed, peak, fingerprint = queue.get()
+        process.join()
+        if expected is None:
+            expected = fingerprint
+        elif fingerprint != expected:
+            raise SystemExit("ERROR: {0} mode results differ from the full mode results".format(mode))
+        results.append({"rows": rows, "mode": mode, "seconds": elapsed, "rowsPerSecond": rows / elapsed,
+                        "peakRssMiB": peak})
+    return results
+    # End BenchModes ======================================
+
+
+def BenchDiscovery(directory, profiles):
+    """
+    Name:           BenchDiscovery
+
+    Description:    Times database discovery over an exported tree
+
+    Input:          Scratch directory, number of profiles to create
+
+    Actions:        Builds a Linux layout tree with small databases
+                    Returns the time to the first found database and to the end of the walk
+    """
+    root = os.path.join(directory, "tree-{0}".format(profiles))
+    SyncDataGenerator.BuildTree(root, profiles, 100)
+    start = time.perf_counter()
+    first = None
+    found = 0
+    for _ in ChromeParser.IterDatabasePaths(root, "Linux"):
+        if first is None:
+            first = time.perf_counter() - start
+        found += 1
+    total = time.perf_counter() - start
+    if found != profiles:
+        raise SystemExit("ERROR: found {0} of {1} databases".format(found, profiles))
+    return {"profiles": profiles, "firstSeconds": first, "totalSeconds": total, "profilesPerSecond": found / total}
+    # End BenchDiscovery ==================================
+
+
+def main():
+    parser = argparse.ArgumentParser('Chrome Sync Parser Benchmark',
+                                     description='Measures SyncFile parsing and database discovery on synthetic data')
+    parser.add_argument('-r', '--rows', type=int, nargs='+', default=[1000, 10000, 100000],
+                        help="Number of metas rows in each synthetic database, up to 10000000")
+    parser.add_argument('-n', '--repeat', type=int, default=3, help="Number of timed runs, the best is kept")
+    parser.add_argument('-p', '--profiles', type=int, nargs='*', default=[1000],
+                        help="Number of profiles in each discovery tree")
+    parser.add_argument('-j', '--json', default=False, help="Also writes the results to this JSON file")
+    args = parser.parse_args()
+
+    results = {"extractors": [], "decode": [], "modes": [], "discovery": []}
+    with tempfile.TemporaryDirectory() as directory:
+        print("{0:>10} {1:>12} {2:>12} {3:>8}".format("rows", "multi (s)", "single (s)", "speedup"))
+        for rows in args.rows:
+            path = os.path.join(directory, "SyncData-{0}.sqlite3".format(rows))
+            SyncDataGenerator.BuildDatabase(path, rows)
+            result = BenchExtractors(path, rows, args.repeat)
+            results["extractors"].append(result)
+            print("{0:>10} {1:>12.4f} {2:>12.4f} {3:>7.1f}x".format(
+                rows, result["multiPass"], result["singlePass"], result["multiPass"] / result["singlePass"]))
+
+        print()
+        print("{0:>10} {1:>20} {2:>12}".format("rows", "extractor", "time (s)"))
+        for result in results["extractors"]:
+            for name, seconds in list(result["extractors"].items()) + \
+                    [("single:" + name, seconds) for name, seconds in result["artifacts"].items()]:
+                print("{0:>10} {1:>20} {2:>12.4f}".format(result["rows"], name, seconds))
+
+        print()
+        print("{0:>10} {1:>8} {2:>10} {3:>10} {4:>8} {5:>12} {6:>10}".format(
+            "rows", "values", "slice (s)", "decode (s)", "blobs", "decode all", "MB/s"))
+        for rows in args.rows:
+            path = os.path.join(directory, "SyncData-{0}.sqlite3".format(rows))
+            result = BenchDecode(path, rows, args.repeat)
+            results["decode"].append(result)
+            print("{0:>10} {1:>8} {2:>10.4f} {3:>10.4f} {4:>8} {5:>12.4f} {6:>10.1f}".format(
+                rows, result["values"], result["slice"], result["decode"], result["blobs"], result["decodeAll"],
+                result["decodeMBPerSecond"]))
+
+        print()
+        print("{0:>10} {1:>8} {2:>10} {3:>12} {4:>12}".format("rows", "mode", "time (s)", "rows/sec", "peak RSS MiB"))
+        for rows in args.rows:
+            path = os.path.join(directory, "SyncData-{0}.sqlite3".format(rows))
+            for result in BenchModes(path, rows):
+                results["modes"].append(result)
+                peak = "n/a" if result["peakRssMiB"] is None else "{0:.1f}".format(result["peakRssMiB"])
+                print("{0:>10} {1:>8} {2:>10.4f} {3:>12.0f} {4:>12}".format(
+                    rows, result["mode"], result["seconds"], result["rowsPerSecond"], peak))
+
+        if args.profiles:
+            print()
+            print("{0:>10} {1:>12} {2:>12} {3:>14}".format("profiles", "first (s)", "total (s)", "profiles/sec"))
+            for profiles in args.profiles:
+                result = BenchDiscovery(directory, profiles)
+                results["discovery"].append(result)
+                print("{0:>10} {1:>12.4f} {2:>12.4f} {3:>14.0f}".format(
+                    profiles, result["firstSeconds"], result["totalSeconds"], result["profilesPerSecond"]))
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
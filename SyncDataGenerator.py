@@ -0,0 +1,321 @@
+__author__ = 'marleyjaffe'
+
+import sqlite3 as lite
+import argparse
+import os
+import random
+
+# Columns of the metas and deleted_metas tables as created by Chrome
+METAS_COLUMNS = [
+    "metahandle bigint primary key ON CONFLICT FAIL", "base_version bigint default -1",
+    "server_version bigint default 0", "local_external_id bigint default 0",
+    "transaction_version bigint default 0", "mtime bigint default 0", "server_mtime bigint default 0",
+    "ctime bigint default 0", "server_ctime bigint default 0", "id varchar(255) default 'r'",
+    "parent_id varchar(255) default 'r'", "server_parent_id varchar(255) default 'r'",
+    "is_unsynced bit default 0", "is_unapplied_update bit default 0", "is_del bit default 0",
+    "is_dir bit default 0", "server_is_dir bit default 0", "server_is_del bit default 0",
+    "non_unique_name varchar", "server_non_unique_name varchar(255)", "unique_server_tag varchar",
+    "unique_client_tag varchar", "unique_bookmark_tag varchar", "specifics blob", "server_specifics blob",
+    "base_server_specifics blob", "server_unique_position blob", "unique_position blob",
+    "attachment_metadata blob", "server_attachment_metadata blob",
+]
+
+# The other tables of a SyncData.sqlite3 file
+SHARE_INFO_COLUMNS = [
+    "id TEXT primary key", "name TEXT", "store_birthday TEXT", "db_create_version TEXT", "db_create_time INT",
+    "next_id INT default -2", "cache_guid TEXT", "notification_state BLOB", "bag_of_chips BLOB",
+]
+MODELS_COLUMNS = ["model_id BLOB primary key", "progress_marker BLOB", "transaction_version BIGINT default 0"]
+SHARE_VERSION_COLUMNS = ["id VARCHAR(128) primary key", "data INT"]
+
+# Columns filled in for every generated metas row
+INSERT_COLUMNS = [
+    "metahandle", "base_version", "server_version", "mtime", "server_mtime", "ctime", "server_ctime", "id",
+    "parent_id", "non_unique_name", "server_non_unique_name", "unique_client_tag", "specifics", "server_specifics",
+]
+
+# EntitySpecifics field numbers of the planted record types
+DEVICE_INFO_FIELD = 154522
+EXTENSION_FIELD = 48119
+AUTOFILL_FIELD = 31729
+PRIORITY_PREFERENCE_FIELD = 163425
+TYPED_URL_FIELD = 40781
+BOOKMARK_FIELD = 32904
+
+# Prefix put in front of the profile values, the parser expects the key to start at character 15
+PREFERENCE_PREFIX = "google.profile."
+# Profile values planted once in every database
+PROFILE_VALUES = [("FirstName:", "Marley"), ("LastName:", "Jaffe"), ("BirthDay:", "4"), ("BirthYear:", "1990"),
+                  ("RecoveryPhoneNumber:", "5555550100")]
+
+# Share of each record kind in the generated rows, out of 100
+DEFAULT_MIX = [("computer", 1), ("extension", 4), ("recoveryEmail", 1), ("site", 30), ("bookmark", 64)]
+
+# Rows inserted per executemany call
+INSERT_BATCH_SIZE = 20000
+# ctime of the first generated row in milliseconds since epoch
+BASE_CTIME = 1393278594000
+
+
+def Varint(value):
+    """
+    Name:           Varint
+
+    Description:    Encodes an integer as a protobuf varint
+
+    Input:          Non negative integer
+
+    Actions:        Returns the encoded bytes
+    """
+    out = bytearray()
+    while True:
+        byte = value & 0x7f
+        value >>= 7
+        if value:
+            out.append(byte | 0x80)
+        else:
+            out.append(byte)
+            return bytes(out)
+    # End Varint ==========================================
+
+
+def Field(number, payload):
+    """
+    Name:           Field
+
+    Description:    Encodes a length delimited protobuf field
+
+    Input:          Field number and the payload bytes
+
+    Actions:        Returns the tag, length and payload
+    """
+    return Varint(number << 3 | 2) + Varint(len(payload)) + payload
+    # End Field ===========================================
+
+
+def VarintField(number, value):
+    """
+    Name:           VarintField
+
+    Description:    Encodes a varint protobuf field
+
+    Input:          Field number and the integer value
+
+    Actions:        Returns the tag and value
+    """
+    return Varint(number << 3) + Varint(value)
+    # End VarintField =====================================
+
+
+def Specifics(number, payload, size=None):
+    """
+    Name:           Specifics
+
+    Description:    Builds an EntitySpecifics blob holding one record type
+
+    Input:          EntitySpecifics field number, record payload, optional payload size to pad to
+
+    Actions:        Pads the payload with an unknown field so the length byte matches what Chrome writes
+    """
+    if size is not None:
+        padding = size - len(payload) - 2
+        payload += Field(15, b"\x00" * padding)
+    return Field(number, payload)
+    # End Specifics =======================================
+
+
+def BuildRecord(kind, serial):
+    """
+    Name:           BuildRecord
+
+    Description:    Builds the name and specifics of one synthetic record of the given kind
+
+    Input:          Kind of record, serial number used to make the values unique
+
+    Actions:        Plants the specifics prefix the parser looks for
+                        device_info for computers, extension records padded to 105 bytes,
+                        autofill records padded to 53 bytes for recovery emails
+                    Returns the (non_unique_name, specifics) of the record
+    """
+    if kind == "computer":
+        payload = (Field(1, b"cache-guid-%d" % serial) + Field(2, b"COMPUTER-%d" % serial) + VarintField(3, 1) +
+                   Field(4, b"Chrome MAC 33.0.1750.117 (254650)-stable") + Field(5, b"33.0.1750.117"))
+        return "COMPUTER-%d" % serial, Specifics(DEVICE_INFO_FIELD, payload)
+    elif kind == "extension":
+        extensionId = ("%032d" % serial).translate(str.maketrans("0123456789", "abcdefghij"))
+        payload = (Field(1, extensionId.encode()) + Field(2, b"1.0.%d" % (serial % 100)) +
+                   Field(3, b"https://clients2.google.com/service/update2/crx") + VarintField(4, 1) + VarintField(5, 0))
+        return "Extension %d" % serial, Specifics(EXTENSION_FIELD, payload, 105)
+    elif kind == "recoveryEmail":
+        email = "recovery%d@example.com" % serial
+        payload = Field(1, b"email") + Field(2, email.encode())
+        return "autofill_entry|email|recovery".ljust(36, "|") + email, Specifics(AUTOFILL_FIELD, payload, 53)
+    elif kind == "site":
+        scheme = "https" if serial % 2 else "http"
+        url = "%s://www.site%d.example.com/page/%d" % (scheme, serial % 5000, serial)
+        payload = Field(1, url.encode()) + Field(2, b"Visited page %d" % serial)
+        return url, Specifics(TYPED_URL_FIELD, payload)
+    else:
+        payload = Field(1, b"https://www.bookmark%d.example.com/" % serial) + Field(2, b"Bookmark %d" % serial)
+        return "Bookmark %d" % serial, Specifics(BOOKMARK_FIELD, payload)
+    # End BuildRecord =====================================
+
+
+def BuildRow(metahandle, name, specifics, ctime):
+    """
+    Name:           BuildRow
+
+    Description:    Builds one metas row in INSERT_COLUMNS order
+
+    Input:          Metahandle, non_unique_name, specifics and ctime of the row
+
+    Actions:        Fills the version, time and id columns the way a synced entry has them
+    """
+    return (metahandle, 1, 1, ctime, ctime, ctime, ctime, "Z:%d" % metahandle, "r", name, name,
+            "tag%d" % metahandle, specifics, specifics)
+    # End BuildRow ========================================
+
+
+def GenerateRows(rows, seed=0, mix=DEFAULT_MIX, start=0):
+    """
+    Name:           GenerateRows
+
+    Description:    Yields synthetic metas rows
+
+    Input:          Number of rows, random seed, record kind mix, first metahandle
+
+    Actions:        Plants the profile values and the encrypted marker first
+                    Picks the kind of every other row from the mix
+    """
+    generator = random.Random(seed)
+    kinds = [kind for kind, share in mix for _ in range(share)]
+    handle = start
+    for key, value in PROFILE_VALUES:
+        if handle - start >= rows:
+            return
+        yield BuildRow(handle, PREFERENCE_PREFIX + key + value,
+                       Specifics(PRIORITY_PREFERENCE_FIELD, Field(1, Field(1, key.encode()) + Field(2, value.encode()))),
+                       BASE_CTIME)
+        handle += 1
+    if handle - start < rows:
+        yield BuildRow(handle, "encrypted", b"", BASE_CTIME)
+        handle += 1
+    while handle - start < rows:
+        name, specifics = BuildRecord(generator.choice(kinds), handle)
+        yield BuildRow(handle, name, specifics, BASE_CTIME + handle * 1000)
+        handle += 1
+    # End GenerateRows ====================================
+
+
+def InsertRows(connection, table, rows):
+    """
+    Name:           InsertRows
+
+    Description:    Inserts generated rows a batch at a time
+
+    Input:          Connection, table name, iterable of rows in INSERT_COLUMNS order
+
+    Actions:        Uses executemany on batches so memory stays flat for any number of rows
+    """
+    query = "INSERT INTO `{0}` ({1}) VALUES ({2});".format(table, ", ".join(INSERT_COLUMNS),
+                                                           ", ".join("?" * len(INSERT_COLUMNS)))
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= INSERT_BATCH_SIZE:
+            connection.executemany(query, batch)
+            batch = []
+    if batch:
+        connection.executemany(query, batch)
+    # End InsertRows ======================================
+
+
+def BuildDatabase(path, rows, seed=0, deletedRows=0, mix=DEFAULT_MIX, user="user@example.com"):
+    """
+    Name:           BuildDatabase
+
+    Description:    Writes a synthetic SyncData.sqlite3 file
+
+    Input:          Path for the new database, number of metas rows, random seed,
+                        number of deleted_metas rows, record kind mix, account email
+
+    Actions:        Creates the metas, deleted_metas, models, share_info and share_version tables
+                    Plants the profile values once and mixes computers, extensions, recovery emails
+                        and sites in with plain bookmark rows
+                    Overwrites the file if it exists
+    """
+    if os.path.exists(path):
+        os.remove(path)
+    connection = lite.connect(path)
+    # The file is thrown away if generation fails, so there is no need for a journal
+    connection.execute("PRAGMA journal_mode = OFF;")
+    connection.execute("PRAGMA synchronous = OFF;")
+    for table, columns in [("metas", METAS_COLUMNS), ("deleted_metas", METAS_COLUMNS),
+                           ("models", MODELS_COLUMNS), ("share_info", SHARE_INFO_COLUMNS),
+                           ("share_version", SHARE_VERSION_COLUMNS)]:
+        connection.execute("CREATE TABLE `{0}` ({1});".format(table, ", ".join(columns)))
+    with connection:
+        connection.execute("INSERT INTO `share_info` (id, name, store_birthday, db_create_version, db_create_time, "
+                           "cache_guid) VALUES (?, ?, ?, ?, ?, ?);",
+                           ("id", user, "birthday", "33.0.1750.117", BASE_CTIME // 1000, "cache-guid"))
+        connection.execute("INSERT INTO `share_version` VALUES (?, ?);", ("id", 86))
+        for field in [DEVICE_INFO_FIELD, EXTENSION_FIELD, AUTOFILL_FIELD, PRIORITY_PREFERENCE_FIELD,
+                      TYPED_URL_FIELD, BOOKMARK_FIELD]:
+            connection.execute("INSERT INTO `models` VALUES (?, ?, ?);", (Field(field, b""), b"", 1))
+        InsertRows(connection, "metas", GenerateRows(rows, seed, mix))
+        InsertRows(connection, "deleted_metas", GenerateRows(deletedRows, seed + 1, mix, rows))
+    connection.close()
+    # End BuildDatabase ===================================
+
+
+def BuildTree(root, profiles, rows, system="Linux", seed=0):
+    """
+    Name:           BuildTree
+
+    Description:    Writes an exported user folder tree holding many profiles for discovery benchmarks
+
+    Input:          Root folder, number of profiles, metas rows per profile, system layout, random seed
+
+    Actions:        Builds one database and hard links it into every profile folder, copying if links fail
+                    Spreads the profiles over users with a Default and up to three Profile N folders each
+                    Returns the list of database paths
+    """
+    # Imported here so the generator can be used without the parser next to it
+    import shutil
+    import ChromeParser
+
+    usersFolders, chromeFolders = ChromeParser.SYSTEM_LAYOUTS[system]
+    if not os.path.isdir(root):
+        os.makedirs(root)
+    source = os.path.join(root, "source.sqlite3")
+    BuildDatabase(source, rows, seed)
+    paths = []
+    for number in range(profiles):
+        profile = "Default" if number % 4 == 0 else "Profile %d" % (number % 4)
+        folder = os.path.join(root, usersFolders[0], "user%d" % (number // 4), *chromeFolders[0])
+        path = os.path.join(folder, profile, "Sync Data", "SyncData.sqlite3")
+        os.makedirs(os.path.dirname(path))
+        try:
+            os.link(source, path)
+        except OSError:
+            shutil.copyfile(source, path)
+        paths.append(path)
+    return paths
+    # End BuildTree =======================================
+
+
+def main():
+    parser = argparse.ArgumentParser('Sync Data Generator',
+                                     description='Writes synthetic SyncData.sqlite3 files for testing and benchmarks')
+    parser.add_argument('path', help="Path of the database to write")
+    parser.add_argument('-r', '--rows', type=int, default=100000, help="Number of metas rows")
+    parser.add_argument('-d', '--deleted', type=int, default=0, help="Number of deleted_metas rows")
+    parser.add_argument('-s', '--seed', type=int, default=0, help="Random seed")
+    args = parser.parse_args()
+
+    BuildDatabase(args.path, args.rows, args.seed, args.deleted)
+    print("Wrote {0} metas rows and {1} deleted_metas rows to {2}".format(args.rows, args.deleted, args.path))
+
+
+if __name__ == '__main__':
+    main()